@@ -0,0 +1,67 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.engine import build_engine, is_sqlite
+from app.db.fulltext import FULLTEXT_TABLES
+import app.db.models  # noqa: F401
+import app.db.models.log  # noqa: F401
+
+config = context.config
+
+# app.db.migrations hands over its connection and keeps the app's logging as it is
+connection = config.attributes.get("connection")
+if connection is None and config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_name(name, type_, parent_names):
+    # The full-text tables (and their FTS5 shadow tables) are managed by app.db.fulltext
+    if type_ == "table":
+        return not any(name.startswith(spec.index_name) for spec in FULLTEXT_TABLES.values())
+    return True
+
+
+def _configure(**kwargs):
+    url = kwargs.pop("url", None) or str(kwargs["connection"].engine.url)
+    context.configure(
+        target_metadata=target_metadata,
+        include_name=include_name,
+        # SQLite cannot ALTER most things; batch mode rebuilds the table instead
+        render_as_batch=is_sqlite(url),
+        **kwargs
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit the SQL for DATABASE_URL without connecting"""
+    _configure(url=settings.DATABASE_URL, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = build_engine(settings.DATABASE_URL)
+    try:
+        with engine.connect() as own_connection:
+            _configure(connection=own_connection)
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,118 @@
+"""Baseline: the schema create_all built before migrations were introduced
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Databases created by create_all are stamped at this revision on their first
+migration (app.db.migrations) instead of running it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    op.create_table(
+        "faq",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("question", sa.Text(), nullable=False),
+        sa.Column("answer", sa.Text(), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=True),
+        sa.Column("keywords", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("view_count", sa.Integer(), nullable=False),
+        sa.Column("helpfulness_score", sa.Float(), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_faq_question", "faq", ["question"])
+
+    op.create_table(
+        "system_log",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("level", sa.String(length=20), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("module", sa.String(length=100), nullable=True),
+        sa.Column("function", sa.String(length=100), nullable=True),
+        sa.Column("extra_data", sa.JSON(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_system_log_level", "system_log", ["level"])
+
+    op.create_table(
+        "ticket",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("subject", sa.String(length=255), nullable=False),
+        sa.Column("question", sa.Text(), nullable=False),
+        sa.Column("answer", sa.Text(), nullable=True),
+        sa.Column(
+            "status", sa.Enum("OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED", name="ticketstatus"), nullable=False
+        ),
+        sa.Column(
+            "priority", sa.Enum("LOW", "MEDIUM", "HIGH", "URGENT", name="ticketpriority"), nullable=False
+        ),
+        sa.Column("confidence_score", sa.Float(), nullable=True),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_ticket_user_id", "ticket", ["user_id"])
+
+    op.create_table(
+        "user_log",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("action", sa.String(length=100), nullable=False),
+        sa.Column("resource", sa.String(length=100), nullable=True),
+        sa.Column("resource_id", sa.String(length=36), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("extra_data", sa.JSON(), nullable=True),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_log_action", "user_log", ["action"])
+    op.create_index("ix_user_log_user_id", "user_log", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("user_log")
+    op.drop_table("ticket")
+    op.drop_table("system_log")
+    op.drop_table("faq")
+    op.drop_table("user")
+    sa.Enum(name="ticketpriority").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="ticketstatus").drop(op.get_bind(), checkfirst=True)
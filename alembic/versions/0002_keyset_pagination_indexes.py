@@ -0,0 +1,36 @@
+"""Indexes on the sort keys of the cursor-paginated listings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+init_db created these directly before migrations existed, hence if_not_exists.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_ticket_created_at_id", "ticket", ["created_at", "id"]),
+    ("ix_ticket_user_id_created_at_id", "ticket", ["user_id", "created_at", "id"]),
+    ("ix_ticket_status_created_at_id", "ticket", ["status", "created_at", "id"]),
+    ("ix_faq_is_active_helpfulness_view_count_id", "faq", ["is_active", "helpfulness_score", "view_count", "id"]),
+    ("ix_user_created_at_id", "user", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
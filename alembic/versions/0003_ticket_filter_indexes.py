@@ -0,0 +1,33 @@
+"""Composite indexes for the filtered ticket listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+CRUDTicket.get_filtered: one user's tickets by status, and all tickets by
+status and priority, both newest first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_ticket_user_id_status_created_at_id", "ticket", ["user_id", "status", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_ticket_status_priority_created_at_id", "ticket", ["status", "priority", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ticket_status_priority_created_at_id", table_name="ticket")
+    op.drop_index("ix_ticket_user_id_status_created_at_id", table_name="ticket")
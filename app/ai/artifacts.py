@@ -0,0 +1,122 @@
+import json
+import os
+import secrets
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# A data directory either holds the artifacts itself (legacy layout) or
+# generations/<id>/ subdirectories plus a CURRENT file naming the live one
+GENERATIONS_DIR = "generations"
+CURRENT_FILE = "CURRENT"
+
+
+class ArtifactPaths:
+    """Locations of the semantic search artifacts inside a data directory"""
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self.model_dir = self.data_dir / "models" / "sentence_transformer"
+        self.index_path = self.data_dir / "models" / "faiss_index.bin"
+        self.vector_transform_path = self.data_dir / "models" / "vector_transform.npy"
+        self.metadata_path = self.data_dir / "data" / "faq_metadata.json"
+        self.compact_metadata_path = self.data_dir / "data" / "faq_metadata.bin"
+        self.embeddings_path = self.data_dir / "data" / "faq_embeddings.npy"
+        self.config_path = self.data_dir / "data" / "config.json"
+
+
+@contextmanager
+def atomic_write(path) -> Iterator[Path]:
+    """
+    Yield a temporary path next to ``path`` and move it into place on success.
+
+    Readers never observe a partially written file: the rename is atomic on
+    POSIX filesystems as long as both paths share a directory.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def write_json_atomic(path, payload: Any, indent: int = 2):
+    with atomic_write(path) as tmp_path:
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=indent)
+
+
+def read_config(paths: ArtifactPaths) -> Dict[str, Any]:
+    if not paths.config_path.exists():
+        return {}
+    with open(paths.config_path, 'r') as f:
+        return json.load(f)
+
+
+def current_generation(data_dir) -> Optional[str]:
+    """Id of the live artifact generation, or None for the legacy flat layout"""
+    current_path = Path(data_dir) / CURRENT_FILE
+    if not current_path.exists():
+        return None
+    generation = current_path.read_text().strip()
+    return generation or None
+
+
+def generation_dir(data_dir, generation: str) -> Path:
+    return Path(data_dir) / GENERATIONS_DIR / generation
+
+
+def resolve_artifact_dir(data_dir, generation: Optional[str] = None) -> Tuple[Optional[str], Path]:
+    """(generation, directory) holding the artifacts to load"""
+    generation = generation or current_generation(data_dir)
+    if generation is None:
+        return None, Path(data_dir)
+    path = generation_dir(data_dir, generation)
+    if not path.is_dir():
+        raise FileNotFoundError(f"Artifact generation '{generation}' not found at {path}")
+    return generation, path
+
+
+def new_generation(data_dir) -> Tuple[str, Path]:
+    """Create an empty, not yet published generation directory"""
+    generation = f"{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(2)}"
+    path = generation_dir(data_dir, generation)
+    path.mkdir(parents=True)
+    return generation, path
+
+
+def publish_generation(data_dir, generation: str):
+    """Atomically point CURRENT at ``generation``; running workers pick it up on reload"""
+    if not generation_dir(data_dir, generation).is_dir():
+        raise FileNotFoundError(f"Artifact generation '{generation}' does not exist")
+    with atomic_write(Path(data_dir) / CURRENT_FILE) as tmp_path:
+        tmp_path.write_text(generation + "\n")
+
+
+def list_generations(data_dir) -> List[str]:
+    root = Path(data_dir) / GENERATIONS_DIR
+    if not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+
+def prune_generations(data_dir, keep: int = 3) -> List[str]:
+    """Delete all but the newest ``keep`` generations, never the current one"""
+    current = current_generation(data_dir)
+    generations = list_generations(data_dir)
+    removed = []
+    for generation in generations[:max(0, len(generations) - keep)]:
+        if generation == current:
+            continue
+        shutil.rmtree(generation_dir(data_dir, generation), ignore_errors=True)
+        removed.append(generation)
+    return removed
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Deque, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BatchMetrics:
+    """Rolling batch-size and queue-wait statistics for a micro-batcher"""
+
+    def __init__(self, window: int = 2048):
+        self.batch_sizes: Deque[int] = deque(maxlen=window)
+        self.queue_wait_ms: Deque[float] = deque(maxlen=window)
+        self.batch_latency_ms: Deque[float] = deque(maxlen=window)
+        self.total_batches = 0
+        self.total_items = 0
+
+    def record_batch(self, size: int, waits_ms: List[float], latency_ms: float):
+        self.total_batches += 1
+        self.total_items += size
+        self.batch_sizes.append(size)
+        self.queue_wait_ms.extend(waits_ms)
+        self.batch_latency_ms.append(latency_ms)
+
+    @staticmethod
+    def _summary(samples) -> Dict[str, float]:
+        if not samples:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        n = len(ordered)
+        return {
+            "count": n,
+            "mean": round(sum(ordered) / n, 3),
+            "p50": round(ordered[int(0.50 * (n - 1))], 3),
+            "p99": round(ordered[int(0.99 * (n - 1))], 3),
+            "max": round(ordered[-1], 3),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "total_batches": self.total_batches,
+            "total_items": self.total_items,
+            "batch_size": self._summary(self.batch_sizes),
+            "queue_wait_ms": self._summary(self.queue_wait_ms),
+            "batch_latency_ms": self._summary(self.batch_latency_ms),
+        }
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Gathers concurrent submissions into batches for a synchronous batch function.
+
+    A batch is flushed as soon as it holds ``max_batch_size`` items, or
+    ``max_wait_ms`` after its first item was queued, whichever comes first.
+    ``process_batch`` must return one result per input item, in order; it
+    runs on ``executor`` (the loop's default thread pool if None) so the
+    event loop stays responsive while a batch is encoded and searched.
+    """
+
+    def __init__(
+            self,
+            process_batch: Callable[[List[T]], List[R]],
+            max_batch_size: int = 32,
+            max_wait_ms: float = 5.0,
+            executor: Optional[Executor] = None
+    ):
+        self.process_batch = process_batch
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.metrics = BatchMetrics()
+        self._pending: List[Tuple[T, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks; in-flight batches are held here
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """Queue an item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Micro-batch task failed: {task.exception()!r}")
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future, float]]):
+        started = time.perf_counter()
+        waits_ms = [(started - queued_at) * 1000.0 for _, _, queued_at in batch]
+        items = [item for item, _, _ in batch]
+
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self.executor, self.process_batch, items)
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(items)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.metrics.record_batch(
+            len(items), waits_ms, (time.perf_counter() - started) * 1000.0
+        )
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
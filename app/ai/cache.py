@@ -0,0 +1,165 @@
+import copy
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Fold case, punctuation and whitespace so trivially different queries share a cache key"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with optional TTL and byte budget.
+
+    Entries older than ``ttl_seconds`` are treated as misses. When
+    ``max_bytes`` is set, ``sizeof`` is used to account for each value.
+    """
+
+    def __init__(
+            self,
+            max_entries: int,
+            ttl_seconds: float = 0,
+            max_bytes: Optional[int] = None,
+            sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof or (lambda value: 0)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, stored_at, _ = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                self._pop_locked(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value):
+        size = self._sizeof(value)
+        if self.max_entries <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._pop_locked(key)
+            self._entries[key] = (value, time.monotonic(), size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._pop_locked(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._clear_locked()
+
+    def _pop_locked(self, key: Hashable):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _clear_locked(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class EmbeddingCache(LRUCache):
+    """
+    LRU cache of unit-normalized float32 query embeddings keyed on normalized text.
+
+    The cache is bound to a model fingerprint and empties itself when a
+    different model is bound.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 3600):
+        super().__init__(max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes, sizeof=lambda v: v.nbytes)
+        self.model_fingerprint: Optional[str] = None
+
+    def bind_model(self, fingerprint: str):
+        """Associate the cache with a model, flushing it if the model changed"""
+        with self._lock:
+            if fingerprint != self.model_fingerprint:
+                self._clear_locked()
+                self.model_fingerprint = fingerprint
+
+
+class AnswerCache(LRUCache):
+    """
+    LRU cache of complete get_best_answer payloads.
+
+    Keys carry the corpus version, so bumping the version makes every
+    older entry unreachable; the bump also drops them to free memory.
+    Payloads are deep-copied in and out (related_faqs is a list of dicts),
+    so a caller modifying its answer never changes what later callers get.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 600):
+        super().__init__(max_entries, ttl_seconds=ttl_seconds)
+        self.corpus_version = 0
+
+    def key(self, query: str, confidence_threshold: float, top_k: int, category: Optional[str] = None) -> Tuple:
+        return (normalize_query(query), confidence_threshold, top_k, category, self.corpus_version)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        value = super().get(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    def put(self, key: Hashable, value: Dict[str, Any]):
+        super().put(key, copy.deepcopy(value))
+
+    def bump_version(self) -> int:
+        with self._lock:
+            self.corpus_version += 1
+            self._clear_locked()
+            return self.corpus_version
+
+    def stats(self) -> Dict[str, Any]:
+        return {"corpus_version": self.corpus_version, **super().stats()}
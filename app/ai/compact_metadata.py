@@ -0,0 +1,154 @@
+import json
+import mmap
+import shutil
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from app.ai.metadata_store import faq_index_id
+
+
+# Compact on-disk metadata: a fixed header, three arrays sorted by FAISS id and
+# a blob of JSON records. Workers mmap the file and decode rows on demand, so
+# they share one page-cache copy instead of each parsing the JSON list.
+#
+#   header   magic b"FAQM", version u32, count u64, blob offset u64
+#   ids      int64[count]   FAISS ids, ascending
+#   starts   uint64[count]  byte offset of each record inside the blob
+#   lengths  uint64[count]  byte length of each record
+#   blob     UTF-8 JSON records, in write order
+_COMPACT_MAGIC = b"FAQM"
+_COMPACT_VERSION = 1
+_COMPACT_HEADER = struct.Struct("<4sIQQ")
+
+
+class CompactMetadataWriter:
+    """Streams records into the compact format without holding their text in memory"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._blob_path = self.path.with_name(self.path.name + ".blob")
+        self._blob = open(self._blob_path, 'wb')
+        self._ids: List[int] = []
+        self._lengths: List[int] = []
+
+    def add(self, record: Dict[str, Any]):
+        data = json.dumps(record, separators=(',', ':')).encode()
+        self._blob.write(data)
+        self._ids.append(faq_index_id(record['id']))
+        self._lengths.append(len(data))
+
+    def close(self):
+        self._blob.close()
+        try:
+            ids = np.array(self._ids, dtype='int64')
+            lengths = np.array(self._lengths, dtype='uint64')
+            starts = np.zeros(len(lengths), dtype='uint64')
+            if len(lengths):
+                starts[1:] = np.cumsum(lengths)[:-1]
+
+            order = np.argsort(ids, kind='stable')
+            arrays = (ids[order], starts[order], lengths[order])
+            blob_offset = _COMPACT_HEADER.size + sum(a.nbytes for a in arrays)
+
+            with open(self.path, 'wb') as out:
+                out.write(_COMPACT_HEADER.pack(_COMPACT_MAGIC, _COMPACT_VERSION, len(ids), blob_offset))
+                for array in arrays:
+                    out.write(array.tobytes())
+                with open(self._blob_path, 'rb') as blob:
+                    shutil.copyfileobj(blob, out)
+        finally:
+            self._blob_path.unlink(missing_ok=True)
+
+
+def write_compact_metadata(path, records: Iterable[Dict[str, Any]]):
+    writer = CompactMetadataWriter(path)
+    for record in records:
+        writer.add(record)
+    writer.close()
+
+
+class MmapMetadataStore:
+    """
+    Read-mostly metadata store over a memory-mapped compact metadata file.
+
+    Rows are decoded only when looked up. In-place updates go to a small
+    overlay so the shared mapping is never written to.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, blob_offset = _COMPACT_HEADER.unpack_from(self._mmap, 0)
+        if magic != _COMPACT_MAGIC or version != _COMPACT_VERSION:
+            raise ValueError(f"{self.path} is not a compact FAQ metadata file")
+
+        offset = _COMPACT_HEADER.size
+        self._ids = np.frombuffer(self._mmap, dtype='int64', count=count, offset=offset)
+        offset += self._ids.nbytes
+        self._starts = np.frombuffer(self._mmap, dtype='uint64', count=count, offset=offset)
+        offset += self._starts.nbytes
+        self._lengths = np.frombuffer(self._mmap, dtype='uint64', count=count, offset=offset)
+        self._blob_offset = blob_offset
+
+        self._overlay: Dict[int, Dict[str, Any]] = {}
+        self._deleted: Set[int] = set()
+
+    def _row(self, index_id: int) -> int:
+        row = int(np.searchsorted(self._ids, index_id))
+        if row < len(self._ids) and self._ids[row] == index_id:
+            return row
+        return -1
+
+    def _decode(self, row: int) -> Dict[str, Any]:
+        start = self._blob_offset + int(self._starts[row])
+        return json.loads(self._mmap[start:start + int(self._lengths[row])])
+
+    def get(self, index_id: int) -> Optional[Dict[str, Any]]:
+        index_id = int(index_id)
+        if index_id in self._overlay:
+            return dict(self._overlay[index_id])
+        if index_id in self._deleted:
+            return None
+        row = self._row(index_id)
+        return self._decode(row) if row >= 0 else None
+
+    def upsert(self, record: Dict[str, Any]) -> int:
+        index_id = faq_index_id(record['id'])
+        self._overlay[index_id] = dict(record)
+        self._deleted.discard(index_id)
+        return index_id
+
+    def remove(self, index_id: int) -> Optional[Dict[str, Any]]:
+        record = self.get(index_id)
+        index_id = int(index_id)
+        self._overlay.pop(index_id, None)
+        if self._row(index_id) >= 0:
+            self._deleted.add(index_id)
+        return record
+
+    def ids(self) -> List[int]:
+        base = [int(i) for i in self._ids if int(i) not in self._deleted and int(i) not in self._overlay]
+        return base + list(self._overlay)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        for row, index_id in enumerate(self._ids):
+            index_id = int(index_id)
+            if index_id not in self._deleted and index_id not in self._overlay:
+                yield self._decode(row)
+        for record in self._overlay.values():
+            yield dict(record)
+
+    def __contains__(self, index_id) -> bool:
+        index_id = int(index_id)
+        if index_id in self._overlay:
+            return True
+        return index_id not in self._deleted and self._row(index_id) >= 0
+
+    def __len__(self) -> int:
+        base_overlaid = sum(1 for i in self._overlay if self._row(i) >= 0)
+        return len(self._ids) - len(self._deleted) - base_overlaid + len(self._overlay)
@@ -0,0 +1,272 @@
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENCODER_BACKENDS = ("torch", "onnx")
+
+# Written by scripts/export_onnx_encoder.py inside the model directory
+ONNX_DIR = "onnx"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+def onnx_model_path(model_dir, quantized: bool = False) -> Path:
+    return Path(model_dir) / ONNX_DIR / (ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+
+
+def _read_json(model_dir: Path, name: str) -> dict:
+    path = model_dir / name
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def resolve_max_seq_length(model_dir, configured: Optional[int] = None) -> int:
+    """
+    Token limit inputs are truncated to: ENCODER_MAX_SEQ_LENGTH when set,
+    otherwise the model's own max_seq_length, never beyond its position
+    embeddings.
+    """
+    model_dir = Path(model_dir)
+    configured = settings.ENCODER_MAX_SEQ_LENGTH if configured is None else configured
+    default = _read_json(model_dir, "sentence_bert_config.json").get("max_seq_length", 256)
+    limit = _read_json(model_dir, "config.json").get("max_position_embeddings", 512)
+    return min(configured if configured > 0 else default, limit)
+
+
+class PaddingStats:
+    """
+    Real tokens vs padded token slots over everything a bucketer encoded.
+
+    ``unbucketed`` counts the slots the same batches would have needed in
+    input order, which is what length bucketing saves against.
+    """
+
+    def __init__(self):
+        self.sequences = 0
+        self.batches = 0
+        self.tokens = 0
+        self.slots = 0
+        self.unbucketed_slots = 0
+        self._lock = threading.Lock()
+
+    def record(self, lengths: np.ndarray, batches: List[np.ndarray], batch_size: int):
+        slots = sum(len(positions) * int(lengths[positions].max()) for positions in batches)
+        unbucketed = sum(
+            len(chunk) * int(chunk.max()) for chunk in (lengths[i:i + batch_size] for i in range(0, len(lengths), batch_size))
+        )
+        with self._lock:
+            self.sequences += len(lengths)
+            self.batches += len(batches)
+            self.tokens += int(lengths.sum())
+            self.slots += slots
+            self.unbucketed_slots += unbucketed
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "sequences": self.sequences,
+            "batches": self.batches,
+            "tokens": self.tokens,
+            "token_slots": self.slots,
+            "padding_waste_ratio": round(1 - self.tokens / self.slots, 4) if self.slots else 0.0,
+            "unbucketed_padding_waste_ratio": (
+                round(1 - self.tokens / self.unbucketed_slots, 4) if self.unbucketed_slots else 0.0
+            ),
+        }
+
+
+class LengthBucketer:
+    """
+    Tokenizes all inputs of an ``encode`` call in one pass and batches them
+    by token length, so each batch is padded only to its own longest input
+    instead of a short query being padded to a pasted error log.
+
+    Wraps the fast tokenizer from ``tokenizer.json``, loaded once per
+    encoder; inputs are truncated to ``max_seq_length``.
+    """
+
+    def __init__(self, tokenizer_path, max_seq_length: int, bucketing: bool = True):
+        from tokenizers import Tokenizer
+
+        self.max_seq_length = max_seq_length
+        self.bucketing = bucketing
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.no_padding()
+        self.pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.stats = PaddingStats()
+
+    def batches(self, texts: List[str], batch_size: int) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """Yield (input positions, padded int64 input_ids/attention_mask/token_type_ids) per batch"""
+        encodings = self.tokenizer.encode_batch(texts)
+        lengths = np.array([len(e.ids) for e in encodings], dtype='int64')
+        # Stable, so equal-length inputs keep their order
+        order = np.argsort(lengths, kind='stable') if self.bucketing else np.arange(len(texts))
+        batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+        self.stats.record(lengths, batches, batch_size)
+
+        for positions in batches:
+            width = int(lengths[positions].max())
+            input_ids = np.full((len(positions), width), self.pad_id, dtype='int64')
+            attention_mask = np.zeros((len(positions), width), dtype='int64')
+            token_type_ids = np.zeros((len(positions), width), dtype='int64')
+            for row, position in enumerate(positions):
+                encoding = encodings[position]
+                length = len(encoding.ids)
+                input_ids[row, :length] = encoding.ids
+                attention_mask[row, :length] = 1
+                token_type_ids[row, :length] = encoding.type_ids
+            yield positions, {
+                "input_ids": input_ids, "attention_mask": attention_mask, "token_type_ids": token_type_ids
+            }
+
+
+class BucketedEncoder(ABC):
+    """SentenceTransformer-compatible ``encode`` over length-bucketed batches"""
+
+    dimension: int
+    bucketer: LengthBucketer
+
+    @property
+    def max_seq_length(self) -> int:
+        return self.bucketer.max_seq_length
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Embed ``sentences`` in input order; extra SentenceTransformer kwargs are ignored"""
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        if not sentences:
+            return np.empty((0, self.dimension), dtype='float32')
+
+        embeddings = np.empty((len(sentences), self.dimension), dtype='float32')
+        for positions, feeds in self.bucketer.batches(list(sentences), batch_size):
+            embeddings[positions] = self._encode_batch(feeds)
+        return embeddings
+
+    def padding_stats(self) -> Dict[str, Any]:
+        return {"max_seq_length": self.max_seq_length, **self.bucketer.stats.snapshot()}
+
+    @abstractmethod
+    def _encode_batch(self, feeds: Dict[str, np.ndarray]) -> np.ndarray:
+        """(batch, dimension) float32 embeddings of one padded batch of tokenizer outputs"""
+
+
+class OnnxEncoder(BucketedEncoder):
+    """
+    SentenceTransformer-compatible ``encode`` on top of onnxruntime.
+
+    Reproduces the Transformer -> mean Pooling -> Normalize pipeline of the
+    exported model using the fast tokenizer from ``tokenizer.json``; neither
+    torch nor transformers is imported.
+    """
+
+    def __init__(self, model_dir, onnx_path=None, num_threads: int = 0, max_seq_length: Optional[int] = None):
+        import onnxruntime as ort
+
+        self.model_dir = Path(model_dir)
+        self.onnx_path = Path(onnx_path) if onnx_path else onnx_model_path(model_dir)
+        if not self.onnx_path.exists():
+            raise FileNotFoundError(
+                f"ONNX encoder not found at {self.onnx_path}; export it with scripts/export_onnx_encoder.py"
+            )
+
+        self.dimension = _read_json(self.model_dir, "config.json").get("hidden_size", 384)
+        self.normalize = any(m.get("type", "").endswith("Normalize") for m in self._read_modules())
+        self.bucketer = LengthBucketer(
+            self.model_dir / "tokenizer.json", resolve_max_seq_length(self.model_dir, max_seq_length)
+        )
+
+        options = ort.SessionOptions()
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(self.onnx_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _read_modules(self) -> list:
+        modules = _read_json(self.model_dir, "modules.json")
+        return modules if isinstance(modules, list) else []
+
+    def _encode_batch(self, feeds: Dict[str, np.ndarray]) -> np.ndarray:
+        feeds = {name: value for name, value in feeds.items() if name in self.input_names}
+        attention_mask = feeds["attention_mask"]
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = attention_mask[:, :, None].astype('float32')
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings.astype('float32')
+
+
+class TorchEncoder(BucketedEncoder):
+    """
+    SentenceTransformer modules fed with length-bucketed batches.
+
+    The batches are tokenized by the shared ``LengthBucketer`` and passed
+    straight to the module pipeline, so ``SentenceTransformer.encode``
+    does not tokenize every text a second time.
+    """
+
+    def __init__(self, model_dir, max_seq_length: Optional[int] = None):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        self._torch = torch
+        self.model_dir = Path(model_dir)
+        self.model = SentenceTransformer(str(self.model_dir))
+        self.model.eval()
+        self.model.max_seq_length = resolve_max_seq_length(self.model_dir, max_seq_length)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.bucketer = LengthBucketer(self.model_dir / "tokenizer.json", self.model.max_seq_length)
+        self.input_names = set(getattr(self.model.tokenizer, "model_input_names", ["input_ids", "attention_mask"]))
+
+    def _encode_batch(self, feeds: Dict[str, np.ndarray]) -> np.ndarray:
+        features = {
+            name: self._torch.from_numpy(value).to(self.model.device)
+            for name, value in feeds.items() if name in self.input_names
+        }
+        with self._torch.inference_mode():
+            embeddings = self.model(features)["sentence_embedding"]
+        return embeddings.float().cpu().numpy()
+
+
+def load_encoder(
+        model_dir,
+        backend: Optional[str] = None,
+        quantized: Optional[bool] = None,
+        num_threads: int = 0
+):
+    """Load the sentence encoder for the configured backend"""
+    backend = backend or settings.ENCODER_BACKEND
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}', expected one of {ENCODER_BACKENDS}")
+
+    if backend == "onnx":
+        quantized = settings.ENCODER_ONNX_QUANTIZED if quantized is None else quantized
+        encoder = OnnxEncoder(model_dir, onnx_model_path(model_dir, quantized), num_threads=num_threads)
+        logger.info(f"Loaded ONNX encoder from {encoder.onnx_path} (max {encoder.max_seq_length} tokens)")
+        return encoder
+
+    if not (Path(model_dir) / "tokenizer.json").exists():
+        # Slow-tokenizer-only models keep SentenceTransformer's own batching
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(str(model_dir))
+        model.max_seq_length = resolve_max_seq_length(model_dir)
+        return model
+
+    encoder = TorchEncoder(model_dir)
+    logger.info(f"Loaded SentenceTransformer encoder from {model_dir} (max {encoder.max_seq_length} tokens)")
+    return encoder
@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+import faiss
+import numpy as np
+
+from app.ai.artifacts import ArtifactPaths, read_config
+from app.ai.compact_metadata import CompactMetadataWriter
+from app.ai.encoder import resolve_max_seq_length
+from app.ai.index_factory import (
+    create_index, index_params_from_settings, resolve_params, sample_rows, train_index, training_sample_size
+)
+from app.ai.inference import encode_in_worker, encode_normalized, init_worker, load_model, threads_per_worker
+from app.ai.metadata_store import faq_index_id, faq_record, faq_text
+from app.ai.vector_transform import PCA_TRAINING_ROWS, PCATransform
+
+logger = logging.getLogger(__name__)
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process plus finished/running children (Linux reports KiB)"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / 1024.0, 1)
+
+
+class IndexBuilder:
+    """
+    Builds FAISS index, embeddings, metadata and config artifacts from FAQ records.
+
+    Records are consumed chunk by chunk: texts are encoded (optionally in a
+    process pool), embeddings are streamed into a memory-mapped ``.npy`` and
+    metadata is streamed into the JSON array, so only the chunks in flight
+    are held as Python objects. The index is then trained on a sample of the
+    memory-mapped embeddings (for IVF types and quantized codecs) and filled
+    chunk by chunk, after an optional PCA projection fitted on the same
+    kind of sample. The ``.npy`` always keeps the full model embeddings.
+    Everything is written to a staging directory and moved into
+    ``output_dir`` with atomic renames at the end.
+    """
+
+    def __init__(
+            self,
+            model_dir,
+            output_dir,
+            batch_size: int = 64,
+            workers: int = 0,
+            model_name: Optional[str] = None,
+            index_params: Optional[Dict[str, Any]] = None
+    ):
+        self.model_dir = Path(model_dir)
+        self.output = ArtifactPaths(output_dir)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.index_params = index_params or index_params_from_settings()
+        self.model_name = model_name or read_config(self.output).get('model_name', self.model_dir.name)
+        self._model = None
+
+    def _encoded_chunks(self, chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[tuple]:
+        """Yield (records, embeddings) pairs in input order"""
+        if self.workers <= 0:
+            if self._model is None:
+                self._model = load_model(str(self.model_dir), threads_per_worker(1))
+            for records in chunks:
+                yield records, encode_normalized(self._model, [faq_text(r) for r in records], self.batch_size)
+            return
+
+        torch_threads = threads_per_worker(self.workers)
+        with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_worker,
+                initargs=(str(self.model_dir), torch_threads)
+        ) as pool:
+            # Bound the number of chunks in flight so memory does not grow with the corpus
+            in_flight: Deque[tuple] = deque()
+            for records in chunks:
+                future: Future = pool.submit(encode_in_worker, [faq_text(r) for r in records], self.batch_size)
+                in_flight.append((records, future))
+                if len(in_flight) >= self.workers * 2:
+                    done_records, done_future = in_flight.popleft()
+                    yield done_records, done_future.result()
+            while in_flight:
+                done_records, done_future = in_flight.popleft()
+                yield done_records, done_future.result()
+
+    def build(
+            self,
+            chunks: Iterable[List[Any]],
+            total: int,
+            dimension: int,
+            progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """Build all artifacts from chunks of FAQ records (ORM objects or dicts)"""
+        started = time.perf_counter()
+        record_chunks = ([faq_record(faq) for faq in chunk] for chunk in chunks)
+
+        staging = Path(tempfile.mkdtemp(prefix=".index-build-", dir=self.output.data_dir))
+        staged = ArtifactPaths(staging)
+        staged.embeddings_path.parent.mkdir(parents=True, exist_ok=True)
+        staged.index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            embeddings = np.lib.format.open_memmap(
+                staged.embeddings_path, mode='w+', dtype='float32', shape=(total, dimension)
+            )
+            ids = np.empty(total, dtype='int64')
+
+            # Pass 1: encode, streaming vectors and metadata to disk
+            count = 0
+            compact_writer = CompactMetadataWriter(staged.compact_metadata_path)
+            with open(staged.metadata_path, 'w') as metadata_file:
+                metadata_file.write('[')
+                for records, vectors in self._encoded_chunks(record_chunks):
+                    if count + len(records) > total:
+                        raise RuntimeError(f"Corpus grew past the expected {total} FAQs during the build")
+
+                    embeddings[count:count + len(records)] = vectors
+                    ids[count:count + len(records)] = [faq_index_id(r['id']) for r in records]
+                    for record in records:
+                        metadata_file.write(',\n' if count else '\n')
+                        json.dump(record, metadata_file)
+                        compact_writer.add(record)
+                        count += 1
+
+                    if progress:
+                        progress(count, total)
+                metadata_file.write('\n]\n')
+            compact_writer.close()
+
+            embeddings.flush()
+            del embeddings
+            if count != total:
+                self._truncate_embeddings(staged.embeddings_path, count, dimension)
+
+            # Pass 2: train and fill the index from the memory-mapped embeddings
+            params = resolve_params(self.index_params, count, dimension)
+            index_started = time.perf_counter()
+            transform = None
+            if params['pca_dim']:
+                sample = sample_rows(np.load(staged.embeddings_path, mmap_mode='r'), PCA_TRAINING_ROWS)
+                transform = PCATransform.fit(sample, params['pca_dim'])
+                transform.save(staged.vector_transform_path)
+                logger.info(
+                    f"PCA {dimension}->{params['pca_dim']} keeps {transform.explained_variance:.1%} of the variance"
+                )
+            index = self._build_index(staged.embeddings_path, ids[:count], params, transform)
+            index_seconds = time.perf_counter() - index_started
+            faiss.write_index(index, str(staged.index_path))
+            del index
+
+            config = {
+                'model_name': self.model_name,
+                'embedding_dimension': dimension,
+                'max_seq_length': resolve_max_seq_length(self.model_dir),
+                'num_faqs': count,
+                'created_at': datetime.now().isoformat(),
+                'version': '1.0',
+                'source': 'database',
+                'index': params
+            }
+            if transform is not None:
+                config['vector_transform'] = transform.describe()
+            with open(staged.config_path, 'w') as f:
+                json.dump(config, f, indent=2)
+
+            self._publish(staged)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        elapsed = time.perf_counter() - started
+        return {
+            'num_faqs': count,
+            'index_type': params['index_type'],
+            'vector_codec': params['vector_codec'],
+            'pca_dim': params['pca_dim'],
+            'index_seconds': round(index_seconds, 2),
+            'seconds': round(elapsed, 2),
+            'faqs_per_second': round(count / elapsed, 1) if elapsed > 0 else 0.0,
+            'peak_rss_mb': _peak_rss_mb(),
+            # Only the in-process encoder is visible here; pool workers keep their own counters
+            'padding': self._model.padding_stats() if hasattr(self._model, 'padding_stats') else None
+        }
+
+    def _build_index(
+            self,
+            embeddings_path: Path,
+            ids: np.ndarray,
+            params: Dict[str, Any],
+            transform: Optional[PCATransform] = None
+    ):
+        embeddings = np.load(embeddings_path, mmap_mode='r')
+        project = transform.apply if transform is not None else np.ascontiguousarray
+        index = create_index(transform.output_dimension if transform else embeddings.shape[1], params)
+
+        sample_size = training_sample_size(params, len(embeddings))
+        if sample_size:
+            train_index(index, project(sample_rows(embeddings, sample_size)))
+
+        chunk_size = 10000
+        for start in range(0, len(embeddings), chunk_size):
+            index.add_with_ids(project(embeddings[start:start + chunk_size]), ids[start:start + chunk_size])
+        return index
+
+    @staticmethod
+    def _truncate_embeddings(path: Path, count: int, dimension: int):
+        source = np.load(path, mmap_mode='r')
+        truncated_path = path.with_suffix('.truncated.npy')
+        target = np.lib.format.open_memmap(truncated_path, mode='w+', dtype='float32', shape=(count, dimension))
+        target[:] = source[:count]
+        target.flush()
+        del source, target
+        os.replace(truncated_path, path)
+
+    def _publish(self, staged: ArtifactPaths):
+        """Move staged artifacts into place; each rename is atomic"""
+        if staged.vector_transform_path.exists():
+            self.output.vector_transform_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged.vector_transform_path, self.output.vector_transform_path)
+        elif self.output.vector_transform_path.exists():
+            self.output.vector_transform_path.unlink()
+        for staged_path, final_path in (
+                (staged.embeddings_path, self.output.embeddings_path),
+                (staged.metadata_path, self.output.metadata_path),
+                (staged.compact_metadata_path, self.output.compact_metadata_path),
+                (staged.index_path, self.output.index_path),
+                (staged.config_path, self.output.config_path),
+        ):
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged_path, final_path)
@@ -0,0 +1,214 @@
+import logging
+from typing import Any, Dict, Optional
+
+import faiss
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+# How vectors are stored inside the index; ivf_pq always uses pq
+VECTOR_CODECS = ("float32", "float16", "sq8", "pq")
+
+# Rows used to train the 8-bit scalar quantizer's per-dimension ranges
+SQ8_TRAINING_ROWS = 20000
+
+# FAISS warns below ~39 training points per IVF centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+def index_params_from_settings() -> Dict[str, Any]:
+    """Index build and search parameters from Settings"""
+    return {
+        "index_type": settings.FAISS_INDEX_TYPE,
+        "nlist": settings.FAISS_NLIST,
+        "nprobe": settings.FAISS_NPROBE,
+        "hnsw_m": settings.FAISS_HNSW_M,
+        "ef_construction": settings.FAISS_HNSW_EF_CONSTRUCTION,
+        "ef_search": settings.FAISS_HNSW_EF_SEARCH,
+        "pq_m": settings.FAISS_PQ_M,
+        "pq_nbits": settings.FAISS_PQ_NBITS,
+        "vector_codec": settings.FAISS_VECTOR_CODEC,
+        "pca_dim": settings.FAISS_PCA_DIM,
+    }
+
+
+def resolve_params(params: Dict[str, Any], num_vectors: int, dimension: int) -> Dict[str, Any]:
+    """
+    Clamp parameters to what a corpus of ``num_vectors`` embeddings of
+    ``dimension`` can support. ``pca_dim`` (0 when disabled) is the
+    dimension the index is built with.
+    """
+    params = dict(params)
+    params.setdefault("vector_codec", "float32")
+    params.setdefault("pca_dim", 0)
+    index_type = params["index_type"]
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown FAISS index type '{index_type}', expected one of {INDEX_TYPES}")
+    if params["vector_codec"] not in VECTOR_CODECS:
+        raise ValueError(f"Unknown FAISS vector codec '{params['vector_codec']}', expected one of {VECTOR_CODECS}")
+    if index_type == "ivf_pq":
+        params["vector_codec"] = "pq"
+
+    if params["pca_dim"]:
+        if params["pca_dim"] >= dimension:
+            raise ValueError(f"FAISS_PCA_DIM={params['pca_dim']} must be below the embedding dimension {dimension}")
+        if num_vectors < params["pca_dim"]:
+            logger.warning(f"Only {num_vectors} vectors, too few to fit a {params['pca_dim']}-d PCA; keeping {dimension}-d")
+            params["pca_dim"] = 0
+        else:
+            dimension = params["pca_dim"]
+
+    if index_type in ("ivf_flat", "ivf_pq"):
+        max_nlist = num_vectors // MIN_POINTS_PER_CENTROID
+        if max_nlist < 1:
+            logger.warning(f"Only {num_vectors} vectors, too few to train {index_type}; using a flat index")
+            params["index_type"] = "flat"
+            return params
+        if params["nlist"] > max_nlist:
+            logger.info(f"Reducing nlist from {params['nlist']} to {max_nlist} for {num_vectors} vectors")
+            params["nlist"] = max_nlist
+
+    if params["vector_codec"] == "pq":
+        if dimension % params["pq_m"] != 0:
+            raise ValueError(f"FAISS_PQ_M={params['pq_m']} must divide the index dimension {dimension}")
+        if num_vectors < MIN_POINTS_PER_CENTROID * 2 ** params["pq_nbits"]:
+            if params["index_type"] == "ivf_pq":
+                logger.warning(f"Only {num_vectors} vectors, too few to train PQ codebooks; using ivf_flat")
+                params["index_type"] = "ivf_flat"
+                params["vector_codec"] = "float32"
+            else:
+                logger.warning(f"Only {num_vectors} vectors, too few to train PQ codebooks; using sq8")
+                params["vector_codec"] = "sq8"
+
+    return params
+
+
+def storage_description(params: Dict[str, Any]) -> str:
+    """faiss.index_factory suffix for how vectors are stored"""
+    codec = params.get("vector_codec", "float32")
+    if codec == "float16":
+        return "SQfp16"
+    if codec == "sq8":
+        return "SQ8"
+    if codec == "pq":
+        return f"PQ{params['pq_m']}x{params['pq_nbits']}"
+    return "Flat"
+
+
+def index_description(params: Dict[str, Any]) -> str:
+    """faiss.index_factory description for the configured index type and vector codec"""
+    index_type = params["index_type"]
+    storage = storage_description(params)
+    if index_type == "flat":
+        return storage
+    if index_type == "hnsw":
+        return f"HNSW{params['hnsw_m']},{storage}"
+    return f"IVF{params['nlist']},{storage}"
+
+
+def create_index(dimension: int, params: Dict[str, Any]):
+    """Empty, ID-mapped inner-product index for the given (resolved) parameters"""
+    base = faiss.index_factory(dimension, index_description(params), faiss.METRIC_INNER_PRODUCT)
+    if params["index_type"] == "hnsw":
+        faiss.downcast_index(base).hnsw.efConstruction = params["ef_construction"]
+    apply_search_params(base, params)
+    return faiss.IndexIDMap2(base)
+
+
+def read_index(path, mmap: bool = False, index_type: Optional[str] = None):
+    """
+    Load an index, optionally memory-mapped and read-only.
+
+    Flat and HNSW storage is mapped with IO_FLAG_MMAP_IFC so workers share the
+    page cache; IVF inverted lists need IO_FLAG_MMAP instead. FAISS builds
+    without IO_FLAG_MMAP_IFC (such as the pinned faiss-cpu 1.8.0) fall back to
+    IO_FLAG_MMAP, which only maps inverted lists: flat and HNSW indexes then
+    load into each worker's memory. A mapped index must be copied with
+    ``owned_copy`` before it is modified.
+    """
+    if not mmap:
+        return faiss.read_index(str(path))
+    if index_type in ("ivf_flat", "ivf_pq"):
+        flag = faiss.IO_FLAG_MMAP
+    else:
+        flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+    return faiss.read_index(str(path), flag | faiss.IO_FLAG_READ_ONLY)
+
+
+def owned_copy(index):
+    """In-memory copy of an index whose storage may be a read-only mapping"""
+    return faiss.deserialize_index(faiss.serialize_index(index))
+
+
+def train_index(index, sample: np.ndarray):
+    if not index.is_trained:
+        index.train(np.ascontiguousarray(sample, dtype='float32'))
+
+
+def base_index(index):
+    """The index wrapped by an IndexIDMap, downcast to its concrete type"""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def apply_search_params(index, params: Dict[str, Any]):
+    """Set query-time knobs (nprobe, efSearch) on a loaded or freshly built index"""
+    base = base_index(index)
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None and params.get("nprobe"):
+        ivf.nprobe = min(params["nprobe"], ivf.nlist)
+    if isinstance(base, faiss.IndexHNSW) and params.get("ef_search"):
+        base.hnsw.efSearch = params["ef_search"]
+
+
+def search_parameters(index, selector):
+    """SearchParameters restricting a search to ``selector`` while keeping nprobe/efSearch"""
+    base = base_index(index)
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    if isinstance(base, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=base.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def index_type_of(index) -> str:
+    base = base_index(index)
+    if isinstance(base, faiss.IndexHNSW):
+        return "hnsw"
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None:
+        return "ivf_pq" if isinstance(faiss.downcast_index(ivf), faiss.IndexIVFPQ) else "ivf_flat"
+    return "flat"
+
+
+def supports_removal(index) -> bool:
+    """HNSW graphs cannot drop vectors; other index types can"""
+    return index_type_of(index) != "hnsw"
+
+
+def sample_rows(vectors: np.ndarray, max_rows: int, seed: int = 0) -> np.ndarray:
+    """Random training sample from a (possibly memory-mapped) array without loading all of it"""
+    if len(vectors) <= max_rows:
+        return np.asarray(vectors, dtype='float32')
+    rows = np.sort(np.random.default_rng(seed).choice(len(vectors), size=max_rows, replace=False))
+    return np.asarray(vectors[rows], dtype='float32')
+
+
+def training_sample_size(params: Dict[str, Any], num_vectors: Optional[int] = None) -> int:
+    """Training rows needed by the coarse quantizer and the vector codec (0 if untrained)"""
+    codec = params.get("vector_codec", "float32")
+    sizes = [0]
+    if params["index_type"] in ("ivf_flat", "ivf_pq"):
+        sizes.append(params["nlist"] * 64)
+    if codec == "pq":
+        sizes.append(2 ** params["pq_nbits"] * 64)
+    elif codec == "sq8":
+        sizes.append(SQ8_TRAINING_ROWS)
+    size = max(sizes)
+    return min(size, num_vectors) if num_vectors is not None else size
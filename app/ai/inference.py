@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from app.ai.encoder import load_encoder
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("thread", "process")
+
+# Per-process model for pool workers, loaded once by the initializer
+_worker_model = None
+
+
+def load_model(model_dir: str, num_threads: int = 0):
+    """Sentence encoder for the configured ENCODER_BACKEND"""
+    return load_encoder(model_dir, num_threads=num_threads)
+
+
+def encode_normalized(model, texts: List[str], batch_size: int = 32) -> np.ndarray:
+    """Encode texts into unit-normalized float32 rows"""
+    embeddings = np.asarray(model.encode(texts, batch_size=batch_size), dtype='float32')
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    return embeddings
+
+
+def threads_per_worker(workers: int, configured: int = 0) -> int:
+    """Intra-op threads per inference worker so that workers x threads does not exceed the cores"""
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def configure_threads(num_threads: int):
+    """Cap torch and FAISS (OpenMP) thread pools of the current process"""
+    # The ONNX backend sizes its own session and must not pull in torch
+    if settings.ENCODER_BACKEND == "torch":
+        try:
+            import torch
+            torch.set_num_threads(num_threads)
+        except ImportError:
+            pass
+    try:
+        import faiss
+        faiss.omp_set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+
+def init_worker(model_dir: str, num_threads: int):
+    global _worker_model
+    configure_threads(num_threads)
+    _worker_model = load_model(model_dir, num_threads)
+
+
+def encode_in_worker(texts: List[str], batch_size: int) -> np.ndarray:
+    return encode_normalized(_worker_model, texts, batch_size)
+
+
+def worker_ready() -> bool:
+    return _worker_model is not None
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-bound encode and search work off the event loop.
+
+    In ``thread`` mode everything runs on a small dedicated thread pool
+    (torch and FAISS release the GIL in their kernels). In ``process`` mode
+    encoding is sent to worker processes that each hold their own model
+    (the parent loads none), while index searches stay on the threads so
+    the index is not copied.
+    Torch/FAISS thread counts are split across workers to avoid
+    oversubscribing the cores.
+    """
+
+    def __init__(
+            self,
+            model_dir,
+            mode: str = "thread",
+            workers: int = 1,
+            torch_threads: int = 0
+    ):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown inference executor '{mode}', expected one of {EXECUTOR_MODES}")
+
+        self.model_dir = str(model_dir)
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.num_threads = threads_per_worker(self.workers, torch_threads)
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+        if mode == "process":
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_worker,
+                initargs=(self.model_dir, self.num_threads)
+            )
+        else:
+            configure_threads(self.num_threads)
+        logger.info(
+            f"Inference executor: {self.mode} x{self.workers}, {self.num_threads} intra-op thread(s) per worker"
+        )
+
+    @classmethod
+    def from_settings(cls, model_dir) -> "InferenceExecutor":
+        return cls(
+            model_dir,
+            mode=settings.INFERENCE_EXECUTOR,
+            workers=settings.INFERENCE_WORKERS,
+            torch_threads=settings.INFERENCE_TORCH_THREADS
+        )
+
+    @property
+    def executor(self) -> Executor:
+        """Thread pool for blocking work that must stay in this process"""
+        return self._threads
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await a blocking call on the inference threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads, partial(fn, *args, **kwargs))
+
+    def start_workers(self):
+        """Start the worker processes and wait for their models; raises if a worker cannot load one"""
+        if self._processes is None:
+            return
+        for future in [self._processes.submit(worker_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def encode(self, model, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Blocking encode: in a worker process (``model`` is then None), or with ``model`` in the calling thread"""
+        if self._processes is not None:
+            return self._processes.submit(encode_in_worker, texts, batch_size).result()
+        return encode_normalized(model, texts, batch_size)
+
+    def shutdown(self, wait: bool = False):
+        self._threads.shutdown(wait=wait)
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait)
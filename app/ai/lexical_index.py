@@ -0,0 +1,122 @@
+import heapq
+import math
+from collections import Counter
+from typing import Any, Container, Dict, List, Optional, Tuple
+
+from app.ai.cache import normalize_query
+
+# Very common words carry no ranking signal and make postings lists long
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i if in is it me my of on or "
+    "our so that the this to was we what when where which who why will with you your".split()
+)
+
+# Term-frequency weight of each FAQ field (a simple BM25F)
+FIELD_WEIGHTS = (("question", 2.0), ("keywords", 2.0), ("answer", 1.0))
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in normalize_query(text or "").split() if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over FAQ question, keywords and answer.
+
+    Documents are keyed by an integer id (the FAISS id of the FAQ) and can be
+    added, replaced and removed one at a time, so the index follows admin
+    FAQ writes without a rebuild. Not thread-safe on its own; the search
+    service guards it with the same lock as the FAISS index.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_length: Dict[int, float] = {}
+        self._total_length = 0.0
+
+    def add(self, doc_id: int, record: Dict[str, Any]):
+        """Index a FAQ record, replacing any previous version of the same document"""
+        doc_id = int(doc_id)
+        self.remove(doc_id)
+
+        terms: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(record.get(field)):
+                terms[token] += weight
+        if not terms:
+            return
+
+        self._doc_terms[doc_id] = dict(terms)
+        length = sum(terms.values())
+        self._doc_length[doc_id] = length
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: int) -> bool:
+        doc_id = int(doc_id)
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_length.pop(doc_id)
+        return True
+
+    def _idf(self, df: int) -> float:
+        n = len(self._doc_terms)
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def search(
+            self,
+            query: str,
+            top_k: int = 10,
+            doc_filter: Optional[Container[int]] = None
+    ) -> List[Tuple[int, float, float]]:
+        """
+        Top ``top_k`` documents (restricted to ``doc_filter`` if given) as
+        (doc_id, bm25, normalized) tuples.
+
+        ``normalized`` divides the BM25 score by the score a document would
+        get for saturating every query term, which puts it in [0, 1] and
+        makes it comparable with cosine similarities.
+        """
+        if not self._doc_terms:
+            return []
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self._postings]
+        if not terms:
+            return []
+
+        avg_length = self._total_length / len(self._doc_terms)
+        scores: Dict[int, float] = {}
+        max_score = 0.0
+        for term in terms:
+            postings = self._postings[term]
+            idf = self._idf(len(postings))
+            max_score += idf * (self.k1 + 1.0)
+            for doc_id, tf in postings.items():
+                if doc_filter is not None and doc_id not in doc_filter:
+                    continue
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_length[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        # Unmatched query terms still count in the normalizer so partial matches score lower
+        for term in dict.fromkeys(tokenize(query)):
+            if term not in self._postings:
+                max_score += self._idf(0) * (self.k1 + 1.0)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(doc_id, score, min(1.0, score / max_score)) for doc_id, score in best]
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id) -> bool:
+        return int(doc_id) in self._doc_terms
@@ -0,0 +1,166 @@
+import hashlib
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+# FAISS ids are signed 64-bit; keep derived ids positive so -1 stays "no result"
+_INDEX_ID_MASK = (1 << 63) - 1
+
+FAQ_FIELDS = ('id', 'question', 'answer', 'category', 'keywords')
+# Stored as UTF-8 buffers; category is interned separately
+_STRING_FIELDS = ('id', 'question', 'answer', 'keywords')
+
+
+def faq_index_id(faq_id: str) -> int:
+    """Stable FAISS id for a FAQ id (DB UUIDs as well as legacy 'faq_N' ids)"""
+    digest = hashlib.blake2b(str(faq_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & _INDEX_ID_MASK
+
+
+def faq_record(faq: Any) -> Dict[str, Any]:
+    """Metadata record for a FAQ given as an ORM object or a mapping"""
+    if isinstance(faq, dict):
+        return {field: faq.get(field) for field in FAQ_FIELDS}
+    return {field: getattr(faq, field, None) for field in FAQ_FIELDS}
+
+
+def category_key(category: Optional[str]) -> str:
+    """Case- and whitespace-insensitive category name used for scoped search"""
+    return (category or '').strip().casefold()
+
+
+def faq_text(record: Dict[str, Any]) -> str:
+    """Text that is embedded for a FAQ, shared by the online index and the offline builder"""
+    return record['question']
+
+
+class MetadataStore:
+    """
+    Columnar FAQ metadata keyed by FAISS id.
+
+    Rows live in flat arrays sorted by id: each string field is one UTF-8
+    buffer plus an offsets array, and categories are interned into a small
+    table referenced by an int32 code. There are no per-row Python objects;
+    ``get`` materializes a fresh dict only for the row asked for, so callers
+    may mutate what they get. Writes go to an overlay that is folded back
+    into the columns once it grows past ``compact_threshold``.
+    """
+
+    # Overlay size (absolute, or relative to the columns) that triggers a rebuild
+    compact_threshold = 1024
+    compact_ratio = 0.1
+
+    def __init__(self, records: Optional[Iterable[Dict[str, Any]]] = None):
+        self._overlay: Dict[int, Dict[str, Any]] = {}
+        self._deleted: Set[int] = set()
+        self._build(records or [])
+
+    def _build(self, records: Iterable[Dict[str, Any]]):
+        # Last write wins for duplicate ids, like dict assignment
+        by_id = {faq_index_id(record['id']): record for record in records}
+        order = sorted(by_id)
+
+        self._ids = array('q', order)
+        self._buffers: Dict[str, bytes] = {}
+        self._offsets: Dict[str, array] = {}
+        # One bit per row and field, set where the value is None (stored as '')
+        self._nulls: Dict[str, bytearray] = {}
+        for field in _STRING_FIELDS:
+            chunks = []
+            offsets = array('Q', [0])
+            nulls = bytearray((len(order) + 7) // 8)
+            position = 0
+            for row, index_id in enumerate(order):
+                value = by_id[index_id].get(field)
+                if value is None:
+                    nulls[row >> 3] |= 1 << (row & 7)
+                    value = ''
+                data = str(value).encode()
+                chunks.append(data)
+                position += len(data)
+                offsets.append(position)
+            self._buffers[field] = b''.join(chunks)
+            self._offsets[field] = offsets
+            self._nulls[field] = nulls
+
+        self._categories: List[Optional[str]] = []
+        category_codes: Dict[Optional[str], int] = {}
+        self._category_codes = array('i')
+        for index_id in order:
+            category = by_id[index_id].get('category')
+            code = category_codes.get(category)
+            if code is None:
+                code = category_codes[category] = len(self._categories)
+                self._categories.append(sys.intern(category) if isinstance(category, str) else category)
+            self._category_codes.append(code)
+
+    def _row(self, index_id: int) -> int:
+        row = bisect_left(self._ids, index_id)
+        if row < len(self._ids) and self._ids[row] == index_id:
+            return row
+        return -1
+
+    def _materialize(self, row: int) -> Dict[str, Any]:
+        record = {}
+        for field in _STRING_FIELDS:
+            if self._nulls[field][row >> 3] & (1 << (row & 7)):
+                record[field] = None
+            else:
+                offsets = self._offsets[field]
+                record[field] = self._buffers[field][offsets[row]:offsets[row + 1]].decode()
+        record['category'] = self._categories[self._category_codes[row]]
+        return {field: record[field] for field in FAQ_FIELDS}
+
+    def get(self, index_id: int) -> Optional[Dict[str, Any]]:
+        index_id = int(index_id)
+        if index_id in self._overlay:
+            return dict(self._overlay[index_id])
+        if index_id in self._deleted:
+            return None
+        row = self._row(index_id)
+        return self._materialize(row) if row >= 0 else None
+
+    def upsert(self, record: Dict[str, Any]) -> int:
+        index_id = faq_index_id(record['id'])
+        self._overlay[index_id] = {field: record.get(field) for field in FAQ_FIELDS}
+        self._deleted.discard(index_id)
+        if len(self._overlay) > max(self.compact_threshold, self.compact_ratio * len(self._ids)):
+            self.compact()
+        return index_id
+
+    def remove(self, index_id: int) -> Optional[Dict[str, Any]]:
+        index_id = int(index_id)
+        record = self.get(index_id)
+        self._overlay.pop(index_id, None)
+        if self._row(index_id) >= 0:
+            self._deleted.add(index_id)
+        return record
+
+    def compact(self):
+        """Fold the overlay and deletions back into the columns"""
+        records = list(self.records())
+        self._overlay = {}
+        self._deleted = set()
+        self._build(records)
+
+    def ids(self) -> List[int]:
+        base = [i for i in self._ids if i not in self._deleted and i not in self._overlay]
+        return base + list(self._overlay)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        for row, index_id in enumerate(self._ids):
+            if index_id not in self._deleted and index_id not in self._overlay:
+                yield self._materialize(row)
+        for record in self._overlay.values():
+            yield dict(record)
+
+    def __contains__(self, index_id) -> bool:
+        index_id = int(index_id)
+        if index_id in self._overlay:
+            return True
+        return index_id not in self._deleted and self._row(index_id) >= 0
+
+    def __len__(self) -> int:
+        base_overlaid = sum(1 for i in self._overlay if self._row(i) >= 0)
+        return len(self._ids) - len(self._deleted) - base_overlaid + len(self._overlay)
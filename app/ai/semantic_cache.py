@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from app.ai.metadata_store import category_key
+
+# Nearest entries examined per lookup; later ones may be expired or scoped to another category
+_LOOKUP_CANDIDATES = 8
+
+
+class GeneratedAnswerCache:
+    """
+    Semantic cache of LLM-generated answers keyed on query embeddings.
+
+    A lookup returns the answer stored for the nearest previous question if
+    its cosine similarity reaches ``threshold`` and both were asked in the
+    same category scope, so paraphrases reuse one generation. Entries
+    expire after ``ttl_seconds``, the least recently used one is evicted
+    beyond ``max_entries``, and ``invalidate_categories`` drops every
+    answer generated from FAQs of a changed category.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, threshold: float = 0.9):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._index = None
+        # entry id -> (answer, scope, categories, stored_at, generation_seconds), in LRU order
+        self._entries: "OrderedDict[int, Tuple[str, str, FrozenSet[str], float, float]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Generation time not spent thanks to hits, as measured when each answer was stored
+        self.saved_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, embedding: np.ndarray, category: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """(answer, similarity) of the closest live entry in the same scope, or None"""
+        scope = category_key(category)
+        with self._lock:
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            scores, ids = self._index.search(self._row(embedding), min(_LOOKUP_CANDIDATES, len(self._entries)))
+            now = time.monotonic()
+            for score, entry_id in zip(scores[0], ids[0]):
+                if entry_id < 0 or score < self.threshold:
+                    break
+                entry = self._entries.get(int(entry_id))
+                if entry is None or entry[1] != scope:
+                    continue
+                if self.ttl_seconds and now - entry[3] > self.ttl_seconds:
+                    self._remove_locked([int(entry_id)])
+                    self.expirations += 1
+                    continue
+
+                self._entries.move_to_end(int(entry_id))
+                self.hits += 1
+                self.saved_seconds += entry[4]
+                return entry[0], float(score)
+
+            self.misses += 1
+            return None
+
+    def put(
+            self,
+            embedding: np.ndarray,
+            answer: str,
+            category: Optional[str] = None,
+            source_categories: Iterable[Optional[str]] = (),
+            generation_seconds: float = 0.0
+    ):
+        """
+        Store a generated answer. ``source_categories`` are the categories of
+        the FAQs the prompt was built from; together with the scope they
+        decide which FAQ changes invalidate the entry.
+        """
+        if not self.enabled:
+            return
+
+        scope = category_key(category)
+        categories = frozenset(key for key in map(category_key, source_categories) if key)
+        if scope:
+            categories |= {scope}
+
+        row = self._row(embedding)
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(row.shape[1]))
+            entry_id = self._next_id
+            self._next_id += 1
+            self._index.add_with_ids(row, np.array([entry_id], dtype='int64'))
+            self._entries[entry_id] = (answer, scope, categories, time.monotonic(), generation_seconds)
+            self.stores += 1
+
+            overflow = len(self._entries) - self.max_entries
+            if overflow > 0:
+                self._remove_locked(list(self._entries)[:overflow])
+                self.evictions += overflow
+
+    def invalidate_categories(self, categories: Iterable[Optional[str]]) -> int:
+        """Drop entries generated from FAQs in any of these categories"""
+        keys = {key for key in map(category_key, categories) if key}
+        if not keys:
+            return 0
+
+        with self._lock:
+            stale = [entry_id for entry_id, entry in self._entries.items() if entry[2] & keys]
+            self._remove_locked(stale)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._remove_locked(list(self._entries))
+
+    def _remove_locked(self, entry_ids):
+        if not entry_ids:
+            return
+        for entry_id in entry_ids:
+            del self._entries[entry_id]
+        self._index.remove_ids(np.array(entry_ids, dtype='int64'))
+
+    @staticmethod
+    def _row(embedding: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(np.asarray(embedding, dtype='float32').reshape(1, -1))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
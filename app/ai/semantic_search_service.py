@@ -1,33 +1,109 @@
 import os
 import json
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple
 from pathlib import Path
 
+from app.ai.artifacts import ArtifactPaths, atomic_write, read_config, resolve_artifact_dir, write_json_atomic
+from app.ai.batching import MicroBatcher
+from app.ai.cache import AnswerCache, EmbeddingCache, normalize_query
+from app.ai.lexical_index import BM25Index
+from app.ai.metadata_store import MetadataStore, category_key, faq_index_id, faq_record, faq_text
+from app.core.config import settings
+
 # Only import if available (graceful degradation)
 try:
-    from sentence_transformers import SentenceTransformer
     import faiss
     import numpy as np
+    from app.ai.encoder import load_encoder, resolve_max_seq_length
+    from app.ai.inference import InferenceExecutor
+    from app.ai.compact_metadata import MmapMetadataStore, write_compact_metadata
+    from app.ai.semantic_cache import GeneratedAnswerCache
+    from app.ai.vector_transform import PCATransform, load_vector_transform
+    from app.ai.index_factory import (
+        apply_search_params, index_params_from_settings, index_type_of, owned_copy, read_index,
+        search_parameters, supports_removal
+    )
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Similarity below which a FAQ is not returned at all; answers additionally need their confidence_threshold
+DEFAULT_MIN_SCORE = 0.3
+
 class SemanticSearchService:
     """Production-ready semantic search service with fallback"""
 
-    def __init__(self, data_dir: str = "app/data"):
+    def __init__(
+            self,
+            data_dir: str = "app/data",
+            embedding_cache: Optional[EmbeddingCache] = None,
+            generation: Optional[str] = None
+    ):
         self.data_dir = Path(data_dir)
+        # Artifact generation this instance serves (None for the legacy flat layout)
+        self.generation = generation
+        self.paths = ArtifactPaths(self.data_dir)
         self.model = None
+        self.model_fingerprint = None
         self.index = None
-        self.metadata = []
+        self.metadata = MetadataStore()
+        # BM25 over the same FAQs, keyed by FAISS id (None when hybrid search is off)
+        self.lexical: Optional[BM25Index] = None
+        # FAISS ids per category key, and the ID selectors built from them on demand
+        self._category_ids: Dict[str, Set[int]] = {}
+        self._category_selectors: Dict[str, Tuple[Any, Any]] = {}
+        self.embeddings = None
+        # PCA projection the index was built with, applied to every query and upserted FAQ
+        self.vector_transform: Optional["PCATransform"] = None
+        self.vector_codec = 'float32'
+        # Only an index built from the database (scripts/build_faq_index.py) is keyed by the ids
+        # admin writes carry; exported artifacts number their FAQs faq_1, faq_2, ...
+        self.keyed_by_database_ids = False
         self.is_initialized = False
+        # Seconds spent in each load/warmup stage, reported by /ready
+        self.load_timings: Dict[str, float] = {}
+        self.is_warm = False
+        # Set while the index storage is a shared read-only mapping
+        self._index_mapped = False
+        # Guards the index and metadata against concurrent search and in-place updates
+        self._index_lock = threading.RLock()
+        self._dirty = False
+        # Encode and search run here instead of on the event loop
+        self.inference = InferenceExecutor.from_settings(self.paths.model_dir) if AI_AVAILABLE else None
+        self.batcher = MicroBatcher(
+            self._search_batch_items,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+            executor=self.inference.executor if self.inference else None
+        )
+        self.embedding_cache = embedding_cache or EmbeddingCache(
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS
+        )
+        self.answer_cache = AnswerCache(
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS
+        )
+        # LLM answers for low-confidence questions, reused for paraphrases
+        self.generated_answers = GeneratedAnswerCache(
+            max_entries=settings.GENERATED_ANSWER_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.GENERATED_ANSWER_CACHE_TTL_SECONDS,
+            threshold=settings.GENERATED_ANSWER_CACHE_THRESHOLD
+        ) if AI_AVAILABLE else None
 
         if AI_AVAILABLE:
             try:
+                started = time.perf_counter()
                 self._load_components()
+                self.load_timings['total_load'] = round(time.perf_counter() - started, 3)
                 self.is_initialized = True
                 logger.info("✅ Semantic search initialized successfully")
             except Exception as e:
@@ -39,64 +115,425 @@ class SemanticSearchService:
     def _load_components(self):
         """Load all AI components"""
         # Load sentence transformer
-        model_path = self.data_dir / "models" / "sentence_transformer"
+        model_path = self.paths.model_dir
         if not model_path.exists():
             raise FileNotFoundError(f"Model not found at {model_path}")
 
-        self.model = SentenceTransformer(str(model_path))
-        logger.info(f"Loaded SentenceTransformer from {model_path}")
+        started = time.perf_counter()
+        if self.inference.mode == 'process':
+            # Worker processes load their own encoders in their initializer; a copy here would never
+            # be used and cost a full model per uvicorn worker
+            self.model = None
+            self.inference.start_workers()
+        else:
+            # torch is only imported for ENCODER_BACKEND=torch
+            self.model = load_encoder(model_path, num_threads=self.inference.num_threads)
+        self.load_timings['model'] = round(time.perf_counter() - started, 3)
+        logger.info(f"Loaded {settings.ENCODER_BACKEND} encoder from {model_path} ({self.inference.mode} mode)")
+        self.model_fingerprint = _encoder_fingerprint(model_path)
+        self.embedding_cache.bind_model(self.model_fingerprint)
 
         # Load FAISS index
-        index_path = self.data_dir / "models" / "faiss_index.bin"
+        index_path = self.paths.index_path
         if not index_path.exists():
             raise FileNotFoundError(f"FAISS index not found at {index_path}")
 
-        self.index = faiss.read_index(str(index_path))
-        logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors")
+        started = time.perf_counter()
+        config = read_config(self.paths)
+        built_type = config.get('index', {}).get('index_type', 'flat')
+        self.vector_codec = config.get('index', {}).get('vector_codec', 'float32')
+        self.keyed_by_database_ids = config.get('source') == 'database'
+        mmap_load = settings.AI_MMAP_LOAD
+        index = read_index(index_path, mmap=mmap_load, index_type=built_type)
+        logger.info(f"Loaded FAISS index with {index.ntotal} vectors{' (mmap)' if mmap_load else ''}")
+
+        # Queries must go through the same projection as the indexed FAQs
+        self.vector_transform = load_vector_transform(self.paths, config)
+        if self.vector_transform is not None and self.vector_transform.output_dimension != index.d:
+            raise ValueError(
+                f"FAISS index is {index.d}-d but the PCA transform produces "
+                f"{self.vector_transform.output_dimension}-d vectors"
+            )
 
-        # Load metadata
-        metadata_path = self.data_dir / "data" / "faq_metadata.json"
-        if not metadata_path.exists():
-            raise FileNotFoundError(f"Metadata not found at {metadata_path}")
+        if mmap_load and self.paths.embeddings_path.exists():
+            self.embeddings = np.load(self.paths.embeddings_path, mmap_mode='r')
+        self.load_timings['index'] = round(time.perf_counter() - started, 3)
 
-        with open(metadata_path, 'r') as f:
-            self.metadata = json.load(f)
+        # Load metadata; a positional index needs the JSON list to know which row is which FAQ
+        started = time.perf_counter()
+        id_mapped = isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2))
+        if mmap_load and id_mapped and self.paths.compact_metadata_path.exists():
+            self.metadata = MmapMetadataStore(self.paths.compact_metadata_path)
+        else:
+            metadata_path = self.paths.metadata_path
+            if not metadata_path.exists():
+                raise FileNotFoundError(f"Metadata not found at {metadata_path}")
+
+            with open(metadata_path, 'r') as f:
+                records = json.load(f)
+            self.metadata = MetadataStore(records)
+        self.load_timings['metadata'] = round(time.perf_counter() - started, 3)
         logger.info(f"Loaded {len(self.metadata)} FAQ metadata entries")
 
+        for record in self.metadata.records():
+            self._track_category(faq_index_id(record['id']), record)
+
+        if settings.HYBRID_SEARCH_ENABLED:
+            started = time.perf_counter()
+            lexical = BM25Index()
+            for record in self.metadata.records():
+                lexical.add(faq_index_id(record['id']), record)
+            self.lexical = lexical
+            self.load_timings['lexical'] = round(time.perf_counter() - started, 3)
+            logger.info(f"Built BM25 index over {len(lexical)} FAQs")
+
+        if id_mapped:
+            self.index = index
+            self._index_mapped = mmap_load
+        else:
+            started = time.perf_counter()
+            self.index = self._ensure_id_map(index, records)
+            self.load_timings['id_map'] = round(time.perf_counter() - started, 3)
+
+        # Honor the configured index type and query-time parameters
+        params = index_params_from_settings()
+        loaded_type = index_type_of(self.index)
+        if loaded_type != params['index_type']:
+            logger.warning(
+                f"FAISS index on disk is '{loaded_type}' but FAISS_INDEX_TYPE is "
+                f"'{params['index_type']}'; rebuild it with scripts/build_faq_index.py"
+            )
+        apply_search_params(self.index, params)
+
+    def _ensure_id_map(self, index, records: List[Dict[str, Any]]):
+        """Re-key a positional index (row i == records[i]) by FAQ id so it can be updated in place"""
+        if index.ntotal != len(records):
+            raise ValueError(
+                f"FAISS index has {index.ntotal} vectors but metadata has {len(records)} entries"
+            )
+
+        if self.embeddings is not None and self.embeddings.shape == (index.ntotal, index.d):
+            vectors = np.ascontiguousarray(self.embeddings, dtype='float32')
+        else:
+            vectors = index.reconstruct_n(0, index.ntotal)
+        base = faiss.IndexFlat(index.d, index.metric_type) if self._is_flat(index) else owned_copy(index)
+        base.reset()
+        id_map = faiss.IndexIDMap2(base)
+        if len(records):
+            ids = np.array([faq_index_id(r['id']) for r in records], dtype='int64')
+            id_map.add_with_ids(vectors, ids)
+        logger.info(f"Re-keyed positional FAISS index by FAQ id ({id_map.ntotal} vectors)")
+        return id_map
+
+    @staticmethod
+    def _is_flat(index) -> bool:
+        return isinstance(faiss.downcast_index(index), faiss.IndexFlat)
+
+    def _own_index(self):
+        """Copy a memory-mapped index into private memory before its first in-place update"""
+        if self._index_mapped:
+            self.index = owned_copy(self.index)
+            apply_search_params(self.index, index_params_from_settings())
+            self._index_mapped = False
+            logger.info("Copied memory-mapped FAISS index into private memory for updates")
+
+    def warmup(self, batch_sizes: Optional[List[int]] = None) -> Dict[str, float]:
+        """
+        Run dummy encodes and searches so the first real request skips one-off
+        allocation and kernel setup costs. Caches are bypassed so the warmup
+        queries never show up as hits.
+        """
+        if not self.is_initialized:
+            self.is_warm = True
+            return self.load_timings
+
+        if batch_sizes is None:
+            batch_sizes = sorted({1, settings.EMBEDDING_BATCH_MAX_SIZE})
+
+        started = time.perf_counter()
+        for batch_size in batch_sizes:
+            texts = [f"warmup query {i} about my account and order" for i in range(batch_size)]
+            embeddings = self._project(self.inference.encode(self.model, texts, batch_size=batch_size))
+            with self._index_lock:
+                self.index.search(embeddings, 5)
+
+        self.load_timings['warmup'] = round(time.perf_counter() - started, 3)
+        self.is_warm = True
+        logger.info(f"🔥 Semantic search warmed up at batch sizes {batch_sizes} in {self.load_timings['warmup']}s")
+        return self.load_timings
+
     def search_faqs(
             self,
             query: str,
             top_k: int = 5,
-            min_score: float = 0.3
+            min_score: float = DEFAULT_MIN_SCORE,
+            category: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Search for relevant FAQs"""
+        """Search for relevant FAQs, optionally only within one category"""
         if not self.is_initialized:
             logger.warning("Semantic search not available, returning empty results")
             return []
 
         try:
-            # Generate query embedding
-            query_embedding = self.model.encode([query])
-            query_normalized = query_embedding / np.linalg.norm(query_embedding)
-
-            # Search index
-            scores, indices = self.index.search(
-                query_normalized.astype('float32'),
-                top_k
-            )
+            results = self.search_faqs_batch([query], top_k=top_k, min_score=min_score, category=category)[0]
+            logger.info(f"Found {len(results)} relevant FAQs for query: {query[:50]}...")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in semantic search: {e}")
+            return []
+
+    def search_faqs_batch(
+            self,
+            queries: List[str],
+            top_k: int = 5,
+            min_score: float = DEFAULT_MIN_SCORE,
+            category: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for relevant FAQs for several queries with one encode and one index search"""
+        if not queries:
+            return []
+
+        return self._search_vectors(queries, self._encode_queries(queries), top_k, min_score, category)
+
+    def _search_vectors(
+            self,
+            queries: List[str],
+            query_normalized: "np.ndarray",
+            top_k: int,
+            min_score: float,
+            category: Optional[str]
+    ) -> List[List[Dict[str, Any]]]:
+        """Search already encoded queries; a known category restricts both retrievers to its FAQs"""
+        with self._index_lock:
+            scope = self._category_scope(category)
+
+            # Search index; fusion needs a deeper candidate pool than the final top_k
+            k = max(top_k, settings.HYBRID_CANDIDATES) if self.lexical is not None else top_k
+            if scope is None:
+                scores, indices = self.index.search(query_normalized, k)
+            else:
+                scores, indices = self.index.search(
+                    query_normalized, k, params=search_parameters(self.index, scope[1])
+                )
 
             # Format results
-            results = []
-            for score, idx in zip(scores[0], indices[0]):
-                if score >= min_score and idx < len(self.metadata):
-                    result = self.metadata[idx].copy()
-                    result['similarity_score'] = float(score)
-                    result['source'] = 'semantic_search'
+            batch_results = []
+            for query, query_vector, row_scores, row_indices in zip(queries, query_normalized, scores, indices):
+                semantic: Dict[int, float] = {}
+                for score, idx in zip(row_scores, row_indices):
+                    # Skip padding, stale vectors without metadata and duplicates of re-added ids
+                    if idx >= 0 and idx not in semantic and idx in self.metadata:
+                        semantic[int(idx)] = float(score)
+
+                if self.lexical is not None:
+                    ranked = self._fuse(query, query_vector, semantic, scope[0] if scope else None)
+                else:
+                    ranked = [(idx, score, score, None) for idx, score in semantic.items()]
+
+                results = []
+                for idx, fused_score, semantic_score, lexical_score in ranked:
+                    # Thresholds (min_score, FAQ-direct, resolved) apply to the cosine; fusion only orders
+                    if semantic_score < min_score:
+                        continue
+                    # Materialized only for rows that are returned; a fresh dict each time
+                    result = self.metadata.get(idx)
+                    if result is None:
+                        continue
+                    result['similarity_score'] = semantic_score
+                    if lexical_score is None:
+                        result['source'] = 'semantic_search'
+                    else:
+                        result['semantic_score'] = semantic_score
+                        result['hybrid_score'] = fused_score
+                        result['lexical_score'] = lexical_score
+                        result['source'] = 'hybrid_search'
                     results.append(result)
+                    if len(results) == top_k:
+                        break
+                batch_results.append(results)
 
-            logger.info(f"Found {len(results)} relevant FAQs for query: {query[:50]}...")
-            return results
+        return batch_results
+
+    def _fuse(
+            self,
+            query: str,
+            query_vector: "np.ndarray",
+            semantic: Dict[int, float],
+            allowed: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float, float, float]]:
+        """
+        Merge FAISS and BM25 candidates into (id, score, semantic, lexical) tuples.
+
+        The fused score is the cosine moved towards 1.0 by the normalized
+        BM25 score and is only used for ordering; results report the cosine
+        as their similarity, so the confidence thresholds are unaffected.
+        HYBRID_FUSION decides the order: by the fused score, or by
+        reciprocal rank fusion of both lists.
+        """
+        hits = self.lexical.search(query, settings.HYBRID_CANDIDATES, doc_filter=allowed)
+        lexical = {doc_id: normalized for doc_id, _, normalized in hits}
+        weight = settings.HYBRID_LEXICAL_WEIGHT
+
+        fused = []
+        for idx in dict.fromkeys([*semantic, *lexical]):
+            cosine = semantic[idx] if idx in semantic else self._vector_score(query_vector, idx)
+            lexical_score = lexical.get(idx, 0.0)
+            fused.append((idx, cosine + weight * lexical_score * (1.0 - cosine), cosine, lexical_score))
+
+        if settings.HYBRID_FUSION == "rrf":
+            k = settings.HYBRID_RRF_K
+            semantic_rank = {idx: rank for rank, idx in enumerate(sorted(semantic, key=semantic.get, reverse=True))}
+            lexical_rank = {idx: rank for rank, idx in enumerate(lexical)}
+            fused.sort(
+                key=lambda item: sum(1.0 / (k + ranks[item[0]] + 1) for ranks in (semantic_rank, lexical_rank)
+                                     if item[0] in ranks),
+                reverse=True
+            )
+        else:
+            fused.sort(key=lambda item: item[1], reverse=True)
+        return fused
+
+    def _vector_score(self, query_vector: "np.ndarray", index_id: int) -> float:
+        """Cosine of a FAQ outside the FAISS candidates; 0.0 where the index cannot return vectors"""
+        try:
+            return float(np.dot(self.index.reconstruct(int(index_id)), query_vector))
+        except RuntimeError:
+            return 0.0
+
+    def search_lexical(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """BM25-only search, no encoding; empty when hybrid search is disabled"""
+        if self.lexical is None:
+            return []
+
+        with self._index_lock:
+            results = []
+            for idx, score, normalized in self.lexical.search(query, top_k):
+                result = self.metadata.get(idx)
+                if result is None:
+                    continue
+                result['lexical_score'] = normalized
+                result['source'] = 'lexical_search'
+                results.append(result)
+        return results
+
+    def _track_category(self, index_id: int, record: Dict[str, Any]):
+        key = category_key(record.get('category'))
+        if key:
+            self._category_ids.setdefault(key, set()).add(int(index_id))
+            self._category_selectors.pop(key, None)
+
+    def _untrack_category(self, index_id: int, record: Optional[Dict[str, Any]]):
+        key = category_key(record.get('category')) if record else ''
+        ids = self._category_ids.get(key)
+        if ids is not None:
+            ids.discard(int(index_id))
+            if not ids:
+                del self._category_ids[key]
+            self._category_selectors.pop(key, None)
+
+    def _category_scope(self, category: Optional[str]) -> Optional[Tuple[Set[int], Any]]:
+        """
+        (ids, faiss.IDSelectorBatch) for a category, or None to search everything.
+
+        Unknown or empty categories fall back to the whole corpus rather than
+        returning nothing. The id array is kept next to the selector because
+        FAISS does not copy it.
+        """
+        key = category_key(category)
+        ids = self._category_ids.get(key) if key else None
+        if not ids:
+            if key:
+                logger.debug(f"No FAQs in category '{category}', searching all categories")
+            return None
+
+        cached = self._category_selectors.get(key)
+        if cached is None:
+            id_array = np.fromiter(ids, dtype='int64', count=len(ids))
+            cached = (id_array, faiss.IDSelectorBatch(id_array))
+            self._category_selectors[key] = cached
+        return ids, cached[1]
+
+    def _project(self, embeddings: "np.ndarray") -> "np.ndarray":
+        """Map model embeddings into the space the index was built in"""
+        if self.vector_transform is None:
+            return embeddings
+        return self.vector_transform.apply(embeddings)
+
+    def _encode_queries(self, queries: List[str]) -> "np.ndarray":
+        """
+        Return unit-normalized float32 query vectors in index space, encoding
+        only cache misses. The cache holds model embeddings, so it stays valid
+        across indexes built with different projections.
+        """
+        return self._project(self._embed_queries(queries))
 
+    def _embed_queries(self, queries: List[str]) -> "np.ndarray":
+        """Unit-normalized model embeddings of the queries, through the embedding cache"""
+        keys = [normalize_query(q) for q in queries]
+        vectors = [self.embedding_cache.get(key) for key in keys]
+
+        # Encode each distinct missing query once
+        missing: Dict[str, str] = {}
+        for key, query, vector in zip(keys, queries, vectors):
+            if vector is None and key not in missing:
+                missing[key] = query
+
+        if missing:
+            embeddings = self.inference.encode(
+                self.model, list(missing.values()), batch_size=settings.EMBEDDING_BATCH_MAX_SIZE
+            )
+
+            encoded = {}
+            for key, embedding in zip(missing, embeddings):
+                embedding = embedding.copy()
+                embedding.setflags(write=False)
+                self.embedding_cache.put(key, embedding)
+                encoded[key] = embedding
+            vectors = [encoded[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+
+        return np.vstack(vectors)
+
+    def _search_batch_items(
+            self,
+            items: List[Tuple[str, int, float, Optional[str]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Micro-batcher callback for queued (query, top_k, min_score, category)
+        items: one encode for all of them and one index search per category.
+        """
+        query_normalized = self._encode_queries([item[0] for item in items])
+
+        by_category: Dict[Optional[str], List[int]] = {}
+        for position, item in enumerate(items):
+            by_category.setdefault(item[3], []).append(position)
+
+        batch_results: List[List[Dict[str, Any]]] = [[] for _ in items]
+        for category, positions in by_category.items():
+            top_k = max(items[p][1] for p in positions)
+            min_score = min(items[p][2] for p in positions)
+            group_results = self._search_vectors(
+                [items[p][0] for p in positions], query_normalized[positions], top_k, min_score, category
+            )
+            for p, results in zip(positions, group_results):
+                _, item_top_k, item_min_score, _ = items[p]
+                batch_results[p] = [r for r in results if r['similarity_score'] >= item_min_score][:item_top_k]
+        return batch_results
+
+    async def search_faqs_async(
+            self,
+            query: str,
+            top_k: int = 5,
+            min_score: float = DEFAULT_MIN_SCORE,
+            category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for relevant FAQs, sharing encode/search work with concurrent callers"""
+        if not self.is_initialized:
+            logger.warning("Semantic search not available, returning empty results")
+            return []
+
+        try:
+            return await self.batcher.submit((query, top_k, min_score, category))
         except Exception as e:
             logger.error(f"Error in semantic search: {e}")
             return []
@@ -104,14 +541,140 @@ class SemanticSearchService:
     def get_best_answer(
             self,
             query: str,
-            confidence_threshold: float = 0.7
+            confidence_threshold: float = 0.7,
+            category: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get the best answer for a query"""
+        """Get the best answer for a query, optionally within one category"""
         if not self.is_initialized:
             return self._fallback_response()
 
-        results = self.search_faqs(query, top_k=1)
+        cache_key = self.answer_cache.key(query, confidence_threshold, top_k=1, category=category_key(category))
+        cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        results = self.search_faqs(query, top_k=1, min_score=DEFAULT_MIN_SCORE, category=category)
+        answer = self._build_answer(query, results, confidence_threshold)
+        self.answer_cache.put(cache_key, answer)
+        return answer
 
+    async def get_best_answer_async(
+            self,
+            query: str,
+            confidence_threshold: float = 0.7,
+            category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the best answer for a query through the micro-batcher"""
+        if not self.is_initialized:
+            return self._fallback_response()
+
+        cache_key = self.answer_cache.key(query, confidence_threshold, top_k=1, category=category_key(category))
+        cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        results = await self.search_faqs_async(query, top_k=1, category=category)
+        answer = self._build_answer(query, results, confidence_threshold)
+        self.answer_cache.put(cache_key, answer)
+        return answer
+
+    def get_best_answers_batch(
+            self,
+            queries: List[str],
+            confidence_threshold: float = 0.7,
+            categories: Optional[List[Optional[str]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Best answer for each query, with one encode and one index search
+        per category for everything the answer cache does not hold.
+        """
+        if not self.is_initialized:
+            return [self._fallback_response() for _ in queries]
+
+        categories = categories or [None] * len(queries)
+        answers: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        keys = []
+        misses = []
+        for position, (query, category) in enumerate(zip(queries, categories)):
+            cache_key = self.answer_cache.key(query, confidence_threshold, top_k=1, category=category_key(category))
+            keys.append(cache_key)
+            cached = self.answer_cache.get(cache_key)
+            if cached is not None:
+                answers[position] = cached
+            else:
+                misses.append(position)
+
+        if misses:
+            results = self._search_batch_items([(queries[p], 1, DEFAULT_MIN_SCORE, categories[p]) for p in misses])
+            for position, result in zip(misses, results):
+                answer = self._build_answer(queries[position], result, confidence_threshold)
+                self.answer_cache.put(keys[position], answer)
+                answers[position] = answer
+        return answers
+
+    async def get_best_answers_batch_async(
+            self,
+            queries: List[str],
+            confidence_threshold: float = 0.7,
+            categories: Optional[List[Optional[str]]] = None
+    ) -> List[Dict[str, Any]]:
+        """``get_best_answers_batch`` on the inference executor"""
+        if not self.is_initialized:
+            return [self._fallback_response() for _ in queries]
+        return await self.inference.run(self.get_best_answers_batch, queries, confidence_threshold, categories)
+
+    def get_generated_answer(self, query: str, category: Optional[str] = None) -> Optional[str]:
+        """A previously generated answer to a near-duplicate question, if any"""
+        if not self.is_initialized or not self.generated_answers.enabled:
+            return None
+
+        # The search for this query has just put its embedding in the embedding cache
+        hit = self.generated_answers.get(self._embed_queries([query])[0], category)
+        return hit[0] if hit else None
+
+    def store_generated_answer(
+            self,
+            query: str,
+            answer: str,
+            category: Optional[str] = None,
+            source_categories: Optional[List[Optional[str]]] = None,
+            generation_seconds: float = 0.0
+    ):
+        """Remember a generated answer for questions similar to ``query``"""
+        if not self.is_initialized or not self.generated_answers.enabled:
+            return
+
+        self.generated_answers.put(
+            self._embed_queries([query])[0], answer, category,
+            source_categories=source_categories or (), generation_seconds=generation_seconds
+        )
+
+    async def get_generated_answer_async(self, query: str, category: Optional[str] = None) -> Optional[str]:
+        """``get_generated_answer`` on the inference executor; cache errors count as misses"""
+        if not self.is_initialized or not self.generated_answers.enabled:
+            return None
+        try:
+            return await self.inference.run(self.get_generated_answer, query, category)
+        except Exception as e:
+            logger.error(f"Error in generated answer lookup: {e}")
+            return None
+
+    async def store_generated_answer_async(self, query: str, answer: str, **kwargs):
+        """``store_generated_answer`` on the inference executor"""
+        if not self.is_initialized or not self.generated_answers.enabled:
+            return
+        try:
+            await self.inference.run(self.store_generated_answer, query, answer, **kwargs)
+        except Exception as e:
+            logger.error(f"Error caching generated answer: {e}")
+
+    def _build_answer(
+            self,
+            query: str,
+            results: List[Dict[str, Any]],
+            confidence_threshold: float
+    ) -> Dict[str, Any]:
+        """Turn ranked search results into an answer payload"""
         if results and results[0]['similarity_score'] >= confidence_threshold:
             return {
                 'answer': results[0]['answer'],
@@ -150,12 +713,330 @@ class SemanticSearchService:
         """Check if semantic search is available"""
         return self.is_initialized
 
+    def upsert_faq(self, faq: Any) -> bool:
+        """Embed a single FAQ and add or replace it in the live index"""
+        if not self.is_initialized or not self._accepts_database_writes():
+            return False
+
+        record = faq_record(faq)
+        is_active = faq.get('is_active', True) if isinstance(faq, dict) else getattr(faq, 'is_active', True)
+        if not is_active:
+            return self.remove_faq(record['id'])
+
+        embedding = self._project(self.inference.encode(self.model, [faq_text(record)]))
+        ids = np.array([faq_index_id(record['id'])], dtype='int64')
+
+        with self._index_lock:
+            self._own_index()
+            self._remove_vectors(ids)
+            self.index.add_with_ids(embedding, ids)
+            previous = self.metadata.get(ids[0])
+            self._untrack_category(ids[0], previous)
+            self.metadata.upsert(record)
+            self._track_category(ids[0], record)
+            if self.lexical is not None:
+                self.lexical.add(ids[0], record)
+            self._dirty = True
+
+        self.bump_corpus_version()
+        self.generated_answers.invalidate_categories([record.get('category'), (previous or {}).get('category')])
+        logger.info(f"Indexed FAQ {record['id']} ({self.index.ntotal} vectors)")
+        return True
+
+    def remove_faq(self, faq_id: str) -> bool:
+        """Drop a FAQ from the live index"""
+        if not self.is_initialized or not self._accepts_database_writes():
+            return False
+
+        index_id = faq_index_id(faq_id)
+        with self._index_lock:
+            self._own_index()
+            removed = self._remove_vectors(np.array([index_id], dtype='int64'))
+            previous = self.metadata.remove(index_id)
+            had_metadata = previous is not None
+            self._untrack_category(index_id, previous)
+            if self.lexical is not None:
+                self.lexical.remove(index_id)
+            self._dirty = True
+
+        self.bump_corpus_version()
+        if previous is not None:
+            self.generated_answers.invalidate_categories([previous.get('category')])
+        logger.info(f"Removed FAQ {faq_id} from index ({removed} vectors)")
+        return removed > 0 or had_metadata
+
+    def _accepts_database_writes(self) -> bool:
+        """
+        In-place writes carry database ids. Applied to an index keyed by
+        other ids, an update would add a second vector next to the old one
+        and a delete would miss it, so they are refused until the index is
+        rebuilt from the database.
+        """
+        if not self.keyed_by_database_ids:
+            logger.warning(
+                "FAQ index was not built from the database, so its FAQ ids are not database ids; "
+                "rebuild it with scripts/build_faq_index.py to apply FAQ edits to search"
+            )
+        return self.keyed_by_database_ids
+
+    def _remove_vectors(self, ids: "np.ndarray") -> int:
+        """Remove vectors by id; for index types without removal, stale vectors stay until the next rebuild"""
+        if supports_removal(self.index):
+            return self.index.remove_ids(ids)
+        # Results whose metadata is gone are skipped, and duplicates of a re-added id are collapsed
+        return 0
+
+    def snapshot(self, force: bool = False) -> bool:
+        """Atomically write the live index, metadata and embeddings back to disk"""
+        if not self.is_initialized or not (self._dirty or force):
+            return False
+
+        with self._index_lock:
+            index_copy = owned_copy(self.index)
+            records = list(self.metadata.records())
+            self._dirty = False
+
+        embeddings = None
+        # Projected or quantized vectors are not model embeddings; the .npy is then left as is
+        if self.vector_transform is None and self.vector_codec == 'float32':
+            try:
+                ids = [faq_index_id(r['id']) for r in records]
+                embeddings = np.vstack([index_copy.reconstruct(i) for i in ids]) if ids else None
+            except RuntimeError:
+                # Not every index type can hand vectors back
+                embeddings = None
+
+        with atomic_write(self.paths.index_path) as tmp_path:
+            faiss.write_index(index_copy, str(tmp_path))
+        write_json_atomic(self.paths.metadata_path, records)
+        with atomic_write(self.paths.compact_metadata_path) as tmp_path:
+            write_compact_metadata(tmp_path, records)
+        if embeddings is not None:
+            with atomic_write(self.paths.embeddings_path) as tmp_path:
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, embeddings.astype('float32'))
+
+        config = read_config(self.paths)
+        config['num_faqs'] = len(records)
+        write_json_atomic(self.paths.config_path, config)
+
+        logger.info(f"Snapshot written with {len(records)} FAQs to {self.data_dir}")
+        return True
+
+    def close(self):
+        """Release the inference threads/processes"""
+        if self.inference is not None:
+            self.inference.shutdown()
+
+    def bump_corpus_version(self) -> int:
+        """Invalidate cached answers after the FAQ corpus changed"""
+        version = self.answer_cache.bump_version()
+        logger.info(f"FAQ corpus version bumped to {version}")
+        return version
+
+    def _encoder_stats(self) -> Optional[Dict[str, Any]]:
+        """Truncation length and padding waste of the in-process encoder"""
+        if not self.is_initialized:
+            return None
+        stats = {'backend': settings.ENCODER_BACKEND}
+        # In process mode only the workers hold encoders, and their counters are not visible here
+        padding_stats = getattr(self.model, 'padding_stats', None)
+        if padding_stats is not None:
+            stats.update(padding_stats())
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Runtime metrics for tuning the search path"""
+        return {
+            'available': self.is_initialized,
+            'generation': self.generation,
+            'warm': self.is_warm,
+            'inference': {
+                'mode': self.inference.mode,
+                'workers': self.inference.workers,
+                'threads_per_worker': self.inference.num_threads
+            } if self.inference else None,
+            'encoder': self._encoder_stats(),
+            'load_timings': dict(self.load_timings),
+            'index': {
+                'type': index_type_of(self.index),
+                'vector_codec': self.vector_codec,
+                'dimension': self.index.d,
+                'keyed_by_database_ids': self.keyed_by_database_ids,
+                'vector_transform': self.vector_transform.describe() if self.vector_transform else None
+            } if self.index is not None else None,
+            'batching': {
+                'max_batch_size': self.batcher.max_batch_size,
+                'max_wait_ms': self.batcher.max_wait_ms,
+                **self.batcher.metrics.snapshot()
+            },
+            'embedding_cache': {
+                'model_fingerprint': self.model_fingerprint,
+                **self.embedding_cache.stats()
+            },
+            'answer_cache': self.answer_cache.stats(),
+            'generated_answer_cache': self.generated_answers.stats() if self.generated_answers else None,
+            'categories': {key: len(ids) for key, ids in self._category_ids.items()}
+        }
+
+_snapshot_lock_file = None
+_snapshot_owner: Optional[bool] = None
+_snapshot_owner_lock = threading.Lock()
+
+def owns_snapshots() -> bool:
+    """
+    Whether this process writes index snapshots. Every uvicorn worker keeps
+    its own in-memory index, and workers writing the same files would undo
+    each other's updates, so only the worker holding an exclusive lock on
+    AI_DATA_DIR/.snapshot.lock writes them. In-place updates applied by the
+    other workers live in the database and reach disk with the next index
+    build. Without flock (Windows) every process assumes it is the only one.
+    """
+    global _snapshot_lock_file, _snapshot_owner
+    with _snapshot_owner_lock:
+        if _snapshot_owner is not None:
+            return _snapshot_owner
+        try:
+            import fcntl
+        except ImportError:
+            _snapshot_owner = True
+            return True
+
+        lock_path = Path(settings.AI_DATA_DIR) / ".snapshot.lock"
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            _snapshot_owner = False
+            logger.info(f"Worker {os.getpid()} leaves index snapshots to the worker holding {lock_path}")
+        else:
+            # Held for the life of the process
+            _snapshot_lock_file = lock_file
+            _snapshot_owner = True
+        return _snapshot_owner
+
+async def run_snapshot_loop(interval_seconds: float):
+    """Periodically persist in-place index updates of the current search service, off the event loop"""
+    if not owns_snapshots():
+        return
+    while True:
+        await asyncio.sleep(interval_seconds)
+        service = get_loaded_search_service()
+        if service is None:
+            continue
+        try:
+            # Clones the index and writes several files; requests keep being served meanwhile
+            await asyncio.to_thread(service.snapshot)
+        except Exception as e:
+            logger.error(f"Failed to snapshot FAISS index: {e}")
+
+def _encoder_fingerprint(model_path: Path) -> str:
+    """
+    Model fingerprint qualified by backend and truncation length; backends
+    produce slightly different vectors, and long texts change with the length
+    """
+    backend = settings.ENCODER_BACKEND
+    if backend == "onnx" and settings.ENCODER_ONNX_QUANTIZED:
+        backend = "onnx-int8"
+    return f"{backend}:{resolve_max_seq_length(model_path)}:{_model_fingerprint(model_path)}"
+
+def _model_fingerprint(model_path: Path) -> str:
+    """Cheap content fingerprint of a model directory (file names, sizes and mtimes)"""
+    digest = hashlib.sha1()
+    for path in sorted(p for p in model_path.rglob("*") if p.is_file()):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(model_path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
 # Global instance with lazy loading
 _search_service = None
+# Startup warmup runs in a worker thread; keep a concurrent request from loading a second copy
+_search_service_lock = threading.Lock()
+# Serializes hot reloads
+_reload_lock = threading.Lock()
+
+def _create_search_service(
+        generation: Optional[str] = None,
+        embedding_cache: Optional[EmbeddingCache] = None
+) -> SemanticSearchService:
+    generation, artifact_dir = resolve_artifact_dir(settings.AI_DATA_DIR, generation)
+    return SemanticSearchService(str(artifact_dir), embedding_cache=embedding_cache, generation=generation)
 
 def get_search_service() -> SemanticSearchService:
     """Get singleton search service instance"""
     global _search_service
     if _search_service is None:
-        _search_service = SemanticSearchService()
+        with _search_service_lock:
+            if _search_service is None:
+                _search_service = _create_search_service()
+    return _search_service
+
+def reload_search_service(generation: Optional[str] = None) -> SemanticSearchService:
+    """
+    Load an artifact generation (default: the one named by CURRENT) next to
+    the live service, warm it, and swap it in atomically. Blocking.
+
+    Requests that already hold the old service finish on it; its executor
+    is shut down after SEARCH_RELOAD_DRAIN_SECONDS and the rest is freed
+    with the last reference. If the new generation fails to load, the old
+    service stays live and RuntimeError is raised.
+    """
+    global _search_service
+    with _reload_lock:
+        old = get_loaded_search_service()
+        target, artifact_dir = resolve_artifact_dir(settings.AI_DATA_DIR, generation)
+
+        # Cached query embeddings stay valid as long as the encoder is the same
+        embedding_cache = None
+        if old is not None and old.model_fingerprint == _encoder_fingerprint(ArtifactPaths(artifact_dir).model_dir):
+            embedding_cache = old.embedding_cache
+
+        started = time.perf_counter()
+        new = SemanticSearchService(str(artifact_dir), embedding_cache=embedding_cache, generation=target)
+        if AI_AVAILABLE and not new.is_initialized:
+            new.close()
+            raise RuntimeError(f"Could not load artifact generation '{target}'; keeping the current one")
+        new.warmup()
+
+        with _search_service_lock:
+            _search_service = new
+        logger.info(
+            f"🔄 Swapped search service to generation '{target}' in {time.perf_counter() - started:.2f}s"
+        )
+
+        if old is not None:
+            _retire_search_service(old)
+        return new
+
+def _retire_search_service(service: SemanticSearchService):
+    """Persist and release a replaced service once in-flight requests had time to finish"""
+    if service._dirty and owns_snapshots():
+        logger.warning(
+            f"Generation '{service.generation}' had in-place FAQ updates that the new generation may not contain"
+        )
+        try:
+            service.snapshot()
+        except Exception as e:
+            logger.error(f"Failed to snapshot retired search service: {e}")
+
+    timer = threading.Timer(settings.SEARCH_RELOAD_DRAIN_SECONDS, service.close)
+    timer.daemon = True
+    timer.start()
+
+def warm_search_service() -> SemanticSearchService:
+    """Load the singleton (if needed) and warm it up; blocking, run it off the event loop"""
+    service = get_search_service()
+    if not service.is_warm:
+        try:
+            service.warmup()
+        except Exception as e:
+            # A failed warmup only costs latency; still let traffic in
+            logger.error(f"❌ Semantic search warmup failed: {e}")
+            service.is_warm = True
+    return service
+
+def get_loaded_search_service() -> Optional[SemanticSearchService]:
+    """Return the singleton only if it has already been created"""
     return _search_service
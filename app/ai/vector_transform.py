@@ -0,0 +1,93 @@
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.ai.artifacts import ArtifactPaths
+
+logger = logging.getLogger(__name__)
+
+# Rows sampled from the corpus embeddings to fit the projection
+PCA_TRAINING_ROWS = 50000
+
+
+class PCATransform:
+    """
+    Linear projection of unit embeddings onto their top principal directions.
+
+    The directions are the leading eigenvectors of the uncentered second
+    moment matrix, so inner products between projected vectors approximate
+    the original cosine similarities. Projected vectors are re-normalized,
+    which keeps scores on the same scale as the unreduced index and lets
+    the confidence thresholds stay as they are.
+    """
+
+    def __init__(self, components: np.ndarray):
+        self.components = np.ascontiguousarray(components, dtype='float32')
+        self.explained_variance: Optional[float] = None
+
+    @property
+    def input_dimension(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def output_dimension(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, sample: np.ndarray, output_dimension: int) -> "PCATransform":
+        sample = np.asarray(sample, dtype='float64')
+        moment = sample.T @ sample / len(sample)
+        eigenvalues, eigenvectors = np.linalg.eigh(moment)
+        order = np.argsort(eigenvalues)[::-1][:output_dimension]
+
+        transform = cls(eigenvectors[:, order].T)
+        total = float(eigenvalues.sum())
+        transform.explained_variance = float(eigenvalues[order].sum() / total) if total > 0 else 0.0
+        return transform
+
+    @classmethod
+    def load(cls, path) -> "PCATransform":
+        return cls(np.load(path))
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            np.save(f, self.components)
+
+    def apply(self, vectors: np.ndarray) -> np.ndarray:
+        """Project float32 rows and re-normalize them to unit length"""
+        projected = np.asarray(vectors, dtype='float32') @ self.components.T
+        projected /= np.maximum(np.linalg.norm(projected, axis=1, keepdims=True), 1e-12)
+        return np.ascontiguousarray(projected)
+
+    def describe(self) -> Dict[str, Any]:
+        """Entry for config.json"""
+        description = {
+            'type': 'pca',
+            'input_dimension': self.input_dimension,
+            'output_dimension': self.output_dimension,
+            'file': 'models/vector_transform.npy',
+        }
+        if self.explained_variance is not None:
+            description['explained_variance'] = round(self.explained_variance, 4)
+        return description
+
+
+def load_vector_transform(paths: ArtifactPaths, config: Dict[str, Any]) -> Optional[PCATransform]:
+    """The query transform recorded in config.json, or None if the index holds raw embeddings"""
+    spec = config.get('vector_transform')
+    if not spec:
+        return None
+    if spec.get('type') != 'pca':
+        raise ValueError(f"Unsupported vector transform '{spec.get('type')}' in {paths.config_path}")
+    if not paths.vector_transform_path.exists():
+        raise FileNotFoundError(f"Vector transform not found at {paths.vector_transform_path}")
+
+    transform = PCATransform.load(paths.vector_transform_path)
+    if (transform.input_dimension, transform.output_dimension) != (spec['input_dimension'], spec['output_dimension']):
+        raise ValueError(
+            f"Vector transform is {transform.input_dimension}->{transform.output_dimension} but config.json "
+            f"says {spec['input_dimension']}->{spec['output_dimension']}"
+        )
+    logger.info(f"Loaded PCA transform {transform.input_dimension}->{transform.output_dimension}")
+    return transform
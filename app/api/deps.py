@@ -1,19 +1,22 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from datetime import datetime
+from typing import Any, Dict, Generator, List, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.security import get_current_user, get_current_active_admin, oauth2_scheme
-from app.db.session import get_db
+from app.db.session import DBSession, get_request_db, run_db
 from app.db.models.user import User
 
-def get_current_user_dependency(
-        db: Session = Depends(get_db),
+# AsyncSession with DB_ASYNC, otherwise a Session; CRUD calls go through run_db either way
+get_db = get_request_db()
+
+async def get_current_user_dependency(
+        db: DBSession = Depends(get_db),
         token: str = Depends(oauth2_scheme)
 ) -> User:
     """Dependency to get current authenticated user."""
-    return get_current_user(db=db, token=token)
+    return await run_db(db, get_current_user, token=token)
 
 def get_current_admin_user(
         current_user: User = Depends(get_current_user_dependency)
@@ -21,14 +24,38 @@ def get_current_admin_user(
     """Dependency to get current admin user."""
     return get_current_active_admin(current_user)
 
-def get_optional_current_user(
-        db: Session = Depends(get_db),
+async def get_optional_current_user(
+        db: DBSession = Depends(get_db),
         token: Optional[str] = Depends(oauth2_scheme)
 ) -> Optional[User]:
     """Dependency to optionally get current user (for public endpoints)."""
     if token is None:
         return None
     try:
-        return get_current_user(db=db, token=token)
+        return await run_db(db, get_current_user, token=token)
     except HTTPException:
         return None
+
+def _enum_member(enum, value: str, name: str):
+    member = getattr(enum, value.strip().upper(), None)
+    if member is None:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}")
+    return member
+
+def get_ticket_filters(
+        status: Optional[List[str]] = Query(
+            None, description="Ticket status; repeat the parameter or separate with commas for several"
+        ),
+        priority: Optional[str] = Query(None),
+        created_after: Optional[datetime] = Query(None, description="Only tickets created at or after this time"),
+        created_before: Optional[datetime] = Query(None, description="Only tickets created before this time")
+) -> Dict[str, Any]:
+    """Dependency with the ticket listing filters, as keyword arguments of CRUDTicket.get_filtered."""
+    from app.db.models.ticket import TicketPriority, TicketStatus
+    names = [name for value in status or [] for name in value.split(",") if name.strip()]
+    return {
+        "statuses": [_enum_member(TicketStatus, name, "status") for name in names] or None,
+        "priority": _enum_member(TicketPriority, priority, "priority") if priority else None,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
@@ -1,82 +1,133 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_db, get_current_admin_user
-from app.crud.user import user as user_crud
-from app.crud.ticket import ticket as ticket_crud
-from app.crud.faq import faq as faq_crud
+from app.api.deps import get_db, get_current_admin_user, get_ticket_filters
+from app.crud.user import async_user as user_crud
+from app.crud.ticket import async_ticket as ticket_crud
+from app.crud.faq import async_faq as faq_crud
+from app.db.session import DBSession, database_stats
 from app.schemas.user import User
-from app.schemas.ticket import Ticket, TicketUpdate
+from app.schemas.ticket import Ticket, TicketSearchHit, TicketUpdate
 from app.schemas.faq import FAQ, FAQCreate, FAQUpdate
+from app.schemas.pagination import Page
 from app.db.models.user import User as UserModel
 from app.core.exceptions import NotFoundError
+from app.ai.semantic_search_service import get_search_service, reload_search_service
+from app.services.llm_service import get_llm_client
 
 router = APIRouter()
 
-@router.get("/users", response_model=List[User])
+def _index_faq(faq):
+    """Apply a FAQ write to the live index; for the threadpool, since the first call loads the service"""
+    get_search_service().upsert_faq(faq)
+
+def _unindex_faq(faq_id: str):
+    get_search_service().remove_faq(faq_id)
+
+@router.get("/users", response_model=Union[List[User], Page[User]])
 async def get_all_users(
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(
+            None, description="Cursor pagination: empty for the first page, then the previous next_cursor"
+        ),
         current_admin: UserModel = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Get all users (admin only).
+
+    - **cursor**: returns ``{"items", "next_cursor"}`` pages instead of a list;
+      unlike **skip**, deep pages are as fast as the first one
     """
-    users = user_crud.get_multi(db, skip=skip, limit=limit)
+    if cursor is not None:
+        users, next_cursor = await user_crud.get_page(db, cursor=cursor, limit=limit)
+        return Page(items=users, next_cursor=next_cursor)
+
+    users = await user_crud.get_multi(db, skip=skip, limit=limit)
     return users
 
-@router.get("/tickets", response_model=List[Ticket])
+@router.get("/tickets", response_model=Union[List[Ticket], Page[Ticket]])
 async def get_all_tickets(
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
-        status: Optional[str] = Query(None),
+        user_id: Optional[str] = Query(None),
+        cursor: Optional[str] = Query(
+            None, description="Cursor pagination: empty for the first page, then the previous next_cursor"
+        ),
+        filters: Dict[str, Any] = Depends(get_ticket_filters),
         current_admin: UserModel = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
-    Get all tickets with optional status filtering (admin only).
+    Get all tickets with optional filtering (admin only), newest first.
+
+    - **status**: one or more statuses
+    - **user_id**, **priority**, **created_after**, **created_before**: further filters
+    - **cursor**: returns ``{"items", "next_cursor"}`` pages instead of a list;
+      unlike **skip**, deep pages are as fast as the first one
+    """
+    if cursor is not None:
+        tickets, next_cursor = await ticket_crud.get_filtered_page(
+            db, user_id=user_id, cursor=cursor, limit=limit, **filters
+        )
+        return Page(items=tickets, next_cursor=next_cursor)
+
+    return await ticket_crud.get_filtered(db, user_id=user_id, skip=skip, limit=limit, **filters)
+
+@router.get("/tickets/search", response_model=List[TicketSearchHit])
+async def search_tickets(
+        q: str = Query(..., min_length=1, description="Words to find in subject, question or answer"),
+        user_id: Optional[str] = Query(None),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(20, ge=1, le=100),
+        current_admin: UserModel = Depends(get_current_admin_user),
+        db: DBSession = Depends(get_db)
+):
     """
-    if status:
-        from app.db.models.ticket import TicketStatus
-        if hasattr(TicketStatus, status.upper()):
-            ticket_status = getattr(TicketStatus, status.upper())
-            tickets = ticket_crud.get_by_status(db, status=ticket_status, skip=skip, limit=limit)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid status")
-    else:
-        tickets = ticket_crud.get_multi(db, skip=skip, limit=limit)
+    Full-text search over all tickets (admin only), best match first.
+
+    - **q**: every word must match; end a word with * to match it as a prefix
+    - **user_id**: only this user's tickets
 
-    return tickets
+    With FULLTEXT_MAX_CANDIDATES set, only that many of the newest matching
+    tickets are ranked, so older tickets may not be found for common words.
+    """
+    hits = await ticket_crud.search_hits(db, query=q, user_id=user_id, skip=skip, limit=limit)
+    return [
+        TicketSearchHit.model_validate(hit.obj).model_copy(update={"score": hit.score, "snippet": hit.snippet})
+        for hit in hits
+    ]
 
 @router.put("/tickets/{ticket_id}", response_model=Ticket)
 async def admin_update_ticket(
         ticket_id: str,
         ticket_update: TicketUpdate,
         current_admin: UserModel = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Update any ticket (admin only).
     """
-    ticket = ticket_crud.get(db, id=ticket_id)
+    ticket = await ticket_crud.get(db, id=ticket_id)
     if not ticket:
         raise NotFoundError("Ticket not found")
 
-    updated_ticket = ticket_crud.update(db, db_obj=ticket, obj_in=ticket_update)
+    updated_ticket = await ticket_crud.update(db, db_obj=ticket, obj_in=ticket_update)
     return updated_ticket
 
 @router.post("/faqs", response_model=FAQ, status_code=status.HTTP_201_CREATED)
 async def admin_create_faq(
         faq_data: FAQCreate,
         current_admin: UserModel = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Create a new FAQ (admin only).
     """
-    faq = faq_crud.create(db, obj_in=faq_data)
+    faq = await faq_crud.create(db, obj_in=faq_data)
+    await run_in_threadpool(_index_faq, faq)
     return faq
 
 @router.put("/faqs/{faq_id}", response_model=FAQ)
@@ -84,47 +135,84 @@ async def admin_update_faq(
         faq_id: str,
         faq_update: FAQUpdate,
         current_admin: UserModel = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Update FAQ (admin only).
     """
-    faq = faq_crud.get(db, id=faq_id)
+    faq = await faq_crud.get(db, id=faq_id)
     if not faq:
         raise NotFoundError("FAQ not found")
 
-    updated_faq = faq_crud.update(db, db_obj=faq, obj_in=faq_update)
+    updated_faq = await faq_crud.update(db, db_obj=faq, obj_in=faq_update)
+    await run_in_threadpool(_index_faq, updated_faq)
     return updated_faq
 
 @router.delete("/faqs/{faq_id}")
 async def admin_delete_faq(
         faq_id: str,
         current_admin: UserModel = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Delete FAQ (admin only).
     """
-    faq = faq_crud.get(db, id=faq_id)
+    faq = await faq_crud.get(db, id=faq_id)
     if not faq:
         raise NotFoundError("FAQ not found")
 
-    faq_crud.remove(db, id=faq_id)
+    await faq_crud.remove(db, id=faq_id)
+    await run_in_threadpool(_unindex_faq, faq_id)
     return {"message": "FAQ deleted successfully"}
 
 @router.get("/analytics")
 async def get_analytics(
         current_admin: UserModel = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Get system analytics (admin only).
     """
     stats = {
-        "total_users": user_crud.count(db),
-        "total_tickets": ticket_crud.count(db),
-        "total_faqs": faq_crud.count(db),
-        "ticket_stats": ticket_crud.count_by_status(db),
-        "active_users": len([u for u in user_crud.get_multi(db, limit=1000) if u.is_active])
+        "total_users": await user_crud.count(db),
+        "total_tickets": await ticket_crud.count(db),
+        "total_faqs": await faq_crud.count(db),
+        "ticket_stats": await ticket_crud.count_by_status(db),
+        "active_users": len([u for u in await user_crud.get_multi(db, limit=1000) if u.is_active])
     }
     return stats
+
+@router.get("/metrics")
+async def get_metrics(
+        current_admin: UserModel = Depends(get_current_admin_user)
+):
+    """
+    Get runtime performance metrics (admin only).
+    """
+    llm_client = get_llm_client()
+    return {
+        "semantic_search": get_search_service().stats(),
+        "llm": llm_client.stats() if llm_client else None,
+        "database": database_stats()
+    }
+
+@router.post("/search/reload")
+async def reload_search(
+        generation: Optional[str] = Query(None, description="Artifact generation to load (default: CURRENT)"),
+        current_admin: UserModel = Depends(get_current_admin_user)
+):
+    """
+    Load, warm and swap in a new search artifact generation without a restart (admin only).
+    """
+    try:
+        search_service = await run_in_threadpool(reload_search_service, generation)
+    except FileNotFoundError as e:
+        raise NotFoundError(str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return {
+        "generation": search_service.generation,
+        "available": search_service.is_available(),
+        "load_timings": search_service.load_timings
+    }
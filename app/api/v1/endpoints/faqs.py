@@ -1,21 +1,32 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.ai.semantic_search_service import get_search_service
 from app.api.deps import get_db, get_optional_current_user
-from app.crud.faq import faq as faq_crud
+from app.crud.faq import async_faq as faq_crud
+from app.db.session import DBSession
 from app.schemas.faq import FAQ, FAQCreate, FAQUpdate
+from app.schemas.pagination import Page
 from app.db.models.user import User
+from app.core.exceptions import ValidationError
 
 router = APIRouter()
 
-@router.get("/", response_model=List[FAQ])
+def _search_lexical(query: str, top_k: int):
+    """BM25 lookup for the threadpool; the first get_search_service() call loads the service"""
+    return get_search_service().search_lexical(query, top_k=top_k)
+
+@router.get("/", response_model=Union[List[FAQ], Page[FAQ]])
 async def get_faqs(
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
         category: Optional[str] = Query(None),
         search: Optional[str] = Query(None),
-        db: Session = Depends(get_db),
+        cursor: Optional[str] = Query(
+            None, description="Cursor pagination: empty for the first page, then the previous next_cursor"
+        ),
+        db: DBSession = Depends(get_db),
         current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """
@@ -23,36 +34,59 @@ async def get_faqs(
 
     - **category**: Filter by category
     - **search**: Search in questions, answers, and keywords
+    - **cursor**: returns ``{"items", "next_cursor"}`` pages, most helpful first, instead of a
+      list; not available with **search**, whose results are ranked by relevance
     """
-    if search:
-        faqs = faq_crud.search(db, query=search, skip=skip, limit=limit)
+    next_cursor = None
+    if cursor is not None:
+        if search:
+            raise ValidationError("Cursor pagination is not available for search results")
+        if category:
+            faqs, next_cursor = await faq_crud.get_by_category_page(db, category=category, cursor=cursor, limit=limit)
+        else:
+            faqs, next_cursor = await faq_crud.get_active_page(db, cursor=cursor, limit=limit)
+    elif search:
+        # Ranked BM25 lookup instead of three unranked ILIKE scans; off the event loop, since it
+        # shares the index lock with upserts and snapshots, and may have to load the service first
+        hits = await run_in_threadpool(_search_lexical, search, skip + limit)
+        # Resolve the whole ranking, not just this page, so every page of a query takes the same branch
+        ranked = await faq_crud.get_active_by_ids(db, ids=[hit['id'] for hit in hits]) if hits else []
+        if ranked:
+            faqs = ranked[skip:]
+        else:
+            # No index yet, nothing BM25 matches (word prefixes), or an index whose ids are not the
+            # database's (artifacts built from a JSON export): the database's full-text index
+            # (app.db.fulltext)
+            faqs = await faq_crud.search(db, query=search, skip=skip, limit=limit)
     elif category:
-        faqs = faq_crud.get_by_category(db, category=category, skip=skip, limit=limit)
+        faqs = await faq_crud.get_by_category(db, category=category, skip=skip, limit=limit)
     else:
-        faqs = faq_crud.get_active(db, skip=skip, limit=limit)
+        faqs = await faq_crud.get_active(db, skip=skip, limit=limit)
 
     # Increment view counts if user is authenticated
     if current_user:
         for faq in faqs:
-            faq_crud.increment_view_count(db, faq_id=faq.id)
+            await faq_crud.increment_view_count(db, faq_id=faq.id)
 
+    if cursor is not None:
+        return Page(items=faqs, next_cursor=next_cursor)
     return faqs
 
 @router.get("/{faq_id}", response_model=FAQ)
 async def get_faq(
         faq_id: str,
-        db: Session = Depends(get_db),
+        db: DBSession = Depends(get_db),
         current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """
     Get a specific FAQ by ID.
     """
-    faq = faq_crud.get(db, id=faq_id)
+    faq = await faq_crud.get(db, id=faq_id)
     if not faq or not faq.is_active:
         raise HTTPException(status_code=404, detail="FAQ not found")
 
     # Increment view count if user is authenticated
     if current_user:
-        faq_crud.increment_view_count(db, faq_id=faq.id)
+        await faq_crud.increment_view_count(db, faq_id=faq.id)
 
     return faq
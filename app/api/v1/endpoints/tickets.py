@@ -1,14 +1,17 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
+import json
+from typing import Any, Dict, List, Optional, Union
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_db, get_current_user_dependency
+from app.api.deps import get_db, get_current_user_dependency, get_ticket_filters
 from app.services.ticket_service import TicketService
-from app.crud.ticket import ticket as ticket_crud
-from app.schemas.ask import AskQuestion, AskResponse
+from app.crud.ticket import async_ticket as ticket_crud
+from app.schemas.pagination import Page
+from app.schemas.ask import AskBatchRequest, AskBatchResponse, AskQuestion, AskResponse
 from app.schemas.ticket import Ticket, TicketUpdate
 from app.db.models.user import User
 from app.core.exceptions import NotFoundError
+from app.db.session import DBSession, open_db
 
 router = APIRouter()
 
@@ -16,7 +19,7 @@ router = APIRouter()
 async def ask_question(
         question: AskQuestion,
         current_user: User = Depends(get_current_user_dependency),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Submit a question and get an automated response or create a support ticket.
@@ -27,43 +30,87 @@ async def ask_question(
     - **priority**: Priority level (optional)
     """
     ticket_service = TicketService(db)
-    return ticket_service.process_question(current_user.id, question)
+    return await ticket_service.process_question(current_user.id, question)
 
-@router.get("/", response_model=List[Ticket])
+@router.post("/ask/stream")
+async def ask_question_stream(
+        question: AskQuestion,
+        current_user: User = Depends(get_current_user_dependency)
+):
+    """
+    Streaming variant of **POST /ask** (server-sent events).
+
+    - **decision**: FAQ-match decision, sent as soon as the semantic search is done
+    - **token**: generated answer text, for low-confidence questions when LLM generation is enabled
+    - **done**: the same body as **POST /ask**, once the ticket is committed
+    """
+    user_id = current_user.id
+
+    async def events():
+        # Request-scoped sessions are closed before a streamed body runs, so use a dedicated one
+        async with open_db() as db:
+            async for event, data in TicketService(db).stream_question(user_id, question):
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/ask/batch", response_model=AskBatchResponse, status_code=status.HTTP_201_CREATED)
+async def ask_questions_batch(
+        batch: AskBatchRequest,
+        current_user: User = Depends(get_current_user_dependency),
+        db: DBSession = Depends(get_db)
+):
+    """
+    Submit many questions at once (e.g. a helpdesk import).
+
+    Questions are encoded and searched together and their tickets are
+    created in one transaction. Results are returned in request order with
+    the same fields as **POST /ask**.
+    """
+    ticket_service = TicketService(db)
+    return AskBatchResponse(results=await ticket_service.process_questions(current_user.id, batch.items))
+
+@router.get("/", response_model=Union[List[Ticket], Page[Ticket]])
 async def get_user_tickets(
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
-        status: Optional[str] = Query(None),
+        cursor: Optional[str] = Query(
+            None, description="Cursor pagination: empty for the first page, then the previous next_cursor"
+        ),
+        filters: Dict[str, Any] = Depends(get_ticket_filters),
         current_user: User = Depends(get_current_user_dependency),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
-    Get current user's tickets with optional filtering.
+    Get current user's tickets with optional filtering, newest first.
+
+    - **status**: one or more statuses
+    - **priority**, **created_after**, **created_before**: further filters
+    - **cursor**: returns ``{"items", "next_cursor"}`` pages instead of a list;
+      unlike **skip**, deep pages are as fast as the first one
     """
-    if status:
-        from app.db.models.ticket import TicketStatus
-        if hasattr(TicketStatus, status.upper()):
-            ticket_status = getattr(TicketStatus, status.upper())
-            tickets = ticket_crud.get_by_status(db, status=ticket_status, skip=skip, limit=limit)
-            # Filter by user
-            tickets = [t for t in tickets if t.user_id == current_user.id]
-        else:
-            raise HTTPException(status_code=400, detail="Invalid status")
-    else:
-        tickets = ticket_crud.get_by_user(db, user_id=current_user.id, skip=skip, limit=limit)
-
-    return tickets
+    if cursor is not None:
+        tickets, next_cursor = await ticket_crud.get_filtered_page(
+            db, user_id=current_user.id, cursor=cursor, limit=limit, **filters
+        )
+        return Page(items=tickets, next_cursor=next_cursor)
+
+    return await ticket_crud.get_filtered(db, user_id=current_user.id, skip=skip, limit=limit, **filters)
 
 @router.get("/{ticket_id}", response_model=Ticket)
 async def get_ticket(
         ticket_id: str,
         current_user: User = Depends(get_current_user_dependency),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Get a specific ticket by ID.
     """
-    ticket = ticket_crud.get(db, id=ticket_id)
+    ticket = await ticket_crud.get(db, id=ticket_id)
     if not ticket:
         raise NotFoundError("Ticket not found")
 
@@ -78,12 +125,12 @@ async def update_ticket(
         ticket_id: str,
         ticket_update: TicketUpdate,
         current_user: User = Depends(get_current_user_dependency),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Update a ticket (limited fields for users).
     """
-    ticket = ticket_crud.get(db, id=ticket_id)
+    ticket = await ticket_crud.get(db, id=ticket_id)
     if not ticket:
         raise NotFoundError("Ticket not found")
 
@@ -97,5 +144,5 @@ async def update_ticket(
     }
     allowed_updates = {k: v for k, v in allowed_updates.items() if v is not None}
 
-    updated_ticket = ticket_crud.update(db, db_obj=ticket, obj_in=allowed_updates)
+    updated_ticket = await ticket_crud.update(db, db_obj=ticket, obj_in=allowed_updates)
     return updated_ticket
@@ -1,9 +1,9 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.api.deps import get_db, get_current_user_dependency
-from app.crud.user import user as user_crud
+from app.crud.user import async_user as user_crud
+from app.db.session import DBSession
 from app.schemas.user import User, UserUpdate
 from app.db.models.user import User as UserModel
 
@@ -22,26 +22,36 @@ async def get_current_user_profile(
 async def update_current_user(
         user_update: UserUpdate,
         current_user: UserModel = Depends(get_current_user_dependency),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Update current user's profile.
     """
-    updated_user = user_crud.update(db, db_obj=current_user, obj_in=user_update)
+    updated_user = await user_crud.update(db, db_obj=current_user, obj_in=user_update)
     return updated_user
 
 @router.get("/me/tickets")
 async def get_current_user_tickets(
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = Query(
+            None, description="Cursor pagination: empty for the first page, then the previous next_cursor"
+        ),
         current_user: UserModel = Depends(get_current_user_dependency),
-        db: Session = Depends(get_db)
+        db: DBSession = Depends(get_db)
 ):
     """
     Get current user's tickets.
+
+    - **cursor**: returns ``{"items", "next_cursor"}`` pages instead of a list
     """
-    from app.crud.ticket import ticket as ticket_crud
-    tickets = ticket_crud.get_by_user(
+    from app.crud.ticket import async_ticket as ticket_crud
+    if cursor is not None:
+        tickets, next_cursor = await ticket_crud.get_by_user_page(
+            db, user_id=current_user.id, cursor=cursor, limit=limit
+        )
+        return {"items": tickets, "next_cursor": next_cursor}
+    tickets = await ticket_crud.get_by_user(
         db, user_id=current_user.id, skip=skip, limit=limit
     )
     return tickets
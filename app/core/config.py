@@ -15,6 +15,64 @@ class Settings(BaseSettings):
         default="sqlite:///./customer_support.db",
         description="Database connection URL"
     )
+    DB_ASYNC: bool = Field(
+        default=False,
+        description="Serve request handlers from the async engine (aiosqlite/asyncpg) instead of the "
+                    "sync engine on the threadpool"
+    )
+    ASYNC_DATABASE_URL: Optional[str] = Field(
+        default=None,
+        description="Async driver URL; derived from DATABASE_URL (sqlite+aiosqlite, postgresql+asyncpg) when unset"
+    )
+    DB_POOL_SIZE: int = Field(default=5, description="Connections kept open per engine")
+    DB_MAX_OVERFLOW: int = Field(default=10, description="Extra connections opened under load beyond DB_POOL_SIZE")
+    DB_POOL_TIMEOUT_SECONDS: float = Field(
+        default=30,
+        description="How long a checkout waits for a free connection before failing"
+    )
+    DB_POOL_PRE_PING: bool = Field(
+        default=False,
+        description="Test connections on checkout (one extra round trip); for servers that drop idle connections"
+    )
+    DB_POOL_RECYCLE_SECONDS: int = Field(
+        default=1800,
+        description="Replace connections older than this (-1 keeps them)"
+    )
+    SQLITE_WAL: bool = Field(
+        default=True,
+        description="Write-ahead logging, so readers and the writer do not block each other"
+    )
+    SQLITE_SYNCHRONOUS: str = Field(
+        default="NORMAL",
+        description="PRAGMA synchronous with WAL; NORMAL syncs at checkpoints, not on every commit"
+    )
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(
+        default=5000,
+        description="How long a connection waits for a lock before 'database is locked'"
+    )
+    SQLITE_CACHE_SIZE_KB: int = Field(default=64 * 1024, description="Page cache per connection")
+    SQLITE_MMAP_SIZE_BYTES: int = Field(
+        default=256 * 1024 * 1024,
+        description="Bytes of the database file read through a memory map (0 disables)"
+    )
+    SQLITE_INCREMENTAL_VACUUM_PAGES: int = Field(
+        default=1000,
+        description="Free pages returned to the file system per maintenance run (0 disables incremental vacuum)"
+    )
+    FULLTEXT_BACKEND: str = Field(
+        default="auto",
+        description="FAQ/ticket text search: 'fts5' (SQLite), 'postgres' (tsvector + GIN), 'like' (unindexed "
+                    "substring match) or 'auto' for the database's native one"
+    )
+    FULLTEXT_MAX_CANDIDATES: int = Field(
+        default=0,
+        description="With fts5, rank only the newest this many matches of a search by BM25 (0 ranks all); "
+                    "caps the cost of very common terms, but older, more relevant rows are then never found"
+    )
+    DB_MAINTENANCE_INTERVAL_SECONDS: float = Field(
+        default=3600,
+        description="How often ANALYZE/PRAGMA optimize and the incremental vacuum run on SQLite (0 disables)"
+    )
 
     # Security
     SECRET_KEY: str = Field(
@@ -33,6 +91,162 @@ class Settings(BaseSettings):
         default=None,
         description="Hugging Face API key"
     )
+    LLM_FALLBACK_ENABLED: bool = Field(
+        default=False,
+        description="Generate answers with the Hugging Face API for low_confidence/no_match questions"
+    )
+    LLM_REQUEST_BUDGET_SECONDS: float = Field(
+        default=2.0,
+        description="Latency budget for LLM generation within one ask request, retries and queueing included"
+    )
+    LLM_CONNECT_TIMEOUT_SECONDS: float = Field(default=0.5, description="TCP/TLS connect timeout per attempt")
+    LLM_MAX_CONCURRENCY: int = Field(default=8, description="Generation calls in flight per worker")
+    LLM_MAX_CONNECTIONS: int = Field(default=16, description="Connection pool size of the shared HTTP client")
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=8, description="Idle connections kept open for reuse")
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = Field(default=30.0, description="How long an idle connection is kept")
+    LLM_MAX_RETRIES: int = Field(default=2, description="Retries of timeouts, 429 and 5xx responses within the budget")
+    LLM_RETRY_BACKOFF_SECONDS: float = Field(default=0.1, description="Base of the jittered exponential backoff")
+    LLM_BREAKER_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        description="Consecutive failed generations that open the circuit"
+    )
+    LLM_BREAKER_RESET_SECONDS: float = Field(
+        default=30.0,
+        description="How long the open circuit fails fast before a probe call is let through"
+    )
+    LLM_MAX_NEW_TOKENS: int = Field(default=200, description="Generation length limit")
+
+    # Semantic search
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(
+        default=32,
+        description="Maximum number of queries encoded together by the micro-batcher"
+    )
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = Field(
+        default=5.0,
+        description="Maximum time a query waits for its micro-batch to fill"
+    )
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        description="Maximum number of cached query embeddings (0 disables the cache)"
+    )
+    EMBEDDING_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum total size of cached query embedding vectors"
+    )
+    EMBEDDING_CACHE_TTL_SECONDS: float = Field(
+        default=3600,
+        description="Lifetime of a cached query embedding (0 keeps entries until evicted)"
+    )
+    ANSWER_CACHE_MAX_ENTRIES: int = Field(
+        default=2048,
+        description="Maximum number of cached get_best_answer results (0 disables the cache)"
+    )
+    ANSWER_CACHE_TTL_SECONDS: float = Field(
+        default=600,
+        description="Lifetime of a cached get_best_answer result (0 keeps entries until evicted)"
+    )
+    GENERATED_ANSWER_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        description="Maximum number of LLM-generated answers reused for similar questions (0 disables the cache)"
+    )
+    GENERATED_ANSWER_CACHE_TTL_SECONDS: float = Field(
+        default=3600,
+        description="Lifetime of a cached generated answer (0 keeps entries until evicted)"
+    )
+    GENERATED_ANSWER_CACHE_THRESHOLD: float = Field(
+        default=0.9,
+        description="Minimum cosine similarity between two questions for them to share a generated answer"
+    )
+    FAISS_INDEX_TYPE: str = Field(
+        default="flat",
+        description="ANN index built by the index tooling: flat, ivf_flat, hnsw or ivf_pq"
+    )
+    FAISS_NLIST: int = Field(default=1024, description="IVF coarse centroids (clamped to corpus size)")
+    FAISS_NPROBE: int = Field(default=16, description="IVF lists probed per query")
+    FAISS_HNSW_M: int = Field(default=32, description="HNSW neighbours per node")
+    FAISS_HNSW_EF_CONSTRUCTION: int = Field(default=200, description="HNSW build-time beam width")
+    FAISS_HNSW_EF_SEARCH: int = Field(default=64, description="HNSW query-time beam width")
+    FAISS_PQ_M: int = Field(default=48, description="PQ sub-quantizers (must divide the index dimension)")
+    FAISS_PQ_NBITS: int = Field(default=8, description="PQ bits per sub-quantizer code")
+    FAISS_VECTOR_CODEC: str = Field(
+        default="float32",
+        description="Vector storage inside the index: float32, float16, sq8 (8-bit scalar) or pq (product quantization)"
+    )
+    FAISS_PCA_DIM: int = Field(
+        default=0,
+        description="Reduce embeddings to this many dimensions with PCA before indexing (0 disables)"
+    )
+    HYBRID_SEARCH_ENABLED: bool = Field(
+        default=True,
+        description="Fuse an in-memory BM25 index over question/keywords/answer with the FAISS scores"
+    )
+    HYBRID_FUSION: str = Field(
+        default="weighted",
+        description="How lexical and semantic candidates are ranked: 'weighted' (fused score) or 'rrf'"
+    )
+    HYBRID_LEXICAL_WEIGHT: float = Field(
+        default=0.3,
+        description="How far a full BM25 match moves the cosine towards 1.0 when ranking (confidence stays the cosine)"
+    )
+    HYBRID_RRF_K: int = Field(
+        default=60,
+        description="Rank offset k of reciprocal rank fusion"
+    )
+    HYBRID_CANDIDATES: int = Field(
+        default=20,
+        description="Candidates taken from each retriever before fusion"
+    )
+    AI_DATA_DIR: str = Field(
+        default="app/data",
+        description="Directory with the search artifacts, or with generations/ and a CURRENT pointer"
+    )
+    SEARCH_RELOAD_DRAIN_SECONDS: float = Field(
+        default=30,
+        description="Grace period for in-flight requests on the old generation after a hot reload"
+    )
+    AI_MMAP_LOAD: bool = Field(
+        default=False,
+        description="Memory-map the FAISS index, embeddings and compact metadata so workers share one copy"
+    )
+    ENCODER_BACKEND: str = Field(
+        default="torch",
+        description="Sentence encoder runtime: 'torch' (SentenceTransformer) or 'onnx' (onnxruntime, no torch import)"
+    )
+    ENCODER_ONNX_QUANTIZED: bool = Field(
+        default=False,
+        description="Use the dynamically int8-quantized ONNX export with the onnx backend"
+    )
+    ENCODER_MAX_SEQ_LENGTH: int = Field(
+        default=0,
+        description="Tokens kept per text before truncation (0 uses the model's max_seq_length); "
+                    "rebuild the index after changing it"
+    )
+    INFERENCE_EXECUTOR: str = Field(
+        default="thread",
+        description="Where query encoding runs off the event loop: 'thread' or 'process'"
+    )
+    INFERENCE_WORKERS: int = Field(
+        default=1,
+        description="Number of inference threads or processes"
+    )
+    INFERENCE_TORCH_THREADS: int = Field(
+        default=0,
+        description="Torch/FAISS intra-op threads per inference worker (0 splits the CPU cores across workers)"
+    )
+    AI_WARMUP_ON_STARTUP: bool = Field(
+        default=True,
+        description="Load and warm the search service at startup instead of on the first /tickets/ask"
+    )
+    FAISS_SNAPSHOT_INTERVAL_SECONDS: float = Field(
+        default=60,
+        description="How often in-place FAQ index updates are written back to disk (0 disables); with several workers only the one holding AI_DATA_DIR/.snapshot.lock writes"
+    )
+
+    # Tickets
+    ASK_BATCH_MAX_ITEMS: int = Field(
+        default=500,
+        description="Maximum number of questions accepted by one POST /tickets/ask/batch"
+    )
 
     class Config:
         env_file = ".env"
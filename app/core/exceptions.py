@@ -28,3 +28,7 @@ class ValidationError(HTTPException):
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=detail,
         )
+
+class InvalidCursorError(ValidationError):
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(detail=detail)
@@ -1,5 +1,5 @@
-from .user import user
-from .ticket import ticket
-from .faq import faq
+from .user import user, async_user
+from .ticket import ticket, async_ticket
+from .faq import faq, async_faq
 
-__all__ = ["user", "ticket", "faq"]
+__all__ = ["user", "ticket", "faq", "async_user", "async_ticket", "async_faq"]
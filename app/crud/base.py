@@ -1,8 +1,11 @@
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Union
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Tuple, Union
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi.encoders import jsonable_encoder
 
+from app.crud.pagination import keyset_page
+from app.db.session import DBSession, run_db
+
 # We don't import Base here to avoid circular imports
 # Instead, we'll use Any for the model type in the base class
 
@@ -19,6 +22,8 @@ class CRUDBase:
             model: A SQLAlchemy model class
         """
         self.model = model
+        # Unique sort key of cursor pages, read in descending order: newest first for timestamped models
+        self.sort_key = (model.created_at, model.id) if hasattr(model, "created_at") else (model.id,)
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         """Get a single record by ID."""
@@ -30,6 +35,12 @@ class CRUDBase:
         """Get multiple records with pagination."""
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_page(
+            self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Get a page of records after ``cursor`` and the cursor of the next page."""
+        return keyset_page(db.query(self.model), self.sort_key, cursor, limit)
+
     def create(self, db: Session, *, obj_in) -> ModelType:
         """Create a new record."""
         obj_in_data = jsonable_encoder(obj_in)
@@ -77,3 +88,54 @@ class CRUDBase:
     def count(self, db: Session) -> int:
         """Count total records."""
         return db.query(self.model).count()
+
+class AsyncCRUDBase:
+    def __init__(self, crud: CRUDBase):
+        """
+        Awaitable counterpart of a CRUD object for async request handlers.
+
+        Each method runs the matching sync method through ``run_db``: on the
+        async driver for an AsyncSession (DB_ASYNC), on the threadpool for a
+        Session, so queries are written once and never block the event loop.
+
+        Args:
+            crud: The sync CRUD object to delegate to
+        """
+        self.crud = crud
+        self.model = crud.model
+
+    async def get(self, db: DBSession, id: Any) -> Optional[ModelType]:
+        """Get a single record by ID."""
+        return await run_db(db, self.crud.get, id)
+
+    async def get_multi(self, db: DBSession, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        """Get multiple records with pagination."""
+        return await run_db(db, self.crud.get_multi, skip=skip, limit=limit)
+
+    async def get_page(
+            self, db: DBSession, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Get a page of records after ``cursor`` and the cursor of the next page."""
+        return await run_db(db, self.crud.get_page, cursor=cursor, limit=limit)
+
+    async def create(self, db: DBSession, *, obj_in) -> ModelType:
+        """Create a new record."""
+        return await run_db(db, self.crud.create, obj_in=obj_in)
+
+    async def update(
+            self,
+            db: DBSession,
+            *,
+            db_obj: ModelType,
+            obj_in: Union[Dict[str, Any], Any]
+    ) -> ModelType:
+        """Update an existing record."""
+        return await run_db(db, self.crud.update, db_obj=db_obj, obj_in=obj_in)
+
+    async def remove(self, db: DBSession, *, id: Any) -> ModelType:
+        """Delete a record by ID."""
+        return await run_db(db, self.crud.remove, id=id)
+
+    async def count(self, db: DBSession) -> int:
+        """Count total records."""
+        return await run_db(db, self.crud.count)
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, desc
 
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.pagination import keyset_page
+from app.db import fulltext
+from app.db.fulltext import SearchHit
+from app.db.session import DBSession, run_db
 
 class CRUDFAQ(CRUDBase):
     def __init__(self):
@@ -10,18 +14,27 @@ class CRUDFAQ(CRUDBase):
         from app.db.models.faq import FAQ
         super().__init__(FAQ)
         self.FAQ = FAQ
+        # Most helpful first, like the offset listings; id makes the key unique
+        self.sort_key = (FAQ.helpfulness_score, FAQ.view_count, FAQ.id)
 
     def get_active(self, db: Session, *, skip: int = 0, limit: int = 100) -> List:
         """Get active FAQs."""
         return (
             db.query(self.FAQ)
             .filter(self.FAQ.is_active == True)
-            .order_by(desc(self.FAQ.helpfulness_score), desc(self.FAQ.view_count))
+            .order_by(desc(self.FAQ.helpfulness_score), desc(self.FAQ.view_count), desc(self.FAQ.id))
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_page(
+            self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of active FAQs and the cursor of the next page."""
+        query = db.query(self.FAQ).filter(self.FAQ.is_active == True)
+        return keyset_page(query, self.sort_key, cursor, limit)
+
     def get_by_category(
             self,
             db: Session,
@@ -42,32 +55,68 @@ class CRUDFAQ(CRUDBase):
             .all()
         )
 
-    def search(
+    def get_by_category_page(
+            self, db: Session, *, category: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of active FAQs in a category and the cursor of the next page."""
+        query = db.query(self.FAQ).filter(and_(self.FAQ.category == category, self.FAQ.is_active == True))
+        return keyset_page(query, self.sort_key, cursor, limit)
+
+    def count_active(self, db: Session) -> int:
+        """Count active FAQs."""
+        return db.query(self.FAQ).filter(self.FAQ.is_active == True).count()
+
+    def iter_active_chunks(self, db: Session, *, chunk_size: int = 1000) -> Iterator[List]:
+        """Yield active FAQs in id order, one chunk at a time (keyset pagination on id)."""
+        last_id = None
+        while True:
+            query = db.query(self.FAQ).filter(self.FAQ.is_active == True)
+            if last_id is not None:
+                query = query.filter(self.FAQ.id > last_id)
+            chunk = query.order_by(self.FAQ.id).limit(chunk_size).all()
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1].id
+            # Drop the chunk from the identity map so memory stays flat
+            db.expunge_all()
+
+    def get_active_by_ids(self, db: Session, *, ids: List[str]) -> List:
+        """Get active FAQs by id, in the order of ``ids``."""
+        if not ids:
+            return []
+        rows = db.query(self.FAQ).filter(self.FAQ.id.in_(ids), self.FAQ.is_active == True).all()
+        by_id = {row.id: row for row in rows}
+        return [by_id[faq_id] for faq_id in ids if faq_id in by_id]
+
+    def search_hits(
             self,
             db: Session,
             *,
             query: str,
             skip: int = 0,
             limit: int = 100
-    ) -> List:
-        """Search FAQs by question, answer, or keywords."""
-        return (
-            db.query(self.FAQ)
-            .filter(
-                and_(
-                    or_(
-                        self.FAQ.question.ilike(f"%{query}%"),
-                        self.FAQ.answer.ilike(f"%{query}%"),
-                        self.FAQ.keywords.ilike(f"%{query}%")
-                    ),
-                    self.FAQ.is_active == True
-                )
-            )
-            .order_by(desc(self.FAQ.helpfulness_score))
+    ) -> List[SearchHit]:
+        """Full-text search of active FAQs by question, answer, or keywords, best match first, with snippets."""
+        rows = (
+            fulltext.search(db.query(self.FAQ).filter(self.FAQ.is_active == True), self.FAQ, query)
+            .order_by(desc(self.FAQ.helpfulness_score), desc(self.FAQ.id))
             .offset(skip)
             .limit(limit)
             .all()
         )
+        return [SearchHit(*row) for row in rows]
+
+    def search(
+            self,
+            db: Session,
+            *,
+            query: str,
+            skip: int = 0,
+            limit: int = 100
+    ) -> List:
+        """Search FAQs by question, answer, or keywords."""
+        return [hit.obj for hit in self.search_hits(db, query=query, skip=skip, limit=limit)]
 
     def increment_view_count(self, db: Session, *, faq_id: str) -> Optional:
         """Increment view count for analytics."""
@@ -94,5 +143,53 @@ class CRUDFAQ(CRUDBase):
             db.refresh(faq_obj)
         return faq_obj
 
-# Create instance
+class AsyncCRUDFAQ(AsyncCRUDBase):
+    async def get_active(self, db: DBSession, *, skip: int = 0, limit: int = 100) -> List:
+        """Get active FAQs."""
+        return await run_db(db, self.crud.get_active, skip=skip, limit=limit)
+
+    async def get_by_category(self, db: DBSession, *, category: str, skip: int = 0, limit: int = 100) -> List:
+        """Get FAQs by category."""
+        return await run_db(db, self.crud.get_by_category, category=category, skip=skip, limit=limit)
+
+    async def get_active_page(
+            self, db: DBSession, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of active FAQs and the cursor of the next page."""
+        return await run_db(db, self.crud.get_active_page, cursor=cursor, limit=limit)
+
+    async def get_by_category_page(
+            self, db: DBSession, *, category: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of active FAQs in a category and the cursor of the next page."""
+        return await run_db(db, self.crud.get_by_category_page, category=category, cursor=cursor, limit=limit)
+
+    async def count_active(self, db: DBSession) -> int:
+        """Count active FAQs."""
+        return await run_db(db, self.crud.count_active)
+
+    async def get_active_by_ids(self, db: DBSession, *, ids: List[str]) -> List:
+        """Get active FAQs by id, in the order of ``ids``."""
+        return await run_db(db, self.crud.get_active_by_ids, ids=ids)
+
+    async def search_hits(
+            self, db: DBSession, *, query: str, skip: int = 0, limit: int = 100
+    ) -> List[SearchHit]:
+        """Full-text search of active FAQs by question, answer, or keywords, best match first, with snippets."""
+        return await run_db(db, self.crud.search_hits, query=query, skip=skip, limit=limit)
+
+    async def search(self, db: DBSession, *, query: str, skip: int = 0, limit: int = 100) -> List:
+        """Search FAQs by question, answer, or keywords."""
+        return await run_db(db, self.crud.search, query=query, skip=skip, limit=limit)
+
+    async def increment_view_count(self, db: DBSession, *, faq_id: str) -> Optional:
+        """Increment view count for analytics."""
+        return await run_db(db, self.crud.increment_view_count, faq_id=faq_id)
+
+    async def update_helpfulness_score(self, db: DBSession, *, faq_id: str, score: float) -> Optional:
+        """Update helpfulness score based on user feedback."""
+        return await run_db(db, self.crud.update_helpfulness_score, faq_id=faq_id, score=score)
+
+# Create instances
 faq = CRUDFAQ()
+async_faq = AsyncCRUDFAQ(faq)
@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque token holding the sort key of the last row of a page"""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, columns: Sequence) -> List[Any]:
+    """Sort key values of ``token``, typed like ``columns``; InvalidCursorError for foreign or corrupt tokens"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the sort key")
+        return [_restore(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError() from e
+
+
+def _restore(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, python_type):
+        raise ValueError(f"cursor value for {column.key} has the wrong type")
+    return value
+
+
+def keyset_page(query: Query, columns: Sequence, cursor: Optional[str], limit: int) -> Tuple[List, Optional[str]]:
+    """
+    One page of ``query`` in descending ``columns`` order, starting after the
+    row ``cursor`` points at. The key must be unique, i.e. end with the
+    primary key. Unlike OFFSET, the database seeks straight to the cursor
+    through an index on ``columns``, so every page costs the same however
+    deep it is. The returned next cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(tuple_(*columns) < tuple(decode_cursor(cursor, columns)))
+    rows = query.order_by(*(column.desc() for column in columns)).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], column.key) for column in columns])
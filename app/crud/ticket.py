@@ -1,9 +1,14 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, desc, insert
 from datetime import datetime, timezone
+import uuid
 
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.pagination import keyset_page
+from app.db import fulltext
+from app.db.fulltext import SearchHit
+from app.db.session import DBSession, run_db
 
 class CRUDTicket(CRUDBase):
     def __init__(self):
@@ -26,7 +31,7 @@ class CRUDTicket(CRUDBase):
         return (
             db.query(self.Ticket)
             .filter(self.Ticket.user_id == user_id)
-            .order_by(desc(self.Ticket.created_at))
+            .order_by(desc(self.Ticket.created_at), desc(self.Ticket.id))
             .offset(skip)
             .limit(limit)
             .all()
@@ -44,40 +49,136 @@ class CRUDTicket(CRUDBase):
         return (
             db.query(self.Ticket)
             .filter(self.Ticket.status == status)
-            .order_by(desc(self.Ticket.created_at))
+            .order_by(desc(self.Ticket.created_at), desc(self.Ticket.id))
             .offset(skip)
             .limit(limit)
             .all()
         )
 
-    def search(
+    def get_by_user_page(
+            self,
+            db: Session,
+            *,
+            user_id: str,
+            cursor: Optional[str] = None,
+            limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of a user's tickets, newest first, and the cursor of the next page."""
+        query = db.query(self.Ticket).filter(self.Ticket.user_id == user_id)
+        return keyset_page(query, self.sort_key, cursor, limit)
+
+    def _filtered_query(
+            self,
+            db: Session,
+            *,
+            user_id: Optional[str] = None,
+            statuses: Optional[Sequence] = None,
+            priority=None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None
+    ):
+        query = db.query(self.Ticket)
+        if user_id is not None:
+            query = query.filter(self.Ticket.user_id == user_id)
+        if statuses:
+            query = query.filter(self.Ticket.status.in_(statuses))
+        if priority is not None:
+            query = query.filter(self.Ticket.priority == priority)
+        if created_after is not None:
+            query = query.filter(self.Ticket.created_at >= _utc_naive(created_after))
+        if created_before is not None:
+            query = query.filter(self.Ticket.created_at < _utc_naive(created_before))
+        return query
+
+    def get_filtered(
             self,
             db: Session,
             *,
-            query: str,
             user_id: Optional[str] = None,
+            statuses: Optional[Sequence] = None,
+            priority=None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None,
             skip: int = 0,
             limit: int = 100
     ) -> List:
-        """Search tickets by subject or question content."""
-        base_query = db.query(self.Ticket).filter(
-            or_(
-                self.Ticket.subject.ilike(f"%{query}%"),
-                self.Ticket.question.ilike(f"%{query}%"),
-                self.Ticket.answer.ilike(f"%{query}%")
+        """Get tickets matching every given filter (user, any of statuses, priority, created_at range), newest first."""
+        return (
+            self._filtered_query(
+                db, user_id=user_id, statuses=statuses, priority=priority,
+                created_after=created_after, created_before=created_before
             )
+            .order_by(desc(self.Ticket.created_at), desc(self.Ticket.id))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def get_filtered_page(
+            self,
+            db: Session,
+            *,
+            user_id: Optional[str] = None,
+            statuses: Optional[Sequence] = None,
+            priority=None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None,
+            cursor: Optional[str] = None,
+            limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of tickets matching every given filter, newest first, and the cursor of the next page."""
+        query = self._filtered_query(
+            db, user_id=user_id, statuses=statuses, priority=priority,
+            created_after=created_after, created_before=created_before
         )
+        return keyset_page(query, self.sort_key, cursor, limit)
 
+    def get_by_status_page(
+            self,
+            db: Session,
+            *,
+            status,
+            cursor: Optional[str] = None,
+            limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of tickets by status, newest first, and the cursor of the next page."""
+        query = db.query(self.Ticket).filter(self.Ticket.status == status)
+        return keyset_page(query, self.sort_key, cursor, limit)
+
+    def search_hits(
+            self,
+            db: Session,
+            *,
+            query: str,
+            user_id: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> List[SearchHit]:
+        """Full-text search of tickets by subject, question or answer, best match first, with snippets."""
+        base_query = db.query(self.Ticket)
         if user_id:
             base_query = base_query.filter(self.Ticket.user_id == user_id)
 
-        return (
-            base_query
-            .order_by(desc(self.Ticket.created_at))
+        rows = (
+            fulltext.search(base_query, self.Ticket, query)
+            .order_by(desc(self.Ticket.created_at), desc(self.Ticket.id))
             .offset(skip)
             .limit(limit)
             .all()
         )
+        return [SearchHit(*row) for row in rows]
+
+    def search(
+            self,
+            db: Session,
+            *,
+            query: str,
+            user_id: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> List:
+        """Search tickets by subject or question content."""
+        return [hit.obj for hit in self.search_hits(db, query=query, user_id=user_id, skip=skip, limit=limit)]
 
     def mark_resolved(self, db: Session, *, ticket_id: str) -> Optional:
         """Mark ticket as resolved."""
@@ -89,6 +190,34 @@ class CRUDTicket(CRUDBase):
             db.refresh(ticket_obj)
         return ticket_obj
 
+    def create_multi(self, db: Session, *, objs_in: List) -> List[str]:
+        """
+        Create many tickets with one bulk INSERT in one transaction.
+
+        Ids are generated up front so no row has to be read back, and
+        resolved tickets get ``resolved_at`` in the same statement instead
+        of a second ``mark_resolved`` commit. Returns the new ticket ids in
+        the order of ``objs_in``.
+        """
+        if not objs_in:
+            return []
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        for obj_in in objs_in:
+            row = obj_in.model_dump()
+            row['id'] = str(uuid.uuid4())
+            row['resolved_at'] = now if row.get('status') == self.TicketStatus.RESOLVED else None
+            rows.append(row)
+
+        try:
+            db.execute(insert(self.Ticket), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return [row['id'] for row in rows]
+
     def count_by_status(self, db: Session) -> dict:
         """Get count of tickets by status."""
         from sqlalchemy import func
@@ -101,5 +230,105 @@ class CRUDTicket(CRUDBase):
 
         return {status.value: count for status, count in result}
 
-# Create instance
+class AsyncCRUDTicket(AsyncCRUDBase):
+    async def get_by_user(self, db: DBSession, *, user_id: str, skip: int = 0, limit: int = 100) -> List:
+        """Get tickets for a specific user."""
+        return await run_db(db, self.crud.get_by_user, user_id=user_id, skip=skip, limit=limit)
+
+    async def get_by_status(self, db: DBSession, *, status, skip: int = 0, limit: int = 100) -> List:
+        """Get tickets by status."""
+        return await run_db(db, self.crud.get_by_status, status=status, skip=skip, limit=limit)
+
+    async def get_by_user_page(
+            self, db: DBSession, *, user_id: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of a user's tickets, newest first, and the cursor of the next page."""
+        return await run_db(db, self.crud.get_by_user_page, user_id=user_id, cursor=cursor, limit=limit)
+
+    async def get_filtered(
+            self,
+            db: DBSession,
+            *,
+            user_id: Optional[str] = None,
+            statuses: Optional[Sequence] = None,
+            priority=None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> List:
+        """Get tickets matching every given filter (user, any of statuses, priority, created_at range), newest first."""
+        return await run_db(
+            db, self.crud.get_filtered, user_id=user_id, statuses=statuses, priority=priority,
+            created_after=created_after, created_before=created_before, skip=skip, limit=limit
+        )
+
+    async def get_filtered_page(
+            self,
+            db: DBSession,
+            *,
+            user_id: Optional[str] = None,
+            statuses: Optional[Sequence] = None,
+            priority=None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None,
+            cursor: Optional[str] = None,
+            limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of tickets matching every given filter, newest first, and the cursor of the next page."""
+        return await run_db(
+            db, self.crud.get_filtered_page, user_id=user_id, statuses=statuses, priority=priority,
+            created_after=created_after, created_before=created_before, cursor=cursor, limit=limit
+        )
+
+    async def get_by_status_page(
+            self, db: DBSession, *, status, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List, Optional[str]]:
+        """Get a page of tickets by status, newest first, and the cursor of the next page."""
+        return await run_db(db, self.crud.get_by_status_page, status=status, cursor=cursor, limit=limit)
+
+    async def search_hits(
+            self,
+            db: DBSession,
+            *,
+            query: str,
+            user_id: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> List[SearchHit]:
+        """Full-text search of tickets by subject, question or answer, best match first, with snippets."""
+        return await run_db(db, self.crud.search_hits, query=query, user_id=user_id, skip=skip, limit=limit)
+
+    async def search(
+            self,
+            db: DBSession,
+            *,
+            query: str,
+            user_id: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> List:
+        """Search tickets by subject or question content."""
+        return await run_db(db, self.crud.search, query=query, user_id=user_id, skip=skip, limit=limit)
+
+    async def mark_resolved(self, db: DBSession, *, ticket_id: str) -> Optional:
+        """Mark ticket as resolved."""
+        return await run_db(db, self.crud.mark_resolved, ticket_id=ticket_id)
+
+    async def create_multi(self, db: DBSession, *, objs_in: List) -> List[str]:
+        """Create many tickets with one bulk INSERT in one transaction."""
+        return await run_db(db, self.crud.create_multi, objs_in=objs_in)
+
+    async def count_by_status(self, db: DBSession) -> dict:
+        """Get count of tickets by status."""
+        return await run_db(db, self.crud.count_by_status)
+
+def _utc_naive(value: datetime) -> datetime:
+    """created_at is stored as naive UTC; shift aware bounds to UTC before comparing"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+# Create instances
 ticket = CRUDTicket()
+async_ticket = AsyncCRUDTicket(ticket)
@@ -3,9 +3,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
 from app.core.security import get_password_hash, verify_password
+from app.db.session import DBSession, run_db
 
 class CRUDUser(CRUDBase):
     def __init__(self):
@@ -68,5 +70,49 @@ class CRUDUser(CRUDBase):
         """Check if user is admin."""
         return user.is_admin
 
-# Create instance
+class AsyncCRUDUser(AsyncCRUDBase):
+    """Async user CRUD; bcrypt hashing and checks run on the threadpool, not in the DB call"""
+
+    async def get_by_email(self, db: DBSession, *, email: str) -> Optional:
+        return await run_db(db, self.crud.get_by_email, email=email)
+
+    async def create(self, db: DBSession, *, obj_in) -> Any:
+        """Create new user with hashed password."""
+        obj_in_data = jsonable_encoder(obj_in)
+        password = obj_in_data.pop("password", None)
+        if password:
+            obj_in_data["hashed_password"] = await run_in_threadpool(get_password_hash, password)
+        return await run_db(db, self.crud.create, obj_in=obj_in_data)
+
+    async def update(
+            self, db: DBSession, *, db_obj, obj_in: Union[Dict[str, Any], Any]
+    ) -> Any:
+        """Update user, hashing password if provided."""
+        if hasattr(obj_in, 'dict'):
+            update_data = obj_in.dict(exclude_unset=True)
+        else:
+            update_data = dict(obj_in)
+
+        if "password" in update_data:
+            update_data["hashed_password"] = await run_in_threadpool(get_password_hash, update_data.pop("password"))
+
+        return await run_db(db, self.crud.update, db_obj=db_obj, obj_in=update_data)
+
+    async def authenticate(self, db: DBSession, *, email: str, password: str) -> Optional:
+        """Authenticate user with email and password."""
+        user = await self.get_by_email(db, email=email)
+        if not user:
+            return None
+        if not await run_in_threadpool(verify_password, password, user.hashed_password):
+            return None
+        return user
+
+    def is_active(self, user) -> bool:
+        return self.crud.is_active(user)
+
+    def is_admin(self, user) -> bool:
+        return self.crud.is_admin(user)
+
+# Create instances
 user = CRUDUser()
+async_user = AsyncCRUDUser(user)
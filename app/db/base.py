@@ -1,10 +1,12 @@
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, declared_attr, Mapped, mapped_column
 from datetime import datetime, timezone
 import re
 from typing import Any
 
 from app.core.config import settings
+from app.db.engine import build_async_engine, build_engine
+from app.db.fulltext import install_on_create
 
 class Base(DeclarativeBase):
     id: Any
@@ -14,6 +16,9 @@ class Base(DeclarativeBase):
         name = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", cls.__name__)
         return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name).lower()
 
+# create_all also creates the full-text indexes and triggers (app.db.fulltext)
+event.listen(Base.metadata, "after_create", install_on_create)
+
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
         default=lambda: datetime.now(timezone.utc), nullable=False
@@ -24,9 +29,30 @@ class TimestampMixin:
         nullable=False
     )
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG,
-)
+engine = build_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# Async drivers for the sync URL schemes this app is deployed with
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """Async driver variant of a sync database URL; URLs that already name a driver are kept"""
+    scheme, separator, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+# Only built with DB_ASYNC, so aiosqlite/asyncpg stay optional for the sync setup
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = build_async_engine(settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL))
+    # Objects stay loaded after commit; lazy refreshes would need the greenlet bridge
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, autocommit=False, expire_on_commit=False
+    )
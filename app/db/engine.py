@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Rolling checkout-wait statistics of a connection pool"""
+
+    def __init__(self, window: int = 2048):
+        self.wait_ms: Deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_ms.append(wait_ms)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self.wait_ms)
+        n = len(ordered)
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "checkout_wait_ms": {
+                "count": n,
+                "mean": round(sum(ordered) / n, 3) if n else 0.0,
+                "p50": round(ordered[int(0.50 * (n - 1))], 3) if n else 0.0,
+                "p99": round(ordered[int(0.99 * (n - 1))], 3) if n else 0.0,
+                "max": round(ordered[-1], 3) if n else 0.0,
+            },
+        }
+
+
+class _TimedCheckout:
+    """
+    Pool mixin timing how long a checkout waits for a connection; this
+    includes opening a new one while the pool is below its overflow limit.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._record(started, timed_out=True)
+            raise
+        self._record(started)
+        return connection
+
+    def _record(self, started: float, timed_out: bool = False):
+        if self.metrics is not None:
+            self.metrics.record((time.perf_counter() - started) * 1000, timed_out)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in database
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """Per-connection SQLite pragmas from the settings, in the order they are applied"""
+    pragmas = {}
+    if settings.SQLITE_INCREMENTAL_VACUUM_PAGES > 0:
+        # Only takes effect on a database without tables yet; existing files need one VACUUM
+        pragmas["auto_vacuum"] = "INCREMENTAL"
+    pragmas.update({
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        # Negative values are KiB rather than pages
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE_BYTES,
+    })
+    if settings.SQLITE_WAL:
+        # Readers no longer block the writer, and commits append to the WAL instead of syncing the file
+        pragmas["journal_mode"] = "WAL"
+        pragmas["synchronous"] = settings.SQLITE_SYNCHRONOUS
+    return pragmas
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _engine_options(url: str, pool_class) -> Dict[str, Any]:
+    options: Dict[str, Any] = {"echo": settings.DEBUG}
+    if is_sqlite(url) and _is_sqlite_memory(url):
+        # In-memory databases live in a single connection; keep SQLAlchemy's pool for them
+        return options
+    options.update(
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    return options
+
+
+def _configure(engine: Engine, url: str):
+    if isinstance(engine.pool, _TimedCheckout):
+        engine.pool.metrics = PoolMetrics()
+    if is_sqlite(url):
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+
+
+def build_engine(url: str) -> Engine:
+    """Sync engine with the configured pool and, for SQLite, the connection pragmas"""
+    options = _engine_options(url, TimedQueuePool)
+    if is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+    engine = create_engine(url, **options)
+    _configure(engine, url)
+    return engine
+
+
+def build_async_engine(url: str):
+    """Async counterpart of ``build_engine`` (aiosqlite, asyncpg)"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url, **_engine_options(url, TimedAsyncQueuePool))
+    _configure(engine.sync_engine, url)
+    return engine
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """Pool occupancy and checkout waits of an engine (sync or the sync_engine of an async one)"""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+        )
+    if isinstance(pool, _TimedCheckout) and pool.metrics is not None:
+        stats.update(pool.metrics.snapshot())
+    return stats
+
+
+# Outcome of the last maintenance pass, reported with the pool metrics
+last_maintenance: Dict[str, Any] = {}
+
+
+def run_maintenance(engine: Engine) -> Dict[str, Any]:
+    """
+    One SQLite upkeep pass: a full ANALYZE while the planner has no
+    statistics yet, then PRAGMA optimize to refresh stale ones, and an
+    incremental vacuum that returns up to SQLITE_INCREMENTAL_VACUUM_PAGES
+    free pages to the file system. Other backends maintain themselves
+    (autovacuum), so this is a no-op for them.
+    """
+    if not is_sqlite(str(engine.url)):
+        return {}
+
+    started = time.perf_counter()
+    report: Dict[str, Any] = {}
+    with engine.connect() as connection:
+        has_stats = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).first() is not None
+        if not has_stats:
+            connection.exec_driver_sql("ANALYZE")
+        report["analyzed"] = not has_stats
+        connection.exec_driver_sql("PRAGMA optimize")
+
+        report["freelist_pages"] = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+        incremental = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+        if incremental and settings.SQLITE_INCREMENTAL_VACUUM_PAGES > 0 and report["freelist_pages"]:
+            # execute() steps the pragma once, which frees a single page; executescript runs it to completion
+            connection.connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({settings.SQLITE_INCREMENTAL_VACUUM_PAGES});"
+            )
+        report["vacuumed_pages"] = (
+            report["freelist_pages"] - connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+        )
+        report["incremental_vacuum"] = incremental
+        connection.commit()
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["finished_at"] = time.time()
+    last_maintenance.clear()
+    last_maintenance.update(report)
+    return report
+
+
+async def run_maintenance_loop(engine: Engine, interval_seconds: float):
+    """Run ``run_maintenance`` every ``interval_seconds`` off the event loop"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_maintenance, engine)
+        except Exception as e:
+            logger.error(f"Database maintenance failed: {e}")
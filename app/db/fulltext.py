@@ -0,0 +1,274 @@
+import logging
+import re
+import time
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import desc, func, literal_column, null, or_, table, column, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_TOKENS = 16
+
+
+@dataclass(frozen=True)
+class FullTextSpec:
+    """Text columns of a table that are searchable, with their BM25 weights"""
+    table: str
+    columns: Tuple[str, ...]
+    weights: Tuple[float, ...]
+
+    @property
+    def index_name(self) -> str:
+        return f"{self.table}_fts"
+
+
+FULLTEXT_TABLES: Dict[str, FullTextSpec] = {
+    "faq": FullTextSpec("faq", ("question", "answer", "keywords"), (4.0, 1.0, 2.0)),
+    "ticket": FullTextSpec("ticket", ("subject", "question", "answer"), (2.0, 1.0, 1.0)),
+}
+
+
+class SearchHit(NamedTuple):
+    obj: Any
+    # Higher is more relevant; None where the backend does not rank
+    score: Optional[float]
+    # Best matching fragment with HIGHLIGHT_START/END around the terms; None without highlighting
+    snippet: Optional[str]
+
+
+class LikeBackend:
+    """Unranked substring matching; works everywhere but scans every row"""
+
+    name = "like"
+
+    def install(self, connection: Connection, specs: List[FullTextSpec]) -> List[str]:
+        return []
+
+    def rebuild(self, connection: Connection, spec: FullTextSpec):
+        pass
+
+    def match(self, query: Query, model, spec: FullTextSpec, text_query: str) -> Query:
+        pattern = f"%{text_query}%"
+        return (
+            query.filter(or_(*(getattr(model, name).ilike(pattern) for name in spec.columns)))
+            .add_columns(null(), null())
+        )
+
+
+class SQLiteFTS5Backend:
+    """
+    FTS5 index per table, an external-content table over the source rows'
+    rowids so the text is not stored twice. Triggers keep it in sync; a
+    'rebuild' re-reads the whole source table (backfill, or after a VACUUM
+    that renumbered rowids).
+    """
+
+    name = "fts5"
+
+    def install(self, connection: Connection, specs: List[FullTextSpec]) -> List[str]:
+        """Create missing FTS tables and triggers; returns the tables whose index was created and backfilled"""
+        backfilled = []
+        for spec in specs:
+            if not self._exists(connection, spec.table):
+                continue
+            created = not self._exists(connection, spec.index_name)
+            if created:
+                connection.exec_driver_sql(
+                    f"CREATE VIRTUAL TABLE {spec.index_name} USING fts5({', '.join(spec.columns)}, "
+                    f"content='{spec.table}', content_rowid='rowid', tokenize='porter unicode61')"
+                )
+                # ORDER BY rank then runs the weighted BM25 inside FTS5
+                weights = ", ".join(str(weight) for weight in spec.weights)
+                connection.exec_driver_sql(
+                    f"INSERT INTO {spec.index_name}({spec.index_name}, rank) VALUES ('rank', 'bm25({weights})')"
+                )
+            self._create_triggers(connection, spec)
+            if created:
+                self.rebuild(connection, spec)
+                backfilled.append(spec.table)
+        return backfilled
+
+    @staticmethod
+    def _exists(connection: Connection, name: str) -> bool:
+        return connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+        ).first() is not None
+
+    @staticmethod
+    def _create_triggers(connection: Connection, spec: FullTextSpec):
+        fts = spec.index_name
+        columns = ", ".join(spec.columns)
+        new = ", ".join(f"new.{name}" for name in spec.columns)
+        old = ", ".join(f"old.{name}" for name in spec.columns)
+        insert = f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.rowid, {new});"
+        delete = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old});"
+        for suffix, event, body in (
+                ("ai", "AFTER INSERT", insert),
+                ("ad", "AFTER DELETE", delete),
+                # Only text edits re-index; view counts and status changes leave the index alone
+                ("au", f"AFTER UPDATE OF {columns}", delete + " " + insert),
+        ):
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_{suffix} {event} ON {spec.table} BEGIN {body} END"
+            )
+
+    def rebuild(self, connection: Connection, spec: FullTextSpec):
+        fts = spec.index_name
+        connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def match(self, query: Query, model, spec: FullTextSpec, text_query: str) -> Query:
+        fts = table(spec.index_name, column("rowid"))
+        rank = literal_column(f"{spec.index_name}.rank")
+        matched = (
+            query.join(fts, fts.c.rowid == literal_column(f"{spec.table}.rowid"))
+            .filter(text(f"{spec.index_name} MATCH :fulltext_query").bindparams(
+                fulltext_query=self._expression(text_query)
+            ))
+        )
+        if settings.FULLTEXT_MAX_CANDIDATES > 0:
+            # BM25 is computed for every match before sorting, which adds up for common words on a large
+            # table. Rank only the newest matches: FTS5 walks a term's rowids backwards and seeks to the floor.
+            floor = (
+                matched.with_entities(fts.c.rowid)
+                .order_by(fts.c.rowid.desc())
+                .offset(settings.FULLTEXT_MAX_CANDIDATES - 1)
+                .limit(1)
+                .statement.correlate(None)
+                .scalar_subquery()
+            )
+            matched = matched.filter(fts.c.rowid >= func.coalesce(floor, 0))
+        return (
+            matched.add_columns(
+                -rank,
+                func.snippet(
+                    literal_column(spec.index_name), -1, HIGHLIGHT_START, HIGHLIGHT_END, "…", SNIPPET_TOKENS
+                ),
+            )
+            .order_by(rank)
+        )
+
+    @staticmethod
+    def _expression(text_query: str) -> str:
+        """
+        Words as quoted terms, so user input never hits FTS5 query syntax. A
+        word is only a prefix when written with a trailing *: prefix terms
+        merge the postings of every word they start, which is much slower on
+        common words, and the porter stemmer already matches inflections
+        """
+        terms = [f'"{word}"{star}' for word, star in re.findall(r"(\w+)(\*?)", text_query.lower())]
+        return " ".join(terms) or '""'
+
+
+class PostgresBackend:
+    """
+    tsvector matching through a GIN expression index per table; columns are
+    weighted A-D by their BM25 weight and ranked with ts_rank_cd. The index
+    is on the expression itself, so no trigger or stored column is needed.
+    """
+
+    name = "postgres"
+    config = "english"
+
+    def _config(self):
+        return literal_column(f"'{self.config}'::regconfig")
+
+    def _document(self, spec: FullTextSpec):
+        ordered = sorted(spec.weights, reverse=True)
+        vectors = [
+            func.setweight(
+                func.to_tsvector(self._config(), func.coalesce(literal_column(name), "")),
+                "ABCD"[min(ordered.index(weight), 3)]
+            )
+            for name, weight in zip(spec.columns, spec.weights)
+        ]
+        return reduce(lambda left, right: left.op("||")(right), vectors)
+
+    def install(self, connection: Connection, specs: List[FullTextSpec]) -> List[str]:
+        for spec in specs:
+            document = self._document(spec).compile(
+                dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+            )
+            connection.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix_{spec.table}_fulltext ON {spec.table} USING GIN (({document}))"
+            )
+        # The index is built from the rows already there; nothing to backfill
+        return []
+
+    def rebuild(self, connection: Connection, spec: FullTextSpec):
+        connection.exec_driver_sql(f"REINDEX INDEX ix_{spec.table}_fulltext")
+
+    def match(self, query: Query, model, spec: FullTextSpec, text_query: str) -> Query:
+        document = self._document(spec)
+        ts_query = func.websearch_to_tsquery(self._config(), text_query)
+        score = func.ts_rank_cd(document, ts_query)
+        text_value = reduce(
+            lambda left, right: left.op("||")(" ").op("||")(right),
+            (func.coalesce(getattr(model, name), "") for name in spec.columns)
+        )
+        options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords={SNIPPET_TOKENS}, MinWords=5"
+        return (
+            query.filter(document.op("@@")(ts_query))
+            .add_columns(score, func.ts_headline(self._config(), text_value, ts_query, options))
+            .order_by(desc(score))
+        )
+
+
+_BACKENDS = {backend.name: backend for backend in (LikeBackend(), SQLiteFTS5Backend(), PostgresBackend())}
+_AUTO = {"sqlite": "fts5", "postgresql": "postgres"}
+
+
+def get_backend(dialect_name: str):
+    """The FULLTEXT_BACKEND for a database dialect; 'auto' picks the native engine, else LIKE"""
+    name = settings.FULLTEXT_BACKEND
+    if name == "auto":
+        name = _AUTO.get(dialect_name, "like")
+    elif name not in _BACKENDS:
+        raise ValueError(f"Unknown FULLTEXT_BACKEND '{name}'")
+    elif name != "like" and _AUTO.get(dialect_name) != name:
+        raise ValueError(f"FULLTEXT_BACKEND '{name}' does not support {dialect_name}")
+    return _BACKENDS[name]
+
+
+def install(connection: Connection, rebuild: bool = False) -> Dict[str, Any]:
+    """
+    Create the full-text structures of the configured backend; newly created
+    indexes are backfilled from the existing rows, and ``rebuild`` re-indexes
+    every table
+    """
+    backend = get_backend(connection.dialect.name)
+    specs = list(FULLTEXT_TABLES.values())
+    started = time.perf_counter()
+    backfilled = backend.install(connection, specs)
+    if rebuild:
+        for spec in specs:
+            if spec.table not in backfilled:
+                backend.rebuild(connection, spec)
+                backfilled.append(spec.table)
+    if backfilled:
+        logger.info(f"Full-text index ({backend.name}) backfilled for {', '.join(backfilled)} "
+                    f"in {time.perf_counter() - started:.1f}s")
+    return {"backend": backend.name, "backfilled": backfilled, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def install_on_create(target, connection: Connection, **kw):
+    """metadata after_create hook: create_all brings the full-text index along"""
+    install(connection)
+
+
+def search(query: Query, model, text_query: str) -> Query:
+    """
+    Restrict an ORM query over ``model`` to full-text matches of
+    ``text_query``; rows come back as (obj, score, snippet), best match first
+    where the backend ranks. Callers add tie-break ordering and the page.
+    """
+    spec = FULLTEXT_TABLES[model.__tablename__]
+    backend = get_backend(query.session.get_bind().dialect.name)
+    return backend.match(query, model, spec, text_query)
@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
-from app.db.base import Base, engine
+from app.db import fulltext
+from app.db.base import engine
+from app.db.migrations import upgrade_database
 
 def init_db(db: Session) -> None:
     """Initialize database with default data."""
 
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # Create or migrate the schema (alembic/versions); the full-text index is not part of the migrations
+    upgrade_database(engine)
+    with engine.begin() as connection:
+        fulltext.install(connection)
 
     # Import CRUD modules locally to avoid circular imports
     from app.crud.user import user as user_crud
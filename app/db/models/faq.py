@@ -1,6 +1,6 @@
 # faq.py
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Text, Boolean, Integer
+from sqlalchemy import String, Text, Boolean, Integer, Index
 import uuid
 from typing import Optional
 
@@ -15,3 +15,8 @@ class FAQ(Base, TimestampMixin):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     view_count: Mapped[int] = mapped_column(Integer, default=0)
     helpfulness_score: Mapped[float] = mapped_column(default=0.0)
+
+    # Sort key of the cursor-paginated listing, so a page seeks instead of scanning
+    __table_args__ = (
+        Index("ix_faq_is_active_helpfulness_view_count_id", "is_active", "helpfulness_score", "view_count", "id"),
+    )
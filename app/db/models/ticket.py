@@ -1,6 +1,6 @@
 # ticket.py
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Text, ForeignKey, Index, Enum as SQLEnum
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -32,3 +32,13 @@ class Ticket(Base, TimestampMixin):
     resolved_at: Mapped[Optional[datetime]]
 
     user: Mapped["User"] = relationship(back_populates="tickets")
+
+    # Sort keys of the cursor-paginated listings, so a page seeks instead of scanning
+    __table_args__ = (
+        Index("ix_ticket_created_at_id", "created_at", "id"),
+        Index("ix_ticket_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_ticket_status_created_at_id", "status", "created_at", "id"),
+        # Filtered listings (CRUDTicket.get_filtered): a user's tickets by status, and queues by status and priority
+        Index("ix_ticket_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+        Index("ix_ticket_status_priority_created_at_id", "status", "priority", "created_at", "id"),
+    )
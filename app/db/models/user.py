@@ -1,6 +1,6 @@
 # user.py
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, Index
 import uuid
 from typing import List, Optional
 
@@ -17,5 +17,8 @@ class User(Base, TimestampMixin):
     tickets: Mapped[List["Ticket"]] = relationship(back_populates="user", cascade="all,delete-orphan")
     logs:    Mapped[List["UserLog"]] = relationship(back_populates="user", cascade="all,delete-orphan")
 
+    # Sort key of the cursor-paginated listing, so a page seeks instead of scanning
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id"),)
+
     def __repr__(self) -> str:
         return f"<User {self.email}>"
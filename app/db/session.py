@@ -1,10 +1,72 @@
-from typing import Generator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, Generator, TypeVar, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.base import SessionLocal
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal, SessionLocal, async_engine, engine
+from app.db.engine import last_maintenance, pool_stats
+
+T = TypeVar("T")
+
+# What endpoints receive from get_db: an AsyncSession with DB_ASYNC, otherwise a Session
+DBSession = Union[Session, AsyncSession]
 
 def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    # Loaded rows stay usable when run_db ends a read-only transaction between calls
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped AsyncSession (requires DB_ASYNC)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_request_db():
+    """The session dependency for endpoints: AsyncSession with DB_ASYNC, otherwise Session"""
+    return get_async_db if settings.DB_ASYNC else get_db
+
+@asynccontextmanager
+async def open_db() -> AsyncIterator[DBSession]:
+    """A session of the configured kind outside request dependencies (e.g. streamed responses)"""
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+async def run_db(db: DBSession, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run sync ORM code ``fn(session, *args, **kwargs)`` without blocking the
+    event loop: through the async driver for an AsyncSession, otherwise on
+    the threadpool.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(_run_and_release, db, fn, args, kwargs)
+    return await db.run_sync(_run_and_release, fn, args, kwargs)
+
+def _run_and_release(session: Session, fn: Callable[..., T], args, kwargs) -> T:
+    result = fn(session, *args, **kwargs)
+    # A read leaves a transaction open that pins a pooled connection until the
+    # request ends; hand it back so a request awaiting something else (the
+    # LLM, a threadpool slot) does not starve others. Pending writes are left
+    # for the caller to commit.
+    if session.in_transaction() and not (session.new or session.dirty or session.deleted):
+        session.commit()
+    return result
+
+def database_stats() -> Dict[str, Any]:
+    """Connection pool metrics of both engines and the last maintenance run"""
+    return {
+        "engine": pool_stats(engine),
+        "async_engine": pool_stats(async_engine.sync_engine) if async_engine is not None else None,
+        "maintenance": dict(last_maintenance) or None,
+    }
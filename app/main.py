@@ -1,5 +1,8 @@
+import asyncio
+import signal
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
 import os
 
@@ -44,6 +47,77 @@ async def startup_event():
         print(f"❌ Database initialization error: {e}")
         # Don't crash the app, just log the error
 
+    # Load and warm the search service off the event loop; /ready reports 503 until it is done
+    if settings.AI_WARMUP_ON_STARTUP:
+        app.state.warmup_task = asyncio.create_task(_warm_search_service())
+
+    # SIGHUP hot-reloads the search artifacts named by CURRENT
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGHUP, lambda: asyncio.create_task(_reload_search_service())
+        )
+    except (AttributeError, NotImplementedError, RuntimeError):
+        pass  # No SIGHUP on this platform; use POST /api/v1/admin/search/reload
+
+    # Persist in-place FAQ index updates periodically
+    if settings.FAISS_SNAPSHOT_INTERVAL_SECONDS > 0:
+        from app.ai.semantic_search_service import run_snapshot_loop
+        app.state.snapshot_task = asyncio.create_task(
+            run_snapshot_loop(settings.FAISS_SNAPSHOT_INTERVAL_SECONDS)
+        )
+
+    # ANALYZE/PRAGMA optimize and incremental vacuum for SQLite
+    if settings.DB_MAINTENANCE_INTERVAL_SECONDS > 0:
+        from app.db.base import engine
+        from app.db.engine import run_maintenance_loop
+        app.state.maintenance_task = asyncio.create_task(
+            run_maintenance_loop(engine, settings.DB_MAINTENANCE_INTERVAL_SECONDS)
+        )
+
+async def _warm_search_service():
+    from app.ai.semantic_search_service import warm_search_service
+    try:
+        search_service = await asyncio.to_thread(warm_search_service)
+        print(f"✅ Semantic search ready: {search_service.load_timings}")
+    except Exception as e:
+        print(f"❌ Semantic search warmup error: {e}")
+
+async def _reload_search_service():
+    from app.ai.semantic_search_service import reload_search_service
+    try:
+        search_service = await asyncio.to_thread(reload_search_service)
+        print(f"✅ Search service reloaded to generation {search_service.generation}")
+    except Exception as e:
+        print(f"❌ Search service reload error: {e}")
+
+# Shutdown event - Flush pending index updates
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write a final index snapshot and release pooled connections on shutdown."""
+    snapshot_task = getattr(app.state, "snapshot_task", None)
+    if snapshot_task:
+        snapshot_task.cancel()
+    maintenance_task = getattr(app.state, "maintenance_task", None)
+    if maintenance_task:
+        maintenance_task.cancel()
+
+    from app.ai.semantic_search_service import get_loaded_search_service, owns_snapshots
+    search_service = get_loaded_search_service()
+    if search_service is not None:
+        try:
+            if owns_snapshots():
+                await asyncio.to_thread(search_service.snapshot)
+        except Exception as e:
+            print(f"❌ Index snapshot error: {e}")
+        search_service.close()
+
+    from app.services.llm_service import close_llm_client
+    await close_llm_client()
+
+    from app.db.base import async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {
@@ -60,6 +134,34 @@ async def health_check():
         "port": os.environ.get("PORT", "8000")
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the search service is loaded and warmed up"""
+    from app.ai.semantic_search_service import get_loaded_search_service
+    search_service = get_loaded_search_service()
+    warmup_task = getattr(app.state, "warmup_task", None)
+
+    if search_service is None or not search_service.is_warm:
+        # Without startup warmup the service is loaded lazily, so there is nothing to wait for
+        if not settings.AI_WARMUP_ON_STARTUP or (warmup_task is not None and warmup_task.done()):
+            return {"status": "ready", "semantic_search": None}
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "warming_up",
+                "load_timings": dict(search_service.load_timings) if search_service else {}
+            }
+        )
+
+    return {
+        "status": "ready",
+        "semantic_search": {
+            "available": search_service.is_available(),
+            "generation": search_service.generation,
+            "load_timings": dict(search_service.load_timings)
+        }
+    }
+
 # Include API routes
 try:
     from app.api.v1.api import api_router
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Dict, Any, List
 from enum import Enum
 
+from app.core.config import settings
+
 class QuestionCategory(str, Enum):
     GENERAL = "general"
     TECHNICAL = "technical"
@@ -20,3 +22,10 @@ class AskResponse(BaseModel):
     confidence_score: Optional[float] = None
     source: str  # "faq", "llm", or "human"
     created_at: str
+    metadata: Optional[Dict[str, Any]] = None
+
+class AskBatchRequest(BaseModel):
+    items: List[AskQuestion] = Field(min_length=1, max_length=settings.ASK_BATCH_MAX_ITEMS)
+
+class AskBatchResponse(BaseModel):
+    results: List[AskResponse]
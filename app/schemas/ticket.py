@@ -23,7 +23,8 @@ class TicketBase(BaseModel):
     answer: Optional[str] = None
 
 class TicketCreate(TicketBase):
-    pass
+    user_id: Optional[str] = None
+    confidence_score: Optional[float] = None
 
 class TicketUpdate(BaseModel):
     subject: Optional[str] = Field(None, min_length=1, max_length=255)
@@ -42,3 +43,11 @@ class Ticket(TicketBase):
     confidence_score: Optional[float] = None
 
     model_config = {"from_attributes": True}
+
+class TicketSearchHit(Ticket):
+    score: Optional[float] = Field(
+        None, description="Relevance, higher is better; null when the search backend does not rank"
+    )
+    snippet: Optional[str] = Field(
+        None, description="Best matching fragment with the search terms wrapped in <mark></mark>"
+    )
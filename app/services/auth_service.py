@@ -1,22 +1,22 @@
 from datetime import timedelta
-from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.core.config import settings
 from app.core.security import create_access_token, verify_password
 from app.core.exceptions import AuthenticationError, ValidationError
-from app.crud.user import user as user_crud
+from app.crud.user import async_user as user_crud
+from app.db.session import DBSession
 from app.schemas.auth import UserRegister, UserLogin, Token, AuthResponse
 from app.schemas.user import UserCreate
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: DBSession):
         self.db = db
 
-    def register_user(self, user_data: UserRegister) -> AuthResponse:
+    async def register_user(self, user_data: UserRegister) -> AuthResponse:
         """Register a new user."""
         # Check if user already exists
-        existing_user = user_crud.get_by_email(self.db, email=user_data.email)
+        existing_user = await user_crud.get_by_email(self.db, email=user_data.email)
         if existing_user:
             raise ValidationError("Email already registered")
 
@@ -26,7 +26,7 @@ class AuthService:
             password=user_data.password,
             full_name=user_data.full_name
         )
-        user = user_crud.create(self.db, obj_in=user_create)
+        user = await user_crud.create(self.db, obj_in=user_create)
 
         # Generate token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -50,9 +50,9 @@ class AuthService:
             token=token
         )
 
-    def authenticate_user(self, credentials: UserLogin) -> AuthResponse:
+    async def authenticate_user(self, credentials: UserLogin) -> AuthResponse:
         """Authenticate user and return token."""
-        user = user_crud.authenticate(
+        user = await user_crud.authenticate(
             self.db, email=credentials.email, password=credentials.password
         )
         if not user:
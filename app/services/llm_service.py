@@ -0,0 +1,377 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upstream responses worth another attempt: rate limiting, model loading, gateway errors
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class LLMUnavailableError(Exception):
+    """Generation failed, timed out or was refused by the circuit breaker"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast for ``reset_seconds``. Then a single probe call is let through
+    (half-open); its outcome closes the circuit or opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def abandon(self):
+        """A call that was allowed through ended without a verdict (cancelled, no local slot)"""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"LLM circuit opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class LLMClient:
+    """
+    Async client for the Hugging Face text-generation inference API.
+
+    One ``httpx.AsyncClient`` is shared by all requests so TCP/TLS
+    connections are pooled and kept alive. Every call works against a
+    deadline derived from the caller's latency budget: attempts, backoff
+    sleeps and the wait for a concurrency slot all stop when it is reached.
+    Transient failures are retried with full-jitter exponential backoff, and
+    a circuit breaker stops sending traffic to an upstream that keeps failing.
+    """
+
+    def __init__(
+            self,
+            api_url: str,
+            api_key: Optional[str] = None,
+            budget_seconds: float = 2.0,
+            connect_timeout: float = 0.5,
+            max_concurrency: int = 8,
+            max_connections: int = 16,
+            max_keepalive_connections: int = 8,
+            keepalive_expiry: float = 30.0,
+            max_retries: int = 2,
+            backoff_seconds: float = 0.1,
+            breaker: Optional[CircuitBreaker] = None,
+            max_new_tokens: int = 200
+    ):
+        self.api_url = api_url
+        self.budget_seconds = budget_seconds
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_new_tokens = max_new_tokens
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._counters = {"calls": 0, "succeeded": 0, "failed": 0, "retries": 0, "rejected": 0, "timed_out": 0}
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+
+    @classmethod
+    def from_settings(cls) -> "LLMClient":
+        return cls(
+            settings.HUGGINGFACE_API_URL,
+            api_key=settings.HUGGINGFACE_API_KEY,
+            budget_seconds=settings.LLM_REQUEST_BUDGET_SECONDS,
+            connect_timeout=settings.LLM_CONNECT_TIMEOUT_SECONDS,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+            backoff_seconds=settings.LLM_RETRY_BACKOFF_SECONDS,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+                reset_seconds=settings.LLM_BREAKER_RESET_SECONDS
+            ),
+            max_new_tokens=settings.LLM_MAX_NEW_TOKENS
+        )
+
+    def deadline(self, budget_seconds: Optional[float] = None) -> float:
+        """Event-loop time by which a call started now has to finish"""
+        budget = self.budget_seconds if budget_seconds is None else budget_seconds
+        return asyncio.get_running_loop().time() + budget
+
+    async def generate(self, prompt: str, deadline: Optional[float] = None) -> str:
+        """Generated text for ``prompt``; raises LLMUnavailableError instead of exceeding ``deadline``"""
+        deadline = deadline if deadline is not None else self.deadline()
+        async with self._call(deadline):
+            return await self._generate_with_retries(prompt, deadline)
+
+    async def stream(self, prompt: str, deadline: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Generated text for ``prompt`` token by token, within the same deadline,
+        slot and breaker rules as ``generate``. Attempts are only retried
+        until the first token; a stream that breaks off later raises
+        LLMUnavailableError after the tokens already yielded.
+        """
+        deadline = deadline if deadline is not None else self.deadline()
+        async with self._call(deadline):
+            async for token in self._stream_with_retries(prompt, deadline):
+                yield token
+
+    @asynccontextmanager
+    async def _call(self, deadline: float):
+        """Circuit breaker, concurrency slot and outcome counters around one generation"""
+        loop = asyncio.get_running_loop()
+        self._counters["calls"] += 1
+
+        if not self.breaker.allow():
+            self._counters["rejected"] += 1
+            raise LLMUnavailableError("LLM circuit is open")
+
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            # Local saturation says nothing about upstream health
+            self.breaker.abandon()
+            self._counters["timed_out"] += 1
+            raise LLMUnavailableError("Timed out waiting for an LLM slot")
+        except asyncio.CancelledError:
+            self.breaker.abandon()
+            raise
+
+        self._in_flight += 1
+        try:
+            yield
+        except LLMUnavailableError:
+            self._counters["failed"] += 1
+            self.breaker.record_failure()
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            # The caller went away (disconnect, cancelled task): no verdict on the upstream
+            self.breaker.abandon()
+            raise
+        except Exception as e:
+            # Anything else (undecodable body, unexpected payload shape) is a failed call too; leaving
+            # the breaker without a verdict would keep a half-open probe in flight forever
+            self._counters["failed"] += 1
+            self.breaker.record_failure()
+            raise LLMUnavailableError(f"LLM generation failed: {type(e).__name__}: {e}") from e
+        else:
+            self._counters["succeeded"] += 1
+            self.breaker.record_success()
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def _payload(self, prompt: str, stream: bool = False) -> Dict[str, Any]:
+        payload = {
+            "inputs": prompt,
+            "parameters": {"max_new_tokens": self.max_new_tokens, "return_full_text": False},
+            "options": {"wait_for_model": False}
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _timeout(self, remaining: float) -> httpx.Timeout:
+        return httpx.Timeout(remaining, connect=min(self.connect_timeout, remaining))
+
+    async def _backoff(self, attempt: int, deadline: float) -> bool:
+        """Sleep before the next attempt; False if that would run past the deadline"""
+        loop = asyncio.get_running_loop()
+        # Full jitter keeps retries from many requests from arriving in lockstep
+        delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+        if loop.time() + delay >= deadline:
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+    async def _generate_with_retries(self, prompt: str, deadline: float) -> str:
+        loop = asyncio.get_running_loop()
+        last_error = "deadline exceeded before the first attempt"
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            if attempt:
+                self._counters["retries"] += 1
+
+            try:
+                response = await self._client.post(
+                    self.api_url, json=self._payload(prompt), timeout=self._timeout(remaining)
+                )
+                if response.status_code == 200:
+                    return self._parse(response.json())
+                last_error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    break
+            except httpx.TimeoutException:
+                self._counters["timed_out"] += 1
+                last_error = "request timed out"
+            except (httpx.TransportError, ValueError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+
+            if not await self._backoff(attempt, deadline):
+                break
+
+        raise LLMUnavailableError(f"LLM generation failed: {last_error}")
+
+    async def _stream_with_retries(self, prompt: str, deadline: float) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        last_error = "deadline exceeded before the first attempt"
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            if attempt:
+                self._counters["retries"] += 1
+
+            emitted = False
+            try:
+                async with self._client.stream(
+                        "POST", self.api_url, json=self._payload(prompt, stream=True), timeout=self._timeout(remaining)
+                ) as response:
+                    if response.status_code == 200:
+                        async for token in self._stream_tokens(response, deadline):
+                            emitted = True
+                            yield token
+                        if emitted:
+                            return
+                        last_error = "empty stream"
+                    else:
+                        last_error = f"HTTP {response.status_code}"
+                        if response.status_code not in RETRYABLE_STATUS_CODES:
+                            break
+            except httpx.TimeoutException:
+                self._counters["timed_out"] += 1
+                last_error = "request timed out"
+            except (httpx.TransportError, ValueError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+
+            if emitted:
+                raise LLMUnavailableError(f"LLM stream broke off: {last_error}")
+            if not await self._backoff(attempt, deadline):
+                break
+
+        raise LLMUnavailableError(f"LLM generation failed: {last_error}")
+
+    @staticmethod
+    async def _stream_tokens(response: httpx.Response, deadline: float) -> AsyncIterator[str]:
+        """Token texts from a text-generation server-sent-events stream"""
+        loop = asyncio.get_running_loop()
+        async for line in response.aiter_lines():
+            if loop.time() > deadline:
+                raise httpx.ReadTimeout("deadline exceeded mid-stream")
+            if not line.startswith("data:"):
+                continue
+            event = json.loads(line[5:])
+            if not isinstance(event, dict):
+                raise ValueError(f"Unexpected LLM stream event: {line[5:205]}")
+            if event.get("error"):
+                raise ValueError(f"LLM stream error: {event['error']}")
+            token = event.get("token") or {}
+            if not isinstance(token, dict):
+                raise ValueError(f"Unexpected LLM stream token: {token!r:.200}")
+            if token.get("special") or not token.get("text"):
+                continue
+            yield token["text"]
+
+    @staticmethod
+    def _parse(body: Any) -> str:
+        """Generated text from the [{"generated_text": ...}] inference API payload"""
+        if isinstance(body, list) and body:
+            body = body[0]
+        if isinstance(body, dict) and isinstance(body.get("generated_text"), str):
+            text = body["generated_text"].strip()
+            if text:
+                return text
+        raise ValueError(f"Unexpected LLM response: {str(body)[:200]}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            **self._counters
+        }
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def build_prompt(question: str, related_faqs: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Prompt grounding the generated answer in the closest FAQs the search found"""
+    lines = [
+        "You are a customer support assistant. Answer the customer's question briefly and politely.",
+        "If the reference answers do not cover it, say that a support agent will follow up."
+    ]
+    for faq in (related_faqs or [])[:3]:
+        lines.append(f"Reference Q: {faq.get('question', '')}\nReference A: {faq.get('answer', '')}")
+    lines.append(f"Customer question: {question}\nAnswer:")
+    return "\n\n".join(lines)
+
+
+_llm_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> Optional[LLMClient]:
+    """Shared client so every request reuses the same connection pool; None when disabled"""
+    global _llm_client
+    if not settings.LLM_FALLBACK_ENABLED:
+        return None
+    if _llm_client is None:
+        _llm_client = LLMClient.from_settings()
+        logger.info(f"LLM fallback enabled against {settings.HUGGINGFACE_API_URL}")
+    return _llm_client
+
+
+async def close_llm_client():
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.aclose()
+        _llm_client = None
@@ -1,9 +1,27 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
 from app.ai.semantic_search_service import get_search_service
+from app.crud.ticket import ticket as ticket_crud
+from app.db.session import DBSession, run_db
+from app.schemas.ask import AskQuestion, AskResponse, QuestionCategory
+from app.schemas.ticket import TicketCreate
+from app.services.llm_service import LLMUnavailableError, build_prompt, get_llm_client
+
+logger = logging.getLogger(__name__)
+
+# Search outcomes whose canned reply is worth replacing with a generated answer
+LLM_FALLBACK_SOURCES = ('low_confidence', 'no_match')
 
 class TicketService:
-    def __init__(self, db: Session):
+    def __init__(self, db: DBSession):
         self.db = db
         self.search_service = get_search_service()
+        self.llm_client = get_llm_client()
 
     async def process_question(self, user_id: str, question_data: AskQuestion) -> AskResponse:
         """Process user question with AI enhancement"""
@@ -11,46 +29,295 @@ class TicketService:
         try:
             # Try AI-powered processing first
             if self.search_service.is_available():
-                ai_result = self.search_service.get_best_answer(
+                # Concurrent questions share one encode and one index search
+                category = self._search_category(question_data)
+                ai_result = await self.search_service.get_best_answer_async(
                     question_data.question,
-                    confidence_threshold=0.7
+                    confidence_threshold=0.7,
+                    category=category
                 )
+                ai_result = await self._with_generated_answer(question_data.question, ai_result, category)
 
-                confidence = ai_result['confidence']
-                answer = ai_result['answer']
-                source = ai_result['source']
-
-                # Create ticket based on AI result
-                ticket = self._create_ticket(
+                # Create ticket based on AI result without blocking the event loop
+                ticket = await run_db(
+                    self.db,
+                    self._create_ticket,
                     user_id=user_id,
                     question_data=question_data,
-                    answer=answer,
-                    confidence=confidence
+                    answer=ai_result['answer'],
+                    confidence=ai_result['confidence']
                 )
 
-                return AskResponse(
-                    ticket_id=ticket.id,
-                    answer=answer,
-                    confidence_score=confidence,
-                    source='ai_enhanced',
-                    created_at=datetime.now(timezone.utc).isoformat(),
-                    metadata={
-                        'ai_source': source,
-                        'needs_human_support': ai_result.get('needs_human_support', False),
-                        'category': ai_result.get('category'),
-                        'faq_id': ai_result.get('faq_id')
-                    }
-                )
+                return self._ai_response(ticket.id, ai_result, datetime.now(timezone.utc).isoformat())
             else:
                 # Fallback to basic processing
-                return self._fallback_process_question(user_id, question_data)
+                return await run_db(self.db, self._fallback_process_question, user_id, question_data)
 
         except Exception as e:
             logger.error(f"Error in AI processing: {e}")
-            return self._fallback_process_question(user_id, question_data)
+            return await run_db(self.db, self._fallback_process_question, user_id, question_data)
+
+    async def process_questions(self, user_id: str, questions: List[AskQuestion]) -> List[AskResponse]:
+        """
+        Process a batch of questions with the semantics of ``process_question``:
+        one encode and index search for all of them, then one bulk insert.
+        """
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        ai_results = None
+        try:
+            if self.search_service.is_available():
+                ai_results = await self.search_service.get_best_answers_batch_async(
+                    [question_data.question for question_data in questions],
+                    confidence_threshold=0.7,
+                    categories=[self._search_category(question_data) for question_data in questions]
+                )
+                # One latency budget for the whole batch; the client's semaphore bounds the fan-out
+                deadline = self.llm_client.deadline() if self.llm_client else None
+                ai_results = await asyncio.gather(*(
+                    self._with_generated_answer(
+                        question_data.question, ai_result, self._search_category(question_data), deadline
+                    )
+                    for question_data, ai_result in zip(questions, ai_results)
+                ))
+        except Exception as e:
+            logger.error(f"Error in AI batch processing: {e}")
+            ai_results = None
+
+        # Inserted exactly once, outside the AI error handling: a failure after the insert must not
+        # fall back to inserting the whole batch again as human tickets
+        ticket_ids = await run_db(
+            self.db,
+            self._create_tickets,
+            user_id=user_id,
+            questions=questions,
+            answers=[ai_result['answer'] for ai_result in ai_results] if ai_results else [None] * len(questions),
+            confidences=(
+                [ai_result['confidence'] for ai_result in ai_results] if ai_results else [0.0] * len(questions)
+            )
+        )
+
+        if ai_results:
+            return [
+                self._ai_response(ticket_id, ai_result, created_at)
+                for ticket_id, ai_result in zip(ticket_ids, ai_results)
+            ]
+        return [
+            AskResponse(ticket_id=ticket_id, answer=None, confidence_score=0.0, source='human', created_at=created_at)
+            for ticket_id in ticket_ids
+        ]
 
-    def _create_ticket(self, user_id: str, question_data: AskQuestion, answer: str, confidence: float):
+    async def stream_question(
+            self,
+            user_id: str,
+            question_data: AskQuestion
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        ``process_question`` as (event, data) pairs for server-sent events.
+
+        ``decision`` comes as soon as the semantic search is done and says
+        whether an FAQ answered the question. For low_confidence/no_match
+        results with the LLM fallback enabled, ``token`` events follow as the
+        answer is generated. ``done`` carries the AskResponse of the committed
+        ticket; its answer is authoritative (the canned reply if generation
+        broke off after some tokens).
+        """
+        ai_result = None
+        category = self._search_category(question_data)
+        try:
+            if self.search_service.is_available():
+                ai_result = await self.search_service.get_best_answer_async(
+                    question_data.question,
+                    confidence_threshold=0.7,
+                    category=category
+                )
+        except Exception as e:
+            logger.error(f"Error in AI processing: {e}")
+
+        if ai_result is None:
+            yield 'decision', {'source': 'human', 'confidence_score': 0.0, 'needs_human_support': True}
+            response = await run_db(self.db, self._fallback_process_question, user_id, question_data)
+            yield 'done', response.model_dump()
+            return
+
+        generating = self.llm_client is not None and ai_result.get('source') in LLM_FALLBACK_SOURCES
+        yield 'decision', {
+            'source': ai_result['source'],
+            'confidence_score': ai_result['confidence'],
+            'needs_human_support': ai_result.get('needs_human_support', False),
+            'category': ai_result.get('category'),
+            'faq_id': ai_result.get('faq_id'),
+            'answer': None if generating else ai_result['answer'],
+            'generating': generating
+        }
+
+        if generating:
+            cached = await self.search_service.get_generated_answer_async(question_data.question, category)
+            if cached is not None:
+                # A paraphrase was answered before; send it as a single token
+                yield 'token', {'text': cached}
+                ai_result = {**ai_result, 'answer': cached, 'llm_generated': True}
+            else:
+                tokens = []
+                started = time.perf_counter()
+                try:
+                    async for token in self.llm_client.stream(
+                            build_prompt(question_data.question, ai_result.get('related_faqs'))
+                    ):
+                        tokens.append(token)
+                        yield 'token', {'text': token}
+                except LLMUnavailableError as e:
+                    logger.warning(f"LLM streaming fallback skipped: {e}")
+                else:
+                    answer = ''.join(tokens).strip()
+                    if answer:
+                        ai_result = {**ai_result, 'answer': answer, 'llm_generated': True}
+                        await self._cache_generated_answer(
+                            question_data.question, ai_result, category, time.perf_counter() - started
+                        )
+
+        try:
+            ticket = await run_db(
+                self.db,
+                self._create_ticket,
+                user_id=user_id,
+                question_data=question_data,
+                answer=ai_result['answer'],
+                confidence=ai_result['confidence']
+            )
+        except Exception as e:
+            logger.error(f"Error in AI processing: {e}")
+            response = await run_db(self.db, self._fallback_process_question, user_id, question_data)
+            yield 'done', response.model_dump()
+            return
+        yield 'done', self._ai_response(ticket.id, ai_result, datetime.now(timezone.utc).isoformat()).model_dump()
+
+    @staticmethod
+    def _ai_response(ticket_id: str, ai_result: Dict[str, Any], created_at: str) -> AskResponse:
+        return AskResponse(
+            ticket_id=ticket_id,
+            answer=ai_result['answer'],
+            confidence_score=ai_result['confidence'],
+            source='ai_enhanced',
+            created_at=created_at,
+            metadata={
+                'ai_source': ai_result['source'],
+                'needs_human_support': ai_result.get('needs_human_support', False),
+                'category': ai_result.get('category'),
+                'faq_id': ai_result.get('faq_id'),
+                'llm_generated': ai_result.get('llm_generated', False)
+            }
+        )
+
+    async def _with_generated_answer(
+            self,
+            question: str,
+            ai_result: Dict[str, Any],
+            category: Optional[str] = None,
+            deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Swap the canned low-confidence reply for an LLM-generated one when the
+        fallback is enabled, reusing the answer generated for a near-duplicate
+        question if there is one. Confidence is kept, so the ticket still goes
+        to a human; on any LLM failure the search result is returned unchanged.
+        """
+        if self.llm_client is None or ai_result.get('source') not in LLM_FALLBACK_SOURCES:
+            return ai_result
+
+        cached = await self.search_service.get_generated_answer_async(question, category)
+        if cached is not None:
+            return {**ai_result, 'answer': cached, 'llm_generated': True}
+
+        started = time.perf_counter()
+        try:
+            answer = await self.llm_client.generate(
+                build_prompt(question, ai_result.get('related_faqs')),
+                deadline=deadline
+            )
+        except LLMUnavailableError as e:
+            logger.warning(f"LLM fallback skipped: {e}")
+            return ai_result
+
+        ai_result = {**ai_result, 'answer': answer, 'llm_generated': True}
+        await self._cache_generated_answer(question, ai_result, category, time.perf_counter() - started)
+        return ai_result
+
+    async def _cache_generated_answer(
+            self,
+            question: str,
+            ai_result: Dict[str, Any],
+            category: Optional[str],
+            generation_seconds: float
+    ):
+        """Keep a generated answer for paraphrases; it is dropped when FAQs of its prompt's categories change"""
+        await self.search_service.store_generated_answer_async(
+            question,
+            ai_result['answer'],
+            category=category,
+            source_categories=[faq.get('category') for faq in ai_result.get('related_faqs') or []],
+            generation_seconds=generation_seconds
+        )
+
+    @staticmethod
+    def _search_category(question_data: AskQuestion) -> Optional[str]:
+        """Category to scope the FAQ search to; the GENERAL default means the whole corpus"""
+        if 'category' not in question_data.model_fields_set or question_data.category is None:
+            return None
+        if question_data.category == QuestionCategory.GENERAL:
+            return None
+        return question_data.category.value
+
+    def _fallback_process_question(self, db: Session, user_id: str, question_data: AskQuestion) -> AskResponse:
+        """Create an open ticket for human support when AI processing is unavailable"""
+        ticket = self._create_ticket(
+            db,
+            user_id=user_id,
+            question_data=question_data,
+            answer=None,
+            confidence=0.0
+        )
+
+        return AskResponse(
+            ticket_id=ticket.id,
+            answer=None,
+            confidence_score=0.0,
+            source='human',
+            created_at=datetime.now(timezone.utc).isoformat()
+        )
+
+    def _create_ticket(self, db: Session, user_id: str, question_data: AskQuestion, answer: str, confidence: float):
         """Create ticket with AI-generated response"""
+        from app.db.models.ticket import TicketStatus
+
+        ticket_data = self._ticket_data(user_id, question_data, answer, confidence)
+        ticket = ticket_crud.create(db, obj_in=ticket_data)
+
+        if ticket_data.status == TicketStatus.RESOLVED:
+            ticket_crud.mark_resolved(db, ticket_id=ticket.id)
+
+        return ticket
+
+    def _create_tickets(
+            self,
+            db: Session,
+            user_id: str,
+            questions: List[AskQuestion],
+            answers: List[Optional[str]],
+            confidences: List[float]
+    ) -> List[str]:
+        """Create one ticket per question in a single bulk insert and return their ids"""
+        return ticket_crud.create_multi(
+            db,
+            objs_in=[
+                self._ticket_data(user_id, question_data, answer, confidence)
+                for question_data, answer, confidence in zip(questions, answers, confidences)
+            ]
+        )
+
+    @staticmethod
+    def _ticket_data(user_id: str, question_data: AskQuestion, answer: Optional[str], confidence: float) -> TicketCreate:
+        """Ticket fields, with status and priority derived from the answer confidence"""
         from app.db.models.ticket import TicketPriority, TicketStatus
 
         # Determine status and priority based on confidence
@@ -64,7 +331,7 @@ class TicketService:
             status = TicketStatus.OPEN
             priority = TicketPriority.HIGH
 
-        ticket_data = TicketCreate(
+        return TicketCreate(
             user_id=user_id,
             subject=question_data.subject,
             question=question_data.question,
@@ -73,10 +340,3 @@ class TicketService:
             priority=priority,
             confidence_score=confidence
         )
-
-        ticket = ticket_crud.create(self.db, obj_in=ticket_data)
-
-        if status == TicketStatus.RESOLVED:
-            ticket_crud.mark_resolved(self.db, ticket_id=ticket.id)
-
-        return ticket
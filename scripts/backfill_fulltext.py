@@ -0,0 +1,38 @@
+"""
+Create the FAQ and ticket full-text indexes on an existing database and fill
+them from the rows already there. New databases get them from create_all and
+init_db adds them on startup, so this is for doing it ahead of a deploy, or
+for --rebuild after bulk loads that bypassed the triggers or a VACUUM
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.db import fulltext
+from app.db.base import engine
+
+
+def backfill(rebuild: bool):
+    with engine.begin() as connection:
+        report = fulltext.install(connection, rebuild=rebuild)
+    if report["backfilled"]:
+        print(f"Indexed {', '.join(report['backfilled'])} with the {report['backend']} backend "
+              f"in {report['seconds']}s")
+    else:
+        print(f"Full-text indexes ({report['backend']}) already in place; pass --rebuild to re-index")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and backfill the FAQ/ticket full-text indexes")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-index every table, not only indexes created by this run")
+    args = parser.parse_args()
+
+    print(f"Database: {settings.DATABASE_URL}")
+    backfill(args.rebuild)
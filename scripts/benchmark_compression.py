@@ -0,0 +1,159 @@
+"""
+Recall, score error, latency and size of the embedding compression options
+(FAISS_VECTOR_CODEC and FAISS_PCA_DIM) against exact float32 search
+Uses synthetic clustered unit vectors with a decaying spectrum, like sentence embeddings
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ai.index_factory import (
+    create_index, index_params_from_settings, resolve_params, sample_rows, train_index, training_sample_size
+)
+from app.ai.vector_transform import PCA_TRAINING_ROWS, PCATransform
+from benchmark_index_types import DIMENSION, measure, recall_at_k, synthetic_corpus
+
+
+def embedding_like_corpus(num_vectors: int, num_queries: int, decay: float = 0.5, seed: int = 0):
+    """
+    Clustered corpus whose per-dimension variance falls off as i**-decay.
+    Sentence-transformer embeddings concentrate most of their variance in
+    a minority of directions; isotropic data would make PCA look useless.
+    """
+    corpus, queries = synthetic_corpus(num_vectors, num_queries, seed=seed)
+    rotation, _ = np.linalg.qr(np.random.default_rng(seed + 1).standard_normal((DIMENSION, DIMENSION)))
+    scale = (np.arange(1, DIMENSION + 1, dtype='float32') ** -decay)
+    for vectors in (corpus, queries):
+        for start in range(0, len(vectors), 100000):
+            block = vectors[start:start + 100000] * scale
+            vectors[start:start + 100000] = block @ rotation.T.astype('float32')
+        faiss.normalize_L2(vectors)
+    return corpus, queries
+
+
+def configurations(pca_dims):
+    """(label, index params) to benchmark; all use the flat index so only storage varies"""
+    defaults = {**index_params_from_settings(), "index_type": "flat", "pca_dim": 0}
+    configs = [
+        ("float32", {**defaults, "vector_codec": "float32"}),
+        ("float16", {**defaults, "vector_codec": "float16"}),
+        ("sq8", {**defaults, "vector_codec": "sq8"}),
+        ("pq48x8", {**defaults, "vector_codec": "pq", "pq_m": 48, "pq_nbits": 8}),
+    ]
+    for pca_dim in pca_dims:
+        configs += [
+            (f"pca{pca_dim}", {**defaults, "vector_codec": "float32", "pca_dim": pca_dim}),
+            (f"pca{pca_dim}+sq8", {**defaults, "vector_codec": "sq8", "pca_dim": pca_dim}),
+        ]
+    return configs
+
+
+def run(sizes, num_queries: int, k: int, pca_dims, only=None):
+    rows = []
+    for size in sizes:
+        print(f"Corpus of {size} vectors")
+        corpus, queries = embedding_like_corpus(size, num_queries)
+        ids = np.arange(size, dtype='int64')
+
+        exact = faiss.IndexFlatIP(DIMENSION)
+        exact.add(corpus)
+        truth_scores, truth = exact.search(queries, k)
+        del exact
+
+        for label, params in configurations(pca_dims):
+            if only and label not in only:
+                continue
+            params = resolve_params(params, size, DIMENSION)
+            started = time.perf_counter()
+
+            transform = None
+            explained = 1.0
+            if params["pca_dim"]:
+                transform = PCATransform.fit(sample_rows(corpus, PCA_TRAINING_ROWS), params["pca_dim"])
+                explained = transform.explained_variance
+            project = transform.apply if transform is not None else np.ascontiguousarray
+
+            index = create_index(params["pca_dim"] or DIMENSION, params)
+            sample_size = training_sample_size(params, size)
+            if sample_size:
+                train_index(index, project(sample_rows(corpus, sample_size)))
+            for start in range(0, size, 100000):
+                index.add_with_ids(project(corpus[start:start + 100000]), ids[start:start + 100000])
+            build_seconds = time.perf_counter() - started
+
+            projected_queries = project(queries)
+            found, latency = measure(index, projected_queries, k)
+            top_scores, _ = index.search(projected_queries, 1)
+            bytes_per_vector = faiss.serialize_index(index).nbytes / size
+            if transform is not None:
+                bytes_per_vector += transform.components.nbytes / size
+
+            row = {
+                "size": size,
+                "option": label,
+                "dim": params["pca_dim"] or DIMENSION,
+                "variance": explained,
+                "recall@1": recall_at_k(found, truth, 1),
+                f"recall@{k}": recall_at_k(found, truth, k),
+                "top1_score_err": float(np.mean(np.abs(top_scores[:, 0] - truth_scores[:, 0]))),
+                "p50_ms": latency["p50_ms"],
+                "p99_ms": latency["p99_ms"],
+                "bytes_per_vector": bytes_per_vector,
+                "build_s": build_seconds,
+            }
+            rows.append(row)
+            print(f"   {label:12s} recall@1={row['recall@1']:.3f} recall@{k}={row[f'recall@{k}']:.3f} "
+                  f"score_err={row['top1_score_err']:.4f} p50={row['p50_ms']:.3f}ms "
+                  f"bytes/vec={row['bytes_per_vector']:.0f}")
+            del index
+    return rows
+
+
+def write_report(rows, path: Path, num_queries: int, k: int):
+    header = ["size", "option", "dim", "variance", "recall@1", f"recall@{k}", "top1_score_err",
+              "p50_ms", "p99_ms", "bytes_per_vector", "build_s"]
+    lines = [
+        "# Embedding compression: recall vs size and latency",
+        "",
+        f"Generated by `scripts/benchmark_compression.py` on {datetime.now():%Y-%m-%d}.",
+        f"{DIMENSION}-d clustered synthetic unit vectors with a decaying spectrum, {num_queries} queries, "
+        f"flat inner-product index, single-query latency with {faiss.omp_get_max_threads()} FAISS thread(s). "
+        "Recall and `top1_score_err` (mean absolute difference of the best score, which is what the "
+        "confidence threshold sees) are measured against exact float32 search on the full vectors. "
+        "`variance` is the share kept by PCA; `bytes_per_vector` includes the PCA matrix.",
+        "",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        cells = []
+        for key in header:
+            value = row[key]
+            cells.append(f"{value:.3f}" if isinstance(value, float) else str(value))
+        lines.append("| " + " | ".join(cells) + " |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark embedding compression options on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--pca-dims", type=int, nargs="+", default=[128, 192])
+    parser.add_argument("--only", nargs="*", help="Restrict to these options (e.g. sq8 pca128)")
+    parser.add_argument("--report", type=Path, default=project_root / "scripts" / "reports" / "compression.md")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.queries, args.k, args.pca_dims, args.only)
+    write_report(results, args.report, args.queries, args.k)
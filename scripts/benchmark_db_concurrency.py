@@ -0,0 +1,254 @@
+"""
+Requests/sec of a DB-bound endpoint at increasing client concurrency
+Starts uvicorn against a seeded SQLite file once per mode and drives
+GET /api/v1/tickets/ (JWT lookup of the user + ticket listing) with
+concurrent keep-alive clients:
+
+    python scripts/benchmark_db_concurrency.py --concurrency 50 100 250 500
+
+Modes are 'threadpool' (DB_ASYNC=false) and 'async' (DB_ASYNC=true). Pass
+--baseline-dir with a checkout of an older tree (git worktree) to measure it
+as the 'baseline' mode with the same database and load. --db-latency-ms
+delays every statement inside the thread that executes it, which stands in
+for the round trip to a database server that a local SQLite file lacks.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+ENDPOINT = "/api/v1/tickets/?limit=20"
+
+# Runs in the app directory; sqlite3.connect is wrapped before the app creates its engines
+SERVER = """
+import sqlite3, sqlite3.dbapi2, sys, time
+import uvicorn
+
+latency = float(sys.argv[2]) / 1000
+
+
+class DelayedCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        time.sleep(latency)
+        return super().execute(*args)
+
+
+class DelayedConnection(sqlite3.Connection):
+    def cursor(self, factory=DelayedCursor):
+        return super().cursor(factory)
+
+
+if latency:
+    # pysqlite connects through sqlite3.dbapi2, aiosqlite through sqlite3
+    connect = sqlite3.connect
+    sqlite3.connect = sqlite3.dbapi2.connect = (
+        lambda *args, **kwargs: connect(*args, factory=DelayedConnection, **kwargs)
+    )
+uvicorn.run("app.main:app", host="127.0.0.1", port=int(sys.argv[1]), log_level="warning",
+            access_log=False, backlog=4096)
+"""
+
+
+def seed_database(db_path: Path, num_tickets: int) -> str:
+    """Create the schema with one user owning ``num_tickets`` tickets; returns an access token for them"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DEBUG"] = "false"
+    from app.core.security import create_access_token
+    from app.db.base import Base, SessionLocal, engine
+    from app.db.models.ticket import Ticket
+    from app.db.models.user import User
+    import app.db.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        # The hash is never checked: requests authenticate with a minted token
+        user = User(email="bench@example.com", hashed_password="-", full_name="Benchmark")
+        db.add(user)
+        db.flush()
+        db.add_all(
+            Ticket(user_id=user.id, subject=f"Ticket {i}", question=f"Benchmark question number {i}")
+            for i in range(num_tickets)
+        )
+        db.commit()
+        return create_access_token(user.id)
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app_dir: Path, db_path: Path, port: int, db_async: bool, db_latency_ms: float) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        DB_ASYNC="true" if db_async else "false",
+        DEBUG="false",
+        AI_WARMUP_ON_STARTUP="false",
+        FAISS_SNAPSHOT_INTERVAL_SECONDS="0",
+    )
+    env.pop("PYTHONPATH", None)
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER, str(port), str(db_latency_ms)],
+        cwd=app_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"uvicorn did not start in {app_dir}")
+
+
+async def fetch(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: bytes) -> int:
+    """One keep-alive GET; returns the status code"""
+    writer.write(request)
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def drive(host: str, port: int, token: str, concurrency: int, duration: float, warmup: float):
+    """
+    Keep ``concurrency`` requests in flight for ``duration`` seconds after a
+    warm-up. Each client owns one keep-alive connection and speaks minimal
+    HTTP/1.1 itself: a pooled HTTP client library costs more CPU per request
+    than the endpoint and would share the cores with the server.
+    """
+    request = (f"GET {ENDPOINT} HTTP/1.1\r\nHost: {host}\r\n"
+               f"Authorization: Bearer {token}\r\n\r\n").encode()
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def client():
+        nonlocal errors
+        connection = None
+        while True:
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                break
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(host, port)
+                ok = await fetch(*connection, request) == 200
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                ok = False
+                if connection is not None:
+                    connection[1].close()
+                connection = None
+            if sent >= measure_from:
+                if ok:
+                    latencies.append(time.perf_counter() - sent)
+                else:
+                    errors += 1
+        if connection is not None:
+            connection[1].close()
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests_per_s": len(latencies) / duration,
+        "p50_ms": 1000 * statistics.median(latencies) if latencies else 0.0,
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))] if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def run(modes, concurrency_levels, db_latencies, duration: float, warmup: float, num_tickets: int):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        token = seed_database(db_path, num_tickets)
+        for db_latency_ms, (mode, app_dir, db_async) in itertools.product(db_latencies, modes):
+            port = free_port()
+            server = start_server(app_dir, db_path, port, db_async, db_latency_ms)
+            try:
+                print(f"{mode}, {db_latency_ms:g} ms per statement:")
+                for concurrency in concurrency_levels:
+                    result = asyncio.run(drive("127.0.0.1", port, token, concurrency, duration, warmup))
+                    rows.append({"db_latency_ms": db_latency_ms, "mode": mode, "concurrency": concurrency, **result})
+                    print(f"   {concurrency:4d} clients {result['requests_per_s']:8.1f} req/s  "
+                          f"p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  "
+                          f"errors {result['errors']}")
+            finally:
+                server.terminate()
+                try:
+                    server.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+    return rows
+
+
+def write_report(rows, path: Path, duration: float, num_tickets: int):
+    header = ["db_latency_ms", "mode", "concurrency", "requests_per_s", "p50_ms", "p99_ms", "errors"]
+    lines = [
+        "# Database access under concurrent load",
+        "",
+        f"Generated by `scripts/benchmark_db_concurrency.py` on {datetime.now():%Y-%m-%d}.",
+        f"One uvicorn worker serving `GET {ENDPOINT}` from SQLite ({num_tickets} tickets of the "
+        f"requesting user), {duration:g}s per level after warm-up. Client and server share the machine. "
+        "`db_latency_ms` is the emulated database round trip added to every statement.",
+        "",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(
+            f"{row[key]:.1f}" if isinstance(row[key], float) else str(row[key]) for key in header
+        ) + " |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DB-bound request throughput per DB access mode")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--db-latency-ms", type=float, nargs="+", default=[0.0, 5.0],
+                        help="Emulated database round trip per statement (0 is plain local SQLite)")
+    parser.add_argument("--modes", nargs="+", default=["threadpool", "async"], choices=["threadpool", "async"])
+    parser.add_argument("--baseline-dir", type=Path, default=None,
+                        help="Checkout of the tree to compare against, measured first as 'baseline'")
+    parser.add_argument("--report", type=Path, default=project_root / "scripts" / "reports" / "db_concurrency.md")
+    args = parser.parse_args()
+
+    selected = [(mode, project_root, mode == "async") for mode in args.modes]
+    if args.baseline_dir:
+        selected.insert(0, ("baseline", args.baseline_dir, False))
+    results = run(selected, args.concurrency, args.db_latency_ms, args.duration, args.warmup, args.tickets)
+    write_report(results, args.report, args.duration, args.tickets)
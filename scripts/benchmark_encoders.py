@@ -0,0 +1,170 @@
+"""
+Parity and latency comparison of the encoder backends (torch, onnx, onnx int8)
+Parity is cosine agreement with the torch embeddings on the FAQ set and a query set
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ai.artifacts import ArtifactPaths
+from app.ai.encoder import load_encoder, onnx_model_path
+from app.ai.inference import encode_normalized
+from app.ai.metadata_store import faq_text
+
+DEFAULT_QUERIES = [
+    "I forgot my password",
+    "how can i change my password",
+    "How do I contact support?",
+    "what are your opening hours",
+    "Cancel my subscription",
+    "I want a refund for my last order",
+    "Is my data safe with you?",
+    "my payment was declined",
+    "how do I update my billing address",
+    "can I talk to a human",
+    "where is my order",
+    "delete my account",
+    "the app keeps crashing on login",
+    "do you offer discounts for students",
+    "how long does shipping take",
+    "change the email on my account",
+]
+
+
+def load_texts(data_dir: Path, queries_file: Path = None):
+    with open(ArtifactPaths(data_dir).metadata_path, 'r') as f:
+        faqs = [faq_text(record) for record in json.load(f)]
+    if queries_file:
+        queries = [line.strip() for line in queries_file.read_text().splitlines() if line.strip()]
+    else:
+        queries = DEFAULT_QUERIES
+    return faqs, queries
+
+
+def backends(model_dir: Path):
+    """(label, loader) for every backend whose artifacts exist"""
+    found = [("torch", lambda: load_encoder(model_dir, backend="torch"))]
+    if onnx_model_path(model_dir).exists():
+        found.append(("onnx", lambda: load_encoder(model_dir, backend="onnx", quantized=False)))
+    if onnx_model_path(model_dir, quantized=True).exists():
+        found.append(("onnx_int8", lambda: load_encoder(model_dir, backend="onnx", quantized=True)))
+    return found
+
+
+def parity(reference: np.ndarray, candidate: np.ndarray):
+    cosines = np.sum(reference * candidate, axis=1)
+    return {"mean_cos": float(cosines.mean()), "min_cos": float(cosines.min()), "p1_cos": float(np.percentile(cosines, 1))}
+
+
+def top1_agreement(faq_ref, faq_cand, query_ref, query_cand) -> float:
+    """Share of queries whose best FAQ is the same under both backends"""
+    ref_best = np.argmax(query_ref @ faq_ref.T, axis=1)
+    cand_best = np.argmax(query_cand @ faq_cand.T, axis=1)
+    return float(np.mean(ref_best == cand_best))
+
+
+def latency(model, queries, runs: int, batch_size: int):
+    # Warm up allocations and kernels first
+    encode_normalized(model, queries[:batch_size], batch_size)
+
+    single = []
+    for i in range(runs):
+        started = time.perf_counter()
+        encode_normalized(model, [queries[i % len(queries)]], 1)
+        single.append((time.perf_counter() - started) * 1000.0)
+    single.sort()
+
+    batch = [queries[i % len(queries)] for i in range(batch_size * 8)]
+    started = time.perf_counter()
+    encode_normalized(model, batch, batch_size)
+    throughput = len(batch) / (time.perf_counter() - started)
+    return {
+        "p50_ms": single[len(single) // 2],
+        "p99_ms": single[int(0.99 * (len(single) - 1))],
+        "texts_per_s": throughput,
+    }
+
+
+def run(model_dir: Path, data_dir: Path, queries_file: Path, runs: int, batch_size: int):
+    faqs, queries = load_texts(data_dir, queries_file)
+    print(f"{len(faqs)} FAQs, {len(queries)} queries")
+
+    rows = []
+    reference = None
+    for label, loader in backends(model_dir):
+        started = time.perf_counter()
+        model = loader()
+        load_seconds = time.perf_counter() - started
+
+        faq_vectors = encode_normalized(model, faqs, batch_size)
+        query_vectors = encode_normalized(model, queries, batch_size)
+        row = {"backend": label, "load_s": load_seconds, **latency(model, queries, runs, batch_size)}
+
+        if reference is None:
+            reference = (faq_vectors, query_vectors)
+        else:
+            faq_parity = parity(reference[0], faq_vectors)
+            query_parity = parity(reference[1], query_vectors)
+            row.update({
+                "faq_mean_cos": faq_parity["mean_cos"],
+                "faq_min_cos": faq_parity["min_cos"],
+                "query_mean_cos": query_parity["mean_cos"],
+                "query_min_cos": query_parity["min_cos"],
+                "top1_agreement": top1_agreement(reference[0], faq_vectors, reference[1], query_vectors),
+            })
+        rows.append(row)
+        print(f"   {label:10s} p50={row['p50_ms']:.2f}ms p99={row['p99_ms']:.2f}ms "
+              f"{row['texts_per_s']:.0f} texts/s"
+              + (f" faq_cos={row['faq_mean_cos']:.4f} query_cos={row['query_mean_cos']:.4f} "
+                 f"top1={row['top1_agreement']:.3f}" if "faq_mean_cos" in row else ""))
+        del model
+    return rows
+
+
+def write_report(rows, path: Path, runs: int, batch_size: int):
+    header = ["backend", "load_s", "p50_ms", "p99_ms", "texts_per_s",
+              "faq_mean_cos", "faq_min_cos", "query_mean_cos", "query_min_cos", "top1_agreement"]
+    lines = [
+        "# Encoder backends: parity and latency",
+        "",
+        f"Generated by `scripts/benchmark_encoders.py` on {datetime.now():%Y-%m-%d}.",
+        f"Single-query latency over {runs} runs; throughput at batch size {batch_size}. "
+        "Cosines compare each backend with the torch embeddings of the same texts.",
+        "",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        cells = []
+        for key in header:
+            value = row.get(key, "-")
+            cells.append(f"{value:.4f}" if isinstance(value, float) else str(value))
+        lines.append("| " + " | ".join(cells) + " |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    default_dir = project_root / "app" / "data"
+
+    parser = argparse.ArgumentParser(description="Compare torch and ONNX encoder backends")
+    parser.add_argument("--data-dir", type=Path, default=default_dir)
+    parser.add_argument("--model-dir", type=Path, default=ArtifactPaths(default_dir).model_dir)
+    parser.add_argument("--queries", type=Path, default=None, help="File with one query per line")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--report", type=Path, default=project_root / "scripts" / "reports" / "encoder_backends.md")
+    args = parser.parse_args()
+
+    results = run(args.model_dir, args.data_dir, args.queries, args.runs, args.batch_size)
+    write_report(results, args.report, args.runs, args.batch_size)
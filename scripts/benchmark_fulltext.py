@@ -0,0 +1,201 @@
+"""
+Ticket search latency of the LIKE scan vs the SQLite FTS5 index
+Seeds a SQLite file with --tickets tickets of generated support text (1M by
+default, kept for reuse with --db) and times CRUDTicket.search_hits with each
+backend for rare, common, multi-word and unmatched queries:
+
+    python scripts/benchmark_fulltext.py --db /tmp/tickets_fts.db
+
+LIKE '%term%' cannot use an index, so every query reads all subjects,
+questions and answers; FTS5 looks the terms up in its inverted index and
+ranks the matches by BM25, all of them or (fts5_capped) only the newest
+--max-candidates, to show what FULLTEXT_MAX_CANDIDATES buys.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+SEED_BATCH = 50_000
+
+TOPICS = [
+    ("password", "reset", "login", "account", "locked", "email", "link", "expired"),
+    ("refund", "charge", "duplicate", "invoice", "billing", "card", "payment", "declined"),
+    ("subscription", "cancel", "upgrade", "plan", "renewal", "trial", "downgrade", "pricing"),
+    ("shipping", "delivery", "tracking", "package", "address", "delayed", "courier", "warehouse"),
+    ("export", "report", "dashboard", "chart", "filter", "spreadsheet", "download", "format"),
+    ("integration", "webhook", "token", "timeout", "endpoint", "error", "sync", "permissions"),
+]
+FILLER = ("please", "help", "since", "yesterday", "again", "still", "cannot", "when", "after", "trying",
+          "the", "my", "our", "team", "customer", "urgent", "thanks", "issue", "problem", "works")
+RARE = ("chargeback", "gdpr", "sso", "saml", "ldap", "chromebook")
+
+QUERIES = {
+    "rare term": "chargeback",
+    "common term": "password",
+    "two terms": "refund duplicate",
+    "no match": "kerberos",
+}
+
+
+def ticket_text(rng: random.Random):
+    topic = rng.choice(TOPICS)
+    words = [rng.choice(topic if rng.random() < 0.4 else FILLER) for _ in range(rng.randint(12, 40))]
+    if rng.random() < 0.001:
+        words.insert(rng.randrange(len(words)), rng.choice(RARE))
+    subject = " ".join(rng.sample(topic, 3)).capitalize()
+    answer = " ".join(rng.choice(topic + FILLER) for _ in range(20)) if rng.random() < 0.5 else None
+    return subject, " ".join(words), answer
+
+
+def seed_database(num_tickets: int, num_users: int):
+    """Bulk insert generated tickets; the FTS triggers index them as they go"""
+    from sqlalchemy import func, insert, select
+    from app.db.base import Base, engine
+    from app.db.models.ticket import Ticket, TicketPriority, TicketStatus
+    from app.db.models.user import User
+    import app.db.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(Ticket)).scalar()
+        if existing >= num_tickets:
+            print(f"Reusing {existing} seeded tickets")
+            return
+        if existing:
+            raise SystemExit("Database holds fewer tickets than requested; pass a fresh --db")
+
+        rng = random.Random(0)
+        now = datetime(2024, 1, 1)
+        user_ids = [str(uuid.uuid4()) for _ in range(num_users)]
+        connection.execute(insert(User), [
+            {"id": user_id, "email": f"user{i}@example.com", "hashed_password": "-",
+             "created_at": now, "updated_at": now}
+            for i, user_id in enumerate(user_ids)
+        ])
+        started = time.perf_counter()
+        for offset in range(0, num_tickets, SEED_BATCH):
+            rows = []
+            for i in range(offset, min(offset + SEED_BATCH, num_tickets)):
+                subject, question, answer = ticket_text(rng)
+                created_at = now + timedelta(seconds=i)
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": rng.choice(user_ids),
+                    "subject": subject,
+                    "question": question,
+                    "answer": answer,
+                    "status": TicketStatus.OPEN,
+                    "priority": TicketPriority.MEDIUM,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+            connection.execute(insert(Ticket), rows)
+            print(f"   {offset + len(rows)}/{num_tickets} tickets seeded", end="\r", flush=True)
+        print(f"\nSeeded and indexed {num_tickets} tickets in {time.perf_counter() - started:.1f}s")
+
+
+def timed(fn, repeats: int) -> float:
+    """Median milliseconds of ``fn()`` over ``repeats`` runs"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def variants(backends, max_candidates: int):
+    """(column, backend, FULLTEXT_MAX_CANDIDATES) per timed configuration"""
+    result = [(backend, backend, 0) for backend in backends]
+    if "fts5" in backends and max_candidates > 0:
+        result.append(("fts5_capped", "fts5", max_candidates))
+    return result
+
+
+def run(backends, max_candidates: int, limit: int, repeats: int):
+    from app.core.config import settings
+    from app.crud.ticket import ticket as ticket_crud
+    from app.db.models.user import User
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).order_by(User.id).first()[0]
+        rows = []
+        for label, query in QUERIES.items():
+            for scope, scope_user in (("all", None), ("one user", user_id)):
+                row = {"query": f"{label} ({query})", "scope": scope}
+                for column, backend, cap in variants(backends, max_candidates):
+                    settings.FULLTEXT_BACKEND = backend
+                    settings.FULLTEXT_MAX_CANDIDATES = cap
+                    search = lambda: ticket_crud.search_hits(db, query=query, user_id=scope_user, limit=limit)
+                    row[f"{column}_hits"] = len(search())
+                    row[f"{column}_ms"] = timed(search, repeats)
+                    db.commit()
+                rows.append(row)
+                print("   " + "  ".join(f"{key} {value:.2f}" if isinstance(value, float) else f"{key} {value}"
+                                        for key, value in row.items()))
+        return rows
+    finally:
+        db.close()
+
+
+def write_report(rows, backends, max_candidates: int, path: Path, num_tickets: int, limit: int, repeats: int):
+    columns = [column for column, _, _ in variants(backends, max_candidates)]
+    header = ["query", "scope"] + [f"{column}_{key}" for column in columns for key in ("ms", "hits")]
+    capped = (
+        f" `fts5_capped` sets FULLTEXT_MAX_CANDIDATES={max_candidates}: only the newest {max_candidates} "
+        "matches are ranked, so an older, more relevant ticket can be missed."
+    ) if "fts5_capped" in columns else ""
+    lines = [
+        "# Ticket full-text search: LIKE vs FTS5",
+        "",
+        f"Generated by `scripts/benchmark_fulltext.py` on {datetime.now():%Y-%m-%d}.",
+        f"SQLite with {num_tickets} generated tickets; median of {repeats} calls of "
+        f"`CRUDTicket.search_hits(limit={limit})` per backend, through the CRUD layer. `hits` is the page "
+        "size returned. LIKE matches the query as one substring and orders by recency; FTS5 matches every "
+        "word (stemmed) and orders all matches by BM25 (the default)." + capped,
+        "",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(
+            f"{row[key]:.2f}" if isinstance(row[key], float) else str(row[key]) for key in header
+        ) + " |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LIKE vs FTS5 ticket search")
+    parser.add_argument("--db", type=Path, default=None,
+                        help="SQLite file to seed or reuse (defaults to a temporary file)")
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=4, help="Owners the tickets are spread over")
+    parser.add_argument("--backends", nargs="+", default=["like", "fts5"], choices=["like", "fts5"])
+    parser.add_argument("--max-candidates", type=int, default=2000,
+                        help="Also time fts5 with FULLTEXT_MAX_CANDIDATES set to this (0 skips it)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--report", type=Path, default=project_root / "scripts" / "reports" / "fulltext_search.md")
+    args = parser.parse_args()
+
+    db_path = args.db or Path(tempfile.mkdtemp()) / "fulltext.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DEBUG"] = "false"
+    seed_database(args.tickets, args.users)
+    results = run(args.backends, args.max_candidates, args.limit, args.repeats)
+    write_report(results, args.backends, args.max_candidates, args.report, args.tickets, args.limit, args.repeats)
@@ -0,0 +1,173 @@
+"""
+Recall@k vs latency benchmark for the FAISS index types in app.ai.index_factory
+Uses synthetic clustered, unit-normalized corpora so no model is needed
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ai.index_factory import (
+    apply_search_params, create_index, index_params_from_settings, resolve_params,
+    sample_rows, train_index, training_sample_size
+)
+
+DIMENSION = 384
+
+
+def synthetic_corpus(num_vectors: int, num_queries: int, dimension: int = DIMENSION, seed: int = 0):
+    """Clustered unit vectors; queries are noisy copies of corpus points, like paraphrased FAQs"""
+    rng = np.random.default_rng(seed)
+    num_clusters = max(10, num_vectors // 100)
+    centers = rng.standard_normal((num_clusters, dimension)).astype('float32')
+
+    corpus = np.empty((num_vectors, dimension), dtype='float32')
+    for start in range(0, num_vectors, 100000):
+        end = min(start + 100000, num_vectors)
+        labels = rng.integers(0, num_clusters, end - start)
+        corpus[start:end] = centers[labels] + 0.6 * rng.standard_normal((end - start, dimension))
+    faiss.normalize_L2(corpus)
+
+    picks = rng.integers(0, num_vectors, num_queries)
+    queries = corpus[picks] + 0.05 * rng.standard_normal((num_queries, dimension)).astype('float32')
+    faiss.normalize_L2(queries)
+    return corpus, queries
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray, k: int) -> float:
+    hits = sum(len(set(f[:k]) & set(t[:k])) for f, t in zip(found, truth))
+    return hits / (len(truth) * k)
+
+
+def measure(index, queries: np.ndarray, k: int):
+    """Single-query latency (the /tickets/ask access pattern) plus the result ids"""
+    latencies = []
+    found = np.empty((len(queries), k), dtype='int64')
+    for i in range(len(queries)):
+        started = time.perf_counter()
+        _, ids = index.search(queries[i:i + 1], k)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        found[i] = ids[0]
+    latencies.sort()
+    return found, {
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+def configurations():
+    """(label, build params, list of search-param overrides) to benchmark"""
+    defaults = index_params_from_settings()
+    return [
+        ("flat", {**defaults, "index_type": "flat"}, [{}]),
+        ("ivf_flat", {**defaults, "index_type": "ivf_flat"},
+         [{"nprobe": n} for n in (1, 8, 16, 64)]),
+        ("hnsw", {**defaults, "index_type": "hnsw"},
+         [{"ef_search": ef} for ef in (16, 64, 256)]),
+        ("ivf_pq", {**defaults, "index_type": "ivf_pq"},
+         [{"nprobe": n} for n in (8, 16, 64)]),
+    ]
+
+
+def run(sizes, num_queries: int, k: int, only=None):
+    rows = []
+    for size in sizes:
+        print(f"Corpus of {size} vectors")
+        corpus, queries = synthetic_corpus(size, num_queries)
+        ids = np.arange(size, dtype='int64')
+
+        exact = faiss.IndexFlatIP(DIMENSION)
+        exact.add(corpus)
+        _, truth = exact.search(queries, k)
+        del exact
+
+        for label, params, search_overrides in configurations():
+            if only and label not in only:
+                continue
+            params = resolve_params(params, size, DIMENSION)
+            started = time.perf_counter()
+            index = create_index(DIMENSION, params)
+            sample_size = training_sample_size(params, size)
+            if sample_size:
+                train_index(index, sample_rows(corpus, sample_size))
+            index.add_with_ids(corpus, ids)
+            build_seconds = time.perf_counter() - started
+            index_mb = faiss.serialize_index(index).nbytes / (1024 * 1024)
+
+            for overrides in search_overrides:
+                apply_search_params(index, {**params, **overrides})
+                found, latency = measure(index, queries, k)
+                setting = ", ".join(f"{key}={value}" for key, value in overrides.items()) or "-"
+                row = {
+                    "size": size,
+                    "index": label,
+                    "build": _build_label(params),
+                    "search": setting,
+                    "recall@1": recall_at_k(found, truth, 1),
+                    f"recall@{k}": recall_at_k(found, truth, k),
+                    "p50_ms": latency["p50_ms"],
+                    "p99_ms": latency["p99_ms"],
+                    "build_s": build_seconds,
+                    "index_mb": index_mb,
+                }
+                rows.append(row)
+                print(f"   {label:9s} {setting:14s} recall@1={row['recall@1']:.3f} "
+                      f"recall@{k}={row[f'recall@{k}']:.3f} p50={row['p50_ms']:.3f}ms p99={row['p99_ms']:.3f}ms")
+            del index
+    return rows
+
+
+def _build_label(params) -> str:
+    index_type = params["index_type"]
+    if index_type == "ivf_flat":
+        return f"nlist={params['nlist']}"
+    if index_type == "hnsw":
+        return f"M={params['hnsw_m']}, efC={params['ef_construction']}"
+    if index_type == "ivf_pq":
+        return f"nlist={params['nlist']}, PQ{params['pq_m']}x{params['pq_nbits']}"
+    return "-"
+
+
+def write_report(rows, path: Path, num_queries: int, k: int):
+    header = ["size", "index", "build", "search", "recall@1", f"recall@{k}", "p50_ms", "p99_ms", "build_s", "index_mb"]
+    lines = [
+        "# FAISS index types: recall vs latency",
+        "",
+        f"Generated by `scripts/benchmark_index_types.py` on {datetime.now():%Y-%m-%d}.",
+        f"{DIMENSION}-d clustered synthetic unit vectors, {num_queries} queries, inner product, "
+        f"single-query latency with {faiss.omp_get_max_threads()} FAISS thread(s). "
+        "Recall is measured against the exact flat index.",
+        "",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        cells = []
+        for key in header:
+            value = row[key]
+            cells.append(f"{value:.3f}" if isinstance(value, float) else str(value))
+        lines.append("| " + " | ".join(cells) + " |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index types on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--only", nargs="*", help="Restrict to these index types")
+    parser.add_argument("--report", type=Path, default=project_root / "scripts" / "reports" / "index_types.md")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.queries, args.k, args.only)
+    write_report(results, args.report, args.queries, args.k)
@@ -0,0 +1,87 @@
+"""
+Latency of the pooled LLM client against the local stub server
+Compares the shared keep-alive pool with a new connection per call, and
+shows retries and the circuit breaker under injected upstream errors
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.llm_service import CircuitBreaker, LLMClient, LLMUnavailableError, build_prompt
+from llm_stub_server import start_stub_server
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))] if values else 0.0
+
+
+async def timed_calls(call, num_calls: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(build_prompt(f"Question number {i} about my order?"))
+                latencies.append((time.perf_counter() - started) * 1000.0)
+            except (LLMUnavailableError, httpx.HTTPError):
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(num_calls)))
+    return latencies, failures, time.perf_counter() - started
+
+
+async def run(args):
+    rows = []
+
+    _, stub, url = start_stub_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    client = LLMClient(url, max_concurrency=args.concurrency, budget_seconds=args.budget)
+    latencies, failures, elapsed = await timed_calls(client.generate, args.calls, args.concurrency)
+    rows.append(("pooled client", latencies, failures, elapsed, stub.connections))
+    await client.aclose()
+
+    _, stub, url = start_stub_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+
+    async def unpooled(prompt: str):
+        async with httpx.AsyncClient() as one_off:
+            response = await one_off.post(url, json={"inputs": prompt}, timeout=args.budget)
+            response.raise_for_status()
+
+    latencies, failures, elapsed = await timed_calls(unpooled, args.calls, args.concurrency)
+    rows.append(("client per call", latencies, failures, elapsed, stub.connections))
+
+    _, stub, url = start_stub_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    client = LLMClient(url, max_concurrency=args.concurrency, budget_seconds=args.budget,
+                       breaker=CircuitBreaker(failure_threshold=5, reset_seconds=1.0))
+    latencies, failures, elapsed = await timed_calls(client.generate, args.calls, args.concurrency)
+    rows.append((f"pooled, {args.error_rate:.0%} errors", latencies, failures, elapsed, stub.connections))
+    print(f"Client counters with injected errors: {client.stats()}")
+    await client.aclose()
+
+    print(f"{args.calls} calls, concurrency {args.concurrency}, stub latency {args.latency_ms}ms")
+    for label, latencies, failures, elapsed, connections in rows:
+        print(f"   {label:22s} p50={percentile(latencies, 0.5):7.1f}ms p99={percentile(latencies, 0.99):7.1f}ms "
+              f"failed={failures:3d} throughput={args.calls / elapsed:6.1f}/s connections={connections}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the LLM client against the local stub")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--budget", type=float, default=2.0, help="Per-call latency budget in seconds")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,145 @@
+"""
+Memory and lookup cost of the FAQ metadata representations
+Compares the JSON list of dicts, a dict-of-dicts keyed by FAISS id,
+the columnar MetadataStore and the memory-mapped compact file
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ai.compact_metadata import MmapMetadataStore, write_compact_metadata
+from app.ai.metadata_store import MetadataStore, faq_index_id
+
+CATEGORIES = ["account", "billing", "technical", "security", "shipping", "orders",
+              "returns", "payments", "privacy", "subscriptions", "mobile app", "general"]
+WORDS = ("account password reset billing invoice refund order shipping delivery subscription cancel "
+         "upgrade plan card payment declined login error app crash data export privacy security "
+         "address email phone support hours contact team update change delete").split()
+
+
+def synthetic_records(count: int, seed: int = 0):
+    """FAQ-shaped records: ~60 char questions, ~300 char answers, a few keywords"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "question": " ".join(rng.choices(WORDS, k=9)).capitalize() + "?",
+            "answer": " ".join(rng.choices(WORDS, k=45)).capitalize() + ".",
+            "category": rng.choice(CATEGORIES),
+            "keywords": ",".join(rng.choices(WORDS, k=4)),
+        }
+
+
+def load(kind: str, json_path: Path, compact_path: Path):
+    if kind == "json_list":
+        with open(json_path) as f:
+            return json.load(f)
+    if kind == "dict_of_dicts":
+        with open(json_path) as f:
+            return {faq_index_id(r["id"]): r for r in json.load(f)}
+    if kind == "columnar":
+        with open(json_path) as f:
+            return MetadataStore(json.load(f))
+    return MmapMetadataStore(compact_path)
+
+
+def lookup(kind: str, store, index_ids):
+    """Per-hit cost of getting a private, mutable copy of a record"""
+    started = time.perf_counter()
+    if kind == "json_list":
+        for row in range(len(index_ids)):
+            store[row].copy()
+    elif kind == "dict_of_dicts":
+        for index_id in index_ids:
+            store[index_id].copy()
+    else:
+        for index_id in index_ids:
+            store.get(index_id)
+    return (time.perf_counter() - started) / len(index_ids) * 1e6
+
+
+def measure(kind: str, json_path: Path, compact_path: Path, sample_ids):
+    gc.collect()
+    tracemalloc.start()
+    store = load(kind, json_path, compact_path)
+    gc.collect()
+    heap_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    lookup_us = lookup(kind, store, sample_ids)
+    del store
+    gc.collect()
+    return {
+        "heap_mb": heap_bytes / (1024 * 1024),
+        "load_peak_mb": peak_bytes / (1024 * 1024),
+        "lookup_us": lookup_us,
+    }
+
+
+def run(sizes, kinds):
+    rows = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / "faq_metadata.json"
+            compact_path = Path(tmp) / "faq_metadata.bin"
+            with open(json_path, "w") as f:
+                json.dump(list(synthetic_records(size)), f)
+            write_compact_metadata(compact_path, synthetic_records(size))
+
+            sample_ids = [faq_index_id(r["id"]) for r in synthetic_records(min(size, 10000))]
+            print(f"{size} FAQs ({json_path.stat().st_size / (1024 * 1024):.1f} MB of JSON)")
+            for kind in kinds:
+                result = measure(kind, json_path, compact_path, sample_ids)
+                row = {"size": size, "store": kind, **result,
+                       "file_mb": compact_path.stat().st_size / (1024 * 1024) if kind == "mmap" else 0.0}
+                rows.append(row)
+                print(f"   {kind:14s} heap={row['heap_mb']:.1f}MB peak={row['load_peak_mb']:.1f}MB "
+                      f"lookup={row['lookup_us']:.2f}us")
+    return rows
+
+
+def write_report(rows, path: Path):
+    header = ["size", "store", "heap_mb", "load_peak_mb", "file_mb", "lookup_us"]
+    lines = [
+        "# FAQ metadata stores: memory and lookup cost",
+        "",
+        f"Generated by `scripts/benchmark_metadata_store.py` on {datetime.now():%Y-%m-%d}.",
+        "Synthetic FAQs (UUID id, ~60 char question, ~300 char answer, 4 keywords, 12 categories). "
+        "`heap_mb` is the Python heap held by the store after loading (tracemalloc), `load_peak_mb` "
+        "the peak while loading, `file_mb` the mapped file shared through the page cache, and "
+        "`lookup_us` the cost of one private, mutable record per search hit.",
+        "",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        cells = []
+        for key in header:
+            value = row[key]
+            cells.append(f"{value:.2f}" if isinstance(value, float) else str(value))
+        lines.append("| " + " | ".join(cells) + " |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare FAQ metadata store memory use")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--stores", nargs="+", default=["json_list", "dict_of_dicts", "columnar", "mmap"])
+    parser.add_argument("--report", type=Path, default=project_root / "scripts" / "reports" / "metadata_store.md")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.stores)
+    write_report(results, args.report)
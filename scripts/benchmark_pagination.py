@@ -0,0 +1,188 @@
+"""
+Page latency of offset vs cursor (keyset) pagination over a large ticket table
+Seeds a SQLite file with --tickets tickets (1M by default, kept for reuse with
+--db) and times one page of each listing at increasing depths:
+
+    python scripts/benchmark_pagination.py --db /tmp/tickets_1m.db
+
+OFFSET makes the database walk and discard every skipped row, so its cost
+grows with the depth; a cursor seeks through the (…, created_at, id) index
+straight to the first row of the page.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+SEED_BATCH = 50_000
+
+
+def seed_database(num_tickets: int, num_users: int):
+    """Bulk insert ``num_tickets`` tickets spread over ``num_users`` users and the four statuses"""
+    from sqlalchemy import func, insert, select
+    from app.db.base import Base, engine
+    from app.db.models.ticket import Ticket, TicketPriority, TicketStatus
+    from app.db.models.user import User
+    import app.db.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(Ticket)).scalar()
+        if existing >= num_tickets:
+            print(f"Reusing {existing} seeded tickets")
+            return
+        if existing:
+            raise SystemExit("Database holds fewer tickets than requested; pass a fresh --db")
+
+        rng = random.Random(0)
+        now = datetime(2024, 1, 1)
+        user_ids = [str(uuid.uuid4()) for _ in range(num_users)]
+        connection.execute(insert(User), [
+            {"id": user_id, "email": f"user{i}@example.com", "hashed_password": "-",
+             "created_at": now, "updated_at": now}
+            for i, user_id in enumerate(user_ids)
+        ])
+        started = time.perf_counter()
+        statuses = list(TicketStatus)
+        for offset in range(0, num_tickets, SEED_BATCH):
+            rows = []
+            for i in range(offset, min(offset + SEED_BATCH, num_tickets)):
+                # Every 10th ticket shares its timestamp with the previous one, so ties on created_at occur
+                created_at = now + timedelta(seconds=i - i % 10 // 9)
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": rng.choice(user_ids),
+                    "subject": f"Ticket {i}",
+                    "question": f"Benchmark question number {i}",
+                    "status": rng.choice(statuses),
+                    "priority": TicketPriority.MEDIUM,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+            connection.execute(insert(Ticket), rows)
+            print(f"   {offset + len(rows)}/{num_tickets} tickets seeded", end="\r", flush=True)
+        print(f"\nSeeded {num_tickets} tickets in {time.perf_counter() - started:.1f}s")
+    with engine.connect() as connection:
+        connection.exec_driver_sql("ANALYZE")
+        connection.commit()
+
+
+def timed(fn, repeats: int) -> float:
+    """Median milliseconds of ``fn()`` over ``repeats`` runs"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def cursor_at(db, query, columns, depth: int):
+    """Cursor of the row just before ``depth`` in ``columns`` order, i.e. the one a client would hold"""
+    from app.crud.pagination import encode_cursor
+
+    if depth == 0:
+        return ""
+    row = query.order_by(*(column.desc() for column in columns)).offset(depth - 1).limit(1).first()
+    return encode_cursor([getattr(row, column.key) for column in columns])
+
+
+def run(depths, page_size: int, repeats: int):
+    from app.crud.ticket import ticket as ticket_crud
+    from app.db.models.ticket import Ticket, TicketStatus
+    from app.db.models.user import User
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).order_by(User.id).first()[0]
+        status = TicketStatus.OPEN
+        # listing -> (offset page, cursor page, base query of the cursor listing)
+        listings = {
+            "all tickets": (
+                lambda skip: ticket_crud.get_multi(db, skip=skip, limit=page_size),
+                lambda cursor: ticket_crud.get_page(db, cursor=cursor, limit=page_size),
+                db.query(Ticket),
+            ),
+            "by status": (
+                lambda skip: ticket_crud.get_by_status(db, status=status, skip=skip, limit=page_size),
+                lambda cursor: ticket_crud.get_by_status_page(db, status=status, cursor=cursor, limit=page_size),
+                db.query(Ticket).filter(Ticket.status == status),
+            ),
+            "by user": (
+                lambda skip: ticket_crud.get_by_user(db, user_id=user_id, skip=skip, limit=page_size),
+                lambda cursor: ticket_crud.get_by_user_page(db, user_id=user_id, cursor=cursor, limit=page_size),
+                db.query(Ticket).filter(Ticket.user_id == user_id),
+            ),
+        }
+        rows = []
+        for listing, (offset_page, cursor_page, query) in listings.items():
+            size = query.count()
+            print(f"{listing} ({size} rows):")
+            for depth in depths:
+                if depth + page_size > size:
+                    continue
+                cursor = cursor_at(db, query, ticket_crud.sort_key, depth)
+                offset_ms = timed(lambda: offset_page(depth), repeats)
+                cursor_ms = timed(lambda: cursor_page(cursor), repeats)
+                rows.append({"listing": listing, "rows": size, "depth": depth,
+                             "offset_ms": offset_ms, "cursor_ms": cursor_ms})
+                print(f"   depth {depth:8d}  offset {offset_ms:9.2f} ms  cursor {cursor_ms:6.2f} ms")
+                # Release the read transaction between depths like a request would
+                db.commit()
+        return rows
+    finally:
+        db.close()
+
+
+def write_report(rows, path: Path, num_tickets: int, page_size: int, repeats: int):
+    header = ["listing", "rows", "depth", "offset_ms", "cursor_ms"]
+    lines = [
+        "# Offset vs cursor pagination",
+        "",
+        f"Generated by `scripts/benchmark_pagination.py` on {datetime.now():%Y-%m-%d}.",
+        f"SQLite with {num_tickets} tickets; median of {repeats} fetches of a {page_size}-ticket page "
+        "starting `depth` rows into the listing, through the CRUD layer (query and ORM loading). "
+        "`offset_ms` uses `skip=depth`, `cursor_ms` the cursor of the row before.",
+        "",
+        "| " + " | ".join(header) + " |",
+        "|" + "---|" * len(header),
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(
+            f"{row[key]:.2f}" if isinstance(row[key], float) else str(row[key]) for key in header
+        ) + " |")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offset vs cursor pagination of ticket listings")
+    parser.add_argument("--db", type=Path, default=None,
+                        help="SQLite file to seed or reuse (defaults to a temporary file)")
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=4, help="Owners the tickets are spread over")
+    parser.add_argument("--depths", type=int, nargs="+",
+                        default=[0, 1_000, 10_000, 100_000, 240_000, 500_000, 990_000])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--report", type=Path, default=project_root / "scripts" / "reports" / "pagination.md")
+    args = parser.parse_args()
+
+    db_path = args.db or Path(tempfile.mkdtemp()) / "pagination.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DEBUG"] = "false"
+    seed_database(args.tickets, args.users)
+    results = run(args.depths, args.page_size, args.repeats)
+    write_report(results, args.report, args.tickets, args.page_size, args.repeats)
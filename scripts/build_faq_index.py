@@ -0,0 +1,119 @@
+"""
+Build the FAQ search index straight from the database
+Replaces the Colab export flow for large corpora
+"""
+
+import argparse
+import os
+import shutil
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ai.artifacts import (
+    ArtifactPaths, new_generation, publish_generation, read_config, resolve_artifact_dir
+)
+from app.ai.index_builder import IndexBuilder
+from app.crud.faq import faq as faq_crud
+from app.db.session import SessionLocal
+
+
+def build_index_from_db(
+        model_dir: Path,
+        output_dir: Path,
+        chunk_size: int,
+        batch_size: int,
+        workers: int,
+        dimension: int
+):
+    """Stream active FAQs from the database into fresh index artifacts"""
+    builder = IndexBuilder(
+        model_dir=model_dir,
+        output_dir=output_dir,
+        batch_size=batch_size,
+        workers=workers
+    )
+
+    db = SessionLocal()
+    try:
+        total = faq_crud.count_active(db)
+        print(f"Building index for {total} active FAQs into {output_dir}")
+
+        def progress(done: int, expected: int):
+            print(f"   {done}/{expected} FAQs encoded", end="\r", flush=True)
+
+        report = builder.build(
+            faq_crud.iter_active_chunks(db, chunk_size=chunk_size),
+            total=total,
+            dimension=dimension,
+            progress=progress
+        )
+    finally:
+        db.close()
+
+    print()
+    print("Index built successfully!")
+    print(f"   FAQs:        {report['num_faqs']}")
+    print(f"   Index type:  {report['index_type']} (built in {report['index_seconds']}s)")
+    print(f"   Time:        {report['seconds']}s")
+    print(f"   Throughput:  {report['faqs_per_second']} FAQs/sec")
+    print(f"   Peak memory: {report['peak_rss_mb']} MB RSS")
+    if report['padding']:
+        print(f"   Padding:     {report['padding']['padding_waste_ratio']:.1%} of token slots "
+              f"({report['padding']['unbucketed_padding_waste_ratio']:.1%} without length bucketing)")
+    return report
+
+
+def build_generation_from_db(data_dir: Path, chunk_size: int, batch_size: int, workers: int, dimension: int):
+    """Build into a new artifact generation next to the live one and publish it"""
+    _, live_dir = resolve_artifact_dir(data_dir)
+    generation, target = new_generation(data_dir)
+    live = ArtifactPaths(live_dir)
+    staged = ArtifactPaths(target)
+
+    # The generation must be self-contained; hard links avoid copying the model
+    shutil.copytree(live.model_dir, staged.model_dir, copy_function=os.link)
+    if live.config_path.exists():
+        staged.config_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(live.config_path, staged.config_path)
+
+    try:
+        report = build_index_from_db(staged.model_dir, target, chunk_size, batch_size, workers, dimension)
+    except Exception:
+        shutil.rmtree(target, ignore_errors=True)
+        raise
+
+    publish_generation(data_dir, generation)
+    print(f"Generation {generation} is now current; reload workers with "
+          f"POST /api/v1/admin/search/reload or SIGHUP")
+    return report
+
+
+if __name__ == "__main__":
+    default_dir = project_root / "app" / "data"
+
+    parser = argparse.ArgumentParser(description="Build the FAQ FAISS index from the faq table")
+    parser.add_argument("--output-dir", type=Path, default=default_dir,
+                        help="Data directory that receives models/ and data/ artifacts")
+    parser.add_argument("--model-dir", type=Path, default=ArtifactPaths(default_dir).model_dir,
+                        help="SentenceTransformer used to encode the FAQs")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="FAQs read from the database per chunk")
+    parser.add_argument("--batch-size", type=int, default=64,
+                        help="Texts per encoder forward pass")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Encoder processes (0 encodes in this process)")
+    parser.add_argument("--dimension", type=int, default=None,
+                        help="Embedding dimension (defaults to config.json)")
+    parser.add_argument("--new-generation", action="store_true",
+                        help="Build into a new generation under --output-dir/generations and publish it")
+    args = parser.parse_args()
+
+    _, live_dir = resolve_artifact_dir(args.output_dir)
+    dimension = args.dimension or read_config(ArtifactPaths(live_dir)).get("embedding_dimension", 384)
+    if args.new_generation:
+        build_generation_from_db(args.output_dir, args.chunk_size, args.batch_size, args.workers, dimension)
+    else:
+        build_index_from_db(args.model_dir, args.output_dir, args.chunk_size, args.batch_size, args.workers, dimension)
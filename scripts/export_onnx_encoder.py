@@ -0,0 +1,71 @@
+"""
+Export the SentenceTransformer encoder to ONNX for ENCODER_BACKEND=onnx
+Optionally writes a dynamically int8-quantized copy as well
+Needs torch, transformers and onnxruntime (export time only)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ai.artifacts import ArtifactPaths
+from app.ai.encoder import onnx_model_path
+
+
+def export_onnx(model_dir: Path, opset: int = 14) -> Path:
+    """Export the transformer body; pooling and normalization are done by OnnxEncoder"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    output_path = onnx_model_path(model_dir)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+    model = AutoModel.from_pretrained(str(model_dir))
+    model.eval()
+
+    sample = tokenizer(["How do I reset my password?"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(output_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True
+        )
+    print(f"ONNX model written to {output_path}")
+    return output_path
+
+
+def quantize_int8(model_dir: Path) -> Path:
+    """Dynamic int8 quantization of the exported model (no calibration data needed)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    source = onnx_model_path(model_dir)
+    target = onnx_model_path(model_dir, quantized=True)
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+    print(f"Quantized model written to {target}")
+    return target
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the FAQ encoder to ONNX")
+    parser.add_argument("--model-dir", type=Path, default=ArtifactPaths(project_root / "app" / "data").model_dir)
+    parser.add_argument("--opset", type=int, default=14)
+    parser.add_argument("--quantize", action="store_true", help="Also write an int8 dynamically quantized model")
+    args = parser.parse_args()
+
+    export_onnx(args.model_dir, args.opset)
+    if args.quantize:
+        quantize_int8(args.model_dir)
+    print("Set ENCODER_BACKEND=onnx (and ENCODER_ONNX_QUANTIZED=true for int8) to use it")
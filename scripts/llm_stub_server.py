@@ -0,0 +1,146 @@
+"""
+Local stand-in for the Hugging Face inference API
+Answers text-generation requests after a configurable latency and can inject
+errors, so the LLM fallback can be tested and benchmarked without network.
+Requests with "stream": true get a server-sent-events token stream like
+text-generation-inference, one token every --token-ms:
+
+    python scripts/llm_stub_server.py --port 8081 --latency-ms 300 --token-ms 40 --error-rate 0.1
+    HUGGINGFACE_API_URL=http://127.0.0.1:8081/generate LLM_FALLBACK_ENABLED=true uvicorn app.main:app
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubConfig:
+    def __init__(self, latency_ms: float = 200.0, jitter_ms: float = 50.0, error_rate: float = 0.0,
+                 error_status: int = 503, token_ms: float = 30.0):
+        self.latency_ms = latency_ms
+        self.token_ms = token_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def count(self, new_connection: bool):
+        with self._lock:
+            self.requests += 1
+            if new_connection:
+                self.connections += 1
+
+
+def make_handler(config: StubConfig):
+    class StubHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 keeps connections open, so client pooling is visible in the counters
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            self._served = 0
+
+        def do_POST(self):
+            config.count(new_connection=self._served == 0)
+            self._served += 1
+
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                payload = {}
+
+            delay = max(0.0, random.gauss(config.latency_ms, config.jitter_ms)) / 1000.0
+            time.sleep(delay)
+
+            if random.random() < config.error_rate:
+                self._send(config.error_status, {"error": "Model is currently loading", "estimated_time": 1.0})
+                return
+
+            question = str(payload.get("inputs", "")).rsplit("Customer question:", 1)[-1].split("\n")[0].strip()
+            text = (f"Thanks for reaching out about '{question[:80]}'. "
+                    "A support agent will follow up with the details.")
+            if payload.get("stream"):
+                self._stream(text)
+            else:
+                self._send(200, [{"generated_text": text}])
+
+        def _stream(self, text: str):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            words = text.split(" ")
+            try:
+                for i, word in enumerate(words):
+                    last = i == len(words) - 1
+                    event = {
+                        "token": {"id": i, "text": word if last else word + " ", "special": False},
+                        "generated_text": text if last else None
+                    }
+                    self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+                    if not last:
+                        time.sleep(config.token_ms / 1000.0)
+                self._chunk(b"")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+        def _chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            self._send(200, {"requests": config.requests, "connections": config.connections})
+
+        def _send(self, status: int, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The client gave up (deadline) before the reply was ready
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **config_kwargs):
+    """Run the stub on a background thread; returns (server, config, url)"""
+    config = StubConfig(**config_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, config, f"http://{host}:{server.server_address[1]}/generate"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Hugging Face text-generation endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--token-ms", type=float, default=30.0, help="Delay between streamed tokens")
+    args = parser.parse_args()
+
+    server, _, url = start_stub_server(
+        args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, error_status=args.error_status, token_ms=args.token_ms
+    )
+    print(f"LLM stub listening on {url} (GET / for counters)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,42 +1,88 @@
 """
 Script to update AI models from Colab
 Run this after training new models in Colab
+
+The export is unpacked into a new artifact generation under
+app/data/generations/ and published by rewriting app/data/CURRENT, so
+files of the generation that workers are serving are never overwritten.
+Running workers switch with POST /api/v1/admin/search/reload or SIGHUP.
 """
 
+import argparse
 import os
-import tarfile
 import shutil
+import sys
+import tarfile
+import tempfile
 from pathlib import Path
 
-def update_models_from_colab(tar_file_path: str):
-    """Update models from Colab export"""
-    project_root = Path(__file__).parent.parent
-    data_dir = project_root / "app" / "data"
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ai.artifacts import (
+    ArtifactPaths, new_generation, prune_generations, publish_generation, read_config, resolve_artifact_dir
+)
+
+
+def update_models_from_colab(tar_file_path: str, keep: int = 3, data_dir: Path = None) -> str:
+    """Unpack a Colab export into a new generation and make it current"""
+    data_dir = data_dir or project_root / "app" / "data"
+    _, live_dir = resolve_artifact_dir(data_dir)
 
     print(f"Updating models from: {tar_file_path}")
+    generation, target = new_generation(data_dir)
+
+    staging = Path(tempfile.mkdtemp(prefix=".extract-", dir=target.parent))
+    try:
+        with tarfile.open(tar_file_path, 'r:gz') as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(staging, filter="data")
+            else:
+                tar.extractall(staging)
+
+        # Exports are rooted at data/ (they used to be unpacked into app/)
+        extracted = staging / "data" if (staging / "data").is_dir() else staging
+        for entry in extracted.iterdir():
+            shutil.move(str(entry), str(target / entry.name))
+    except Exception:
+        shutil.rmtree(target, ignore_errors=True)
+        raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
 
-    # Create backup of existing models
-    backup_dir = data_dir / "backup"
-    if data_dir.exists():
-        if backup_dir.exists():
-            shutil.rmtree(backup_dir)
-        shutil.copytree(data_dir, backup_dir)
-        print("Created backup of existing models")
+    paths = ArtifactPaths(target)
+    if not paths.model_dir.exists():
+        # Index-only export: reuse the live model without copying its bytes
+        shutil.copytree(ArtifactPaths(live_dir).model_dir, paths.model_dir, copy_function=os.link)
+        print("Export has no model; linked the current one into the generation")
 
-    # Extract new models
-    with tarfile.open(tar_file_path, 'r:gz') as tar:
-        tar.extractall(project_root / "app")
+    required = [paths.index_path, paths.metadata_path]
+    if read_config(paths).get("vector_transform"):
+        # Indexes built on PCA-reduced vectors are useless without the projection for queries
+        required.append(paths.vector_transform_path)
+    missing = [p for p in required if not p.exists()]
+    if missing:
+        shutil.rmtree(target, ignore_errors=True)
+        raise FileNotFoundError(f"Export is missing {', '.join(str(p.relative_to(target)) for p in missing)}")
 
-    print("Models updated successfully!")
+    publish_generation(data_dir, generation)
+    removed = prune_generations(data_dir, keep=keep)
+
+    print(f"Models updated successfully! Generation {generation} is now current")
+    if removed:
+        print(f"Removed old generations: {', '.join(removed)}")
     print("New model files:")
-    for root, dirs, files in os.walk(data_dir):
+    for root, dirs, files in os.walk(target):
         for file in files:
-            print(f"   - {os.path.relpath(os.path.join(root, file), data_dir)}")
+            print(f"   - {os.path.relpath(os.path.join(root, file), target)}")
+    print("Reload running workers with POST /api/v1/admin/search/reload or SIGHUP")
+    return generation
+
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python update_ai_models.py <path_to_tar_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Install a Colab model export as a new artifact generation")
+    parser.add_argument("tar_file", help="Path to the exported .tar.gz")
+    parser.add_argument("--keep", type=int, default=3, help="Number of generations to keep on disk")
+    args = parser.parse_args()
 
-    update_models_from_colab(sys.argv[1])
+    update_models_from_colab(args.tar_file, keep=args.keep)
@@ -0,0 +1,100 @@
+import re
+import zlib
+
+import pytest
+
+DIMENSION = 256
+
+
+class FakeEncoder:
+    """Deterministic bag-of-words embeddings, so searches need no model download"""
+
+    def __init__(self, dimension: int = DIMENSION):
+        self.dimension = dimension
+        self.calls = 0
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs):
+        import numpy as np
+
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        self.calls += 1
+        embeddings = np.zeros((len(sentences), self.dimension), dtype="float32")
+        for row, text in enumerate(sentences):
+            for word in re.findall(r"\w+", text.lower()):
+                embeddings[row, zlib.crc32(word.encode()) % self.dimension] += 1.0
+        return embeddings
+
+
+@pytest.fixture()
+def search_service(tmp_path, monkeypatch):
+    """SemanticSearchService over an empty in-memory index and the fake encoder"""
+    faiss = pytest.importorskip("faiss")
+    import numpy as np
+    from app.ai import compact_metadata, index_factory
+    from app.ai.inference import InferenceExecutor
+    from app.ai import semantic_search_service as module
+    from app.ai.metadata_store import MetadataStore
+
+    # The module only binds these when the full AI stack imports
+    monkeypatch.setattr(module, "faiss", faiss, raising=False)
+    monkeypatch.setattr(module, "np", np, raising=False)
+    for name in ("MmapMetadataStore", "write_compact_metadata"):
+        monkeypatch.setattr(module, name, getattr(compact_metadata, name), raising=False)
+    for name in ("apply_search_params", "index_params_from_settings", "index_type_of", "owned_copy",
+                 "read_index", "search_parameters", "supports_removal"):
+        monkeypatch.setattr(module, name, getattr(index_factory, name), raising=False)
+
+    service = module.SemanticSearchService(data_dir=str(tmp_path))
+    service.model = FakeEncoder()
+    service.index = faiss.IndexIDMap2(faiss.IndexFlatIP(DIMENSION))
+    service.metadata = MetadataStore()
+    service.inference = InferenceExecutor(tmp_path, mode="thread", workers=1)
+    service.keyed_by_database_ids = True
+    service.is_initialized = True
+    yield service
+    service.close()
+
+
+@pytest.fixture()
+def db_session(tmp_path):
+    """Session on a fresh SQLite file with every table created"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    import app.db.models  # noqa: F401
+    from app.db.base import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    # Like request sessions (app.db.session.get_db), rows stay loaded after run_db commits a read
+    session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def user(db_session):
+    from app.db.models.user import User
+
+    user = User(email="customer@example.com", hashed_password="not-a-real-hash", full_name="Customer")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture()
+def client(db_session, user):
+    """API client on the test database, authenticated as ``user`` (startup events do not run)"""
+    from fastapi.testclient import TestClient
+
+    from app.api.deps import get_current_user_dependency, get_optional_current_user
+    from app.db.session import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user_dependency] = lambda: user
+    app.dependency_overrides[get_optional_current_user] = lambda: user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.db.models.ticket import Ticket
+from app.schemas.ask import AskQuestion
+from app.services import ticket_service
+from app.services.llm_service import LLMClient
+from app.services.ticket_service import TicketService
+
+
+def sse(*events):
+    return "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+
+
+def token(text, special=False):
+    return {"token": {"text": text, "special": special}}
+
+
+@pytest.fixture()
+def service(search_service, monkeypatch):
+    search_service.upsert_faq({"id": "faq-1", "question": "How do I reset my password?",
+                               "answer": "Use the reset link", "category": "account",
+                               "keywords": None, "is_active": True})
+    monkeypatch.setattr(ticket_service, "get_search_service", lambda: search_service)
+    monkeypatch.setattr(ticket_service, "get_llm_client", lambda: None)
+    return search_service
+
+
+def stream(db_session, user, question, llm_body=None):
+    """Collect the (event, data) pairs of one streamed question"""
+    async def main():
+        service = TicketService(db_session)
+        if llm_body is not None:
+            service.llm_client = LLMClient("http://llm.invalid", max_retries=0)
+            service.llm_client._client = httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(200, text=llm_body))
+            )
+        try:
+            return [pair async for pair in service.stream_question(user.id, AskQuestion(subject="Help", question=question))]
+        finally:
+            if service.llm_client is not None:
+                await service.llm_client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_faq_match_sends_decision_then_done(db_session, user, service):
+    events = stream(db_session, user, "How do I reset my password?", llm_body=sse(token("unused")))
+
+    assert [event for event, _ in events] == ["decision", "done"]
+    decision, done = events[0][1], events[1][1]
+    assert decision["source"] == "faq_direct" and not decision["generating"]
+    assert decision["answer"] == done["answer"] == "Use the reset link"
+    assert db_session.get(Ticket, done["ticket_id"]).answer == "Use the reset link"
+
+
+def test_low_confidence_streams_generated_tokens(db_session, user, service):
+    body = sse(token("Contact"), token(" shipping"), token("</s>", special=True), token(" support."))
+    events = stream(db_session, user, "When does my parcel arrive?", llm_body=body)
+
+    assert [event for event, _ in events] == ["decision", "token", "token", "token", "done"]
+    assert events[0][1]["generating"] and events[0][1]["answer"] is None
+    assert [data["text"] for event, data in events if event == "token"] == ["Contact", " shipping", " support."]
+    done = events[-1][1]
+    assert done["answer"] == "Contact shipping support."
+    assert done["metadata"]["llm_generated"]
+    assert db_session.get(Ticket, done["ticket_id"]).answer == "Contact shipping support."
+
+
+def test_broken_stream_falls_back_to_canned_answer(db_session, user, service):
+    body = sse(token("Contact"), {"error": "model overloaded"})
+    events = stream(db_session, user, "When does my parcel arrive?", llm_body=body)
+
+    assert [event for event, _ in events] == ["decision", "token", "done"]
+    done = events[-1][1]
+    assert not done["metadata"]["llm_generated"]
+    assert done["answer"].startswith("I couldn't find specific information")
+
+
+def test_unavailable_search_hands_over_to_humans(db_session, user, service):
+    service.is_initialized = False
+    events = stream(db_session, user, "How do I reset my password?")
+
+    assert events[0] == ("decision", {"source": "human", "confidence_score": 0.0, "needs_human_support": True})
+    assert events[1][0] == "done" and events[1][1]["source"] == "human"
+    assert db_session.get(Ticket, events[1][1]["ticket_id"]).answer is None
@@ -0,0 +1,68 @@
+from app.crud.ticket import ticket as ticket_crud
+from app.db.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.schemas.ticket import TicketCreate
+from app.services import ticket_service
+
+
+def faq(faq_id, question, category="account"):
+    return {"id": faq_id, "question": question, "answer": f"Answer to {question}", "category": category,
+            "keywords": None, "is_active": True}
+
+
+def test_create_multi_inserts_in_order(db_session, user):
+    objs_in = [
+        TicketCreate(user_id=user.id, subject=f"Question {n}", question=f"Question {n}?", status=status,
+                     priority=TicketPriority.MEDIUM, confidence_score=0.5)
+        for n, status in enumerate([TicketStatus.RESOLVED, TicketStatus.OPEN, TicketStatus.RESOLVED])
+    ]
+
+    ids = ticket_crud.create_multi(db_session, objs_in=objs_in)
+
+    assert len(set(ids)) == 3
+    tickets = [db_session.get(Ticket, ticket_id) for ticket_id in ids]
+    assert [t.subject for t in tickets] == ["Question 0", "Question 1", "Question 2"]
+    assert [t.resolved_at is not None for t in tickets] == [True, False, True]
+    assert ticket_crud.create_multi(db_session, objs_in=[]) == []
+
+
+def test_batch_endpoint_answers_in_request_order(client, db_session, search_service, monkeypatch):
+    search_service.upsert_faq(faq("faq-1", "How do I reset my password?"))
+    search_service.upsert_faq(faq("faq-2", "Where can I download my invoice?", category="billing"))
+    monkeypatch.setattr(ticket_service, "get_search_service", lambda: search_service)
+
+    response = client.post("/api/v1/tickets/ask/batch", json={"items": [
+        {"subject": "Invoice", "question": "Where can I download my invoice?"},
+        {"subject": "Password", "question": "How do I reset my password?", "category": "account"},
+        {"subject": "Shipping", "question": "When does my parcel arrive?"},
+    ]})
+
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [r["metadata"]["faq_id"] for r in results] == ["faq-2", "faq-1", None]
+    assert results[0]["answer"] == "Answer to Where can I download my invoice?"
+    assert results[2]["metadata"]["needs_human_support"]
+
+    tickets = {t.id: t for t in db_session.query(Ticket).all()}
+    assert [tickets[r["ticket_id"]].subject for r in results] == ["Invoice", "Password", "Shipping"]
+    assert tickets[results[0]["ticket_id"]].status == TicketStatus.RESOLVED
+    assert tickets[results[2]["ticket_id"]].status == TicketStatus.OPEN
+
+
+def test_batch_endpoint_rejects_empty_batches(client):
+    assert client.post("/api/v1/tickets/ask/batch", json={"items": []}).status_code == 422
+
+
+def test_batch_answers_use_the_same_min_score_as_single_answers(search_service, monkeypatch):
+    from app.ai import semantic_search_service as module
+
+    search_service.upsert_faq(faq("faq-1", "How do I reset my password?"))
+    queries = ["How do I reset my password?", "reset my email"]
+
+    assert [a["source"] for a in search_service.get_best_answers_batch(queries)] == ["faq_direct", "low_confidence"]
+
+    monkeypatch.setattr(module, "DEFAULT_MIN_SCORE", 0.9)
+    search_service.bump_corpus_version()
+    single = [search_service.get_best_answer(query) for query in queries]
+    search_service.bump_corpus_version()
+    batch = search_service.get_best_answers_batch(queries)
+    assert [a["source"] for a in single] == [a["source"] for a in batch] == ["faq_direct", "no_match"]
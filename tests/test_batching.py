@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from app.ai.batching import MicroBatcher
+
+
+def recording_batcher(**kwargs):
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    return MicroBatcher(process, **kwargs), batches
+
+
+def test_flushes_when_batch_is_full():
+    batcher, batches = recording_batcher(max_batch_size=3, max_wait_ms=60_000)
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(3))), timeout=5)
+
+    assert asyncio.run(main()) == [0, 2, 4]
+    assert batches == [[0, 1, 2]]
+
+
+def test_flushes_partial_batch_after_max_wait():
+    batcher, batches = recording_batcher(max_batch_size=100, max_wait_ms=20)
+
+    async def main():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(main())
+    assert results == [0, 2, 4, 6, 8]
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert elapsed >= 0.015
+
+
+def test_overflow_is_split_into_batches():
+    batcher, batches = recording_batcher(max_batch_size=4, max_wait_ms=10)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(main()) == [i * 2 for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batcher.metrics.total_items == 10
+    assert not batcher._tasks
+
+
+def test_batch_error_reaches_every_caller():
+    def process(items):
+        raise RuntimeError("index unavailable")
+
+    batcher = MicroBatcher(process, max_batch_size=2, max_wait_ms=10)
+
+    async def main():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert all(isinstance(error, RuntimeError) for error in errors)
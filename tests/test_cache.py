@@ -0,0 +1,110 @@
+import numpy as np
+
+from app.ai import cache as cache_module
+from app.ai.cache import AnswerCache, EmbeddingCache, LRUCache, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def vector(size=4):
+    return np.ones(size, dtype="float32")
+
+
+def test_normalize_query_folds_case_punctuation_and_whitespace():
+    assert normalize_query("  How do I RESET my password?! ") == "how do i reset my password"
+
+
+def test_evicts_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("a", vector())
+    cache.put("b", vector())
+    assert cache.get("a") is not None
+    cache.put("c", vector())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_evicts_over_byte_budget():
+    cache = EmbeddingCache(max_entries=10, max_bytes=40)
+    for key in ("a", "b", "c"):
+        cache.put(key, vector(4))
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 32
+    cache.put("big", vector(11))
+    assert cache.get("big") is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = EmbeddingCache(max_entries=10, ttl_seconds=60)
+    cache.put("a", vector())
+
+    clock.now += 59
+    assert cache.get("a") is not None
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_flushes_when_model_changes():
+    cache = EmbeddingCache(max_entries=10)
+    cache.bind_model("model-a")
+    cache.put("reset password", vector())
+
+    cache.bind_model("model-a")
+    assert cache.get("reset password") is not None
+    cache.bind_model("model-b")
+    assert cache.get("reset password") is None
+
+
+def test_lru_cache_accounts_values_with_sizeof():
+    cache = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "yyyy")
+    cache.put("c", "zzzz")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "yyyy"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_answer_cache_keys_ignore_trivial_query_differences():
+    cache = AnswerCache()
+    assert cache.key("Reset password?", 0.7, 1) == cache.key("reset   PASSWORD", 0.7, 1)
+    assert cache.key("reset password", 0.7, 1) != cache.key("reset password", 0.8, 1)
+    assert cache.key("reset password", 0.7, 1) != cache.key("reset password", 0.7, 1, category="billing")
+
+
+def test_answer_cache_bump_version_drops_entries():
+    cache = AnswerCache()
+    old_key = cache.key("reset password", 0.7, 1)
+    cache.put(old_key, {"answer": "Use the reset link"})
+
+    assert cache.bump_version() == 1
+    assert len(cache) == 0
+    assert cache.get(old_key) is None
+    assert cache.key("reset password", 0.7, 1) != old_key
+
+
+def test_answer_cache_returns_independent_copies():
+    cache = AnswerCache()
+    key = cache.key("reset password", 0.7, 1)
+    answer = {"answer": "See related FAQs", "related_faqs": [{"id": "faq-1"}]}
+    cache.put(key, answer)
+    answer["related_faqs"][0]["id"] = "changed"
+
+    hit = cache.get(key)
+    hit["related_faqs"].append({"id": "faq-2"})
+    assert cache.get(key) == {"answer": "See related FAQs", "related_faqs": [{"id": "faq-1"}]}
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+
+def faq(faq_id, question, category):
+    return {"id": faq_id, "question": question, "answer": f"Answer to {question}", "category": category,
+            "keywords": None, "is_active": True}
+
+
+@pytest.fixture()
+def service(search_service):
+    search_service.upsert_faq(faq("faq-1", "How do I reset my account password?", "account"))
+    search_service.upsert_faq(faq("faq-2", "How do I reset my billing password?", "billing"))
+    search_service.upsert_faq(faq("faq-3", "Where can I download my invoice?", "billing"))
+    return search_service
+
+
+def ids(results):
+    return [r["id"] for r in results]
+
+
+def test_category_restricts_results(service):
+    assert sorted(ids(service.search_faqs("reset password", min_score=0.1))) == ["faq-1", "faq-2"]
+    assert ids(service.search_faqs("reset password", min_score=0.1, category="billing")) == ["faq-2"]
+    assert ids(service.search_faqs("reset password", min_score=0.1, category=" ACCOUNT ")) == ["faq-1"]
+
+
+def test_unknown_category_searches_everything(service):
+    everything = ids(service.search_faqs("reset password", min_score=0.1))
+    assert ids(service.search_faqs("reset password", min_score=0.1, category="shipping")) == everything
+    assert ids(service.search_faqs("reset password", min_score=0.1, category="")) == everything
+
+
+def test_category_follows_faq_updates(service):
+    service.upsert_faq(faq("faq-2", "How do I reset my billing password?", "account"))
+    assert sorted(ids(service.search_faqs("reset password", min_score=0.1, category="account"))) == [
+        "faq-1", "faq-2"
+    ]
+    assert ids(service.search_faqs("reset password", min_score=0.1, category="billing")) == []
+
+    service.remove_faq("faq-3")
+    assert "billing" not in service._category_ids
+
+
+def test_batched_queries_are_scoped_per_category(service):
+    async def ask():
+        return await asyncio.gather(
+            service.search_faqs_async("reset password", min_score=0.1, category="account"),
+            service.search_faqs_async("reset password", min_score=0.1, category="billing"),
+            service.search_faqs_async("download invoice", min_score=0.1),
+        )
+
+    account, billing, unscoped = asyncio.run(ask())
+    assert ids(account) == ["faq-1"]
+    assert ids(billing) == ["faq-2"]
+    assert ids(unscoped)[0] == "faq-3"
+
+
+def test_best_answer_is_cached_per_category(service):
+    account = service.get_best_answer("reset my password", confidence_threshold=0.1, category="account")
+    billing = service.get_best_answer("reset my password", confidence_threshold=0.1, category="billing")
+
+    assert account["faq_id"] == "faq-1"
+    assert billing["faq_id"] == "faq-2"
@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import llm_service
+from app.services.llm_service import CircuitBreaker, LLMClient, LLMUnavailableError
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+
+    clock[0] += 29
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_probe_outcome_closes_or_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_abandoned_probe_frees_the_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+
+
+def test_unexpected_error_counts_as_failed_probe(clock):
+    def handler(request):
+        raise httpx.DecodingError("corrupt body")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    client = LLMClient("http://llm.invalid", breaker=breaker, max_retries=0)
+
+    async def main():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(LLMUnavailableError):
+                await client.generate("hello")
+        finally:
+            await client.aclose()
+
+    breaker.record_failure()
+    clock[0] += 30
+    asyncio.run(main())
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock[0] += 30
+    assert breaker.allow()
@@ -0,0 +1,85 @@
+from sqlalchemy import text
+
+from app.db import engine as engine_module
+from app.db.engine import PoolMetrics, TimedQueuePool, build_engine, pool_stats, run_maintenance
+
+
+def pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_sqlite_connections_get_the_configured_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine_module.settings, "SQLITE_WAL", True)
+    monkeypatch.setattr(engine_module.settings, "SQLITE_SYNCHRONOUS", "NORMAL")
+    monkeypatch.setattr(engine_module.settings, "SQLITE_BUSY_TIMEOUT_MS", 4321)
+    monkeypatch.setattr(engine_module.settings, "SQLITE_CACHE_SIZE_KB", 2048)
+    monkeypatch.setattr(engine_module.settings, "SQLITE_INCREMENTAL_VACUUM_PAGES", 100)
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1
+    assert pragma(engine, "busy_timeout") == 4321
+    assert pragma(engine, "cache_size") == -2048
+    assert pragma(engine, "auto_vacuum") == 2
+    engine.dispose()
+
+
+def test_wal_can_be_turned_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine_module.settings, "SQLITE_WAL", False)
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    assert pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+
+
+def test_memory_databases_keep_the_default_pool():
+    engine = build_engine("sqlite://")
+    assert not isinstance(engine.pool, TimedQueuePool)
+    assert pool_stats(engine)["pool"] == type(engine.pool).__name__
+
+
+def test_pool_stats_report_checkout_waits(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = pool_stats(engine)
+    assert stats["checked_out"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["checkout_wait_ms"]["count"] == 1
+    engine.dispose()
+
+
+def test_pool_metrics_percentiles():
+    metrics = PoolMetrics(window=4)
+    for wait_ms in (1, 2, 3, 4, 100):
+        metrics.record(wait_ms)
+    metrics.record(500, timed_out=True)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 5 and snapshot["timeouts"] == 1
+    assert snapshot["checkout_wait_ms"]["count"] == 4
+    assert snapshot["checkout_wait_ms"]["max"] == 500
+
+
+def test_maintenance_analyzes_once_and_vacuums_free_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine_module.settings, "SQLITE_INCREMENTAL_VACUUM_PAGES", 1000)
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE blob (id INTEGER PRIMARY KEY, body TEXT)")
+        connection.exec_driver_sql("CREATE INDEX ix_blob_body ON blob (body)")
+        for n in range(200):
+            connection.exec_driver_sql("INSERT INTO blob (body) VALUES (?)", (f"{n}" * 500,))
+        connection.exec_driver_sql("DELETE FROM blob")
+
+    first = run_maintenance(engine)
+    assert first["analyzed"] and first["incremental_vacuum"]
+    assert first["freelist_pages"] > 0
+    assert first["vacuumed_pages"] == first["freelist_pages"]
+    assert pragma(engine, "freelist_count") == 0
+    assert engine_module.last_maintenance == first
+
+    second = run_maintenance(engine)
+    assert not second["analyzed"]
+    assert second["vacuumed_pages"] == 0
+    engine.dispose()
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud import async_ticket, async_user
+from app.db import session as session_module
+from app.db.base import async_database_url
+from app.db.models.ticket import Ticket
+from app.db.session import get_async_db, get_db, get_request_db, run_db
+
+
+def test_request_db_follows_the_db_async_setting(monkeypatch):
+    monkeypatch.setattr(session_module.settings, "DB_ASYNC", False)
+    assert get_request_db() is get_db
+    monkeypatch.setattr(session_module.settings, "DB_ASYNC", True)
+    assert get_request_db() is get_async_db
+
+
+def test_async_database_url_maps_sync_drivers():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgres://u@db/app") == "postgresql+asyncpg://u@db/app"
+    assert async_database_url("postgresql+asyncpg://u@db/app") == "postgresql+asyncpg://u@db/app"
+
+
+def test_run_db_uses_the_threadpool_for_sync_sessions(db_session, user):
+    def lookup(session, user_id):
+        return threading.get_ident(), session.get(type(user), user_id).email
+
+    async def main():
+        return threading.get_ident(), await run_db(db_session, lookup, user.id)
+
+    loop_thread, (worker_thread, email) = asyncio.run(main())
+    assert email == "customer@example.com"
+    assert worker_thread != loop_thread
+    # The read-only transaction was handed back to the pool
+    assert not db_session.in_transaction()
+
+
+def test_run_db_leaves_pending_writes_to_the_caller(db_session, user):
+    def add_ticket(session):
+        session.add(Ticket(user_id=user.id, subject="Help", question="Where is my order?"))
+
+    asyncio.run(run_db(db_session, add_ticket))
+
+    assert db_session.in_transaction() and db_session.new
+    db_session.commit()
+    assert db_session.query(Ticket).count() == 1
+
+
+def test_async_crud_runs_on_an_async_session(db_session, user, tmp_path):
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        try:
+            async with async_sessionmaker(bind=engine, expire_on_commit=False)() as db:
+                assert isinstance(db, AsyncSession)
+                found = await async_user.get_by_email(db, email="customer@example.com")
+                count = await async_ticket.count(db)
+                in_transaction = db.in_transaction()
+            return found, count, in_transaction
+        finally:
+            await engine.dispose()
+
+    found, count, in_transaction = asyncio.run(main())
+    assert found.id == user.id
+    assert count == 0
+    assert not in_transaction
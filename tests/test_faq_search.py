@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.ai.lexical_index import BM25Index
+from app.api.v1.endpoints import faqs as faqs_endpoint
+from app.db.models.faq import FAQ
+
+
+@pytest.fixture()
+def stored_faqs(db_session):
+    rows = [
+        FAQ(question="How do I reset my password?", answer="Use the reset link.", category="account"),
+        FAQ(question="Where is my invoice?", answer="Under billing.", category="billing"),
+        FAQ(question="How do I change my password hint?", answer="In settings.", category="account"),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+@pytest.fixture()
+def lexical_service(search_service, monkeypatch):
+    search_service.lexical = BM25Index()
+    monkeypatch.setattr(faqs_endpoint, "get_search_service", lambda: search_service)
+    return search_service
+
+
+def index(service, faq_id, faq):
+    service.upsert_faq({"id": faq_id, "question": faq.question, "answer": faq.answer,
+                        "category": faq.category, "keywords": None, "is_active": True})
+
+
+def search(client, query, **params):
+    response = client.get("/api/v1/faqs/", params={"search": query, **params})
+    assert response.status_code == 200
+    return [faq["question"] for faq in response.json()]
+
+
+def test_search_pages_through_the_bm25_ranking(client, stored_faqs, lexical_service):
+    for faq in stored_faqs:
+        index(lexical_service, faq.id, faq)
+
+    assert search(client, "reset password") == ["How do I reset my password?", "How do I change my password hint?"]
+    assert search(client, "reset password", skip=1, limit=1) == ["How do I change my password hint?"]
+    assert search(client, "reset password", skip=2) == []
+
+
+def test_search_falls_back_when_index_ids_are_not_database_ids(client, stored_faqs, lexical_service):
+    # Artifacts built from the JSON export number their FAQs faq_1, faq_2, ... instead of using the UUIDs
+    for n, faq in enumerate(stored_faqs, start=1):
+        index(lexical_service, f"faq_{n}", faq)
+
+    assert lexical_service.search_lexical("invoice")
+    assert search(client, "invoice") == ["Where is my invoice?"]
+    assert sorted(search(client, "password")) == ["How do I change my password hint?", "How do I reset my password?"]
+    assert len(search(client, "password", skip=1)) == 1
+
+
+def test_search_service_is_resolved_off_the_event_loop(client, stored_faqs, search_service, monkeypatch):
+    calls = []
+
+    def get_search_service():
+        try:
+            asyncio.get_running_loop()
+            calls.append("event loop")
+        except RuntimeError:
+            calls.append("worker thread")
+        return search_service
+
+    monkeypatch.setattr(faqs_endpoint, "get_search_service", get_search_service)
+    search(client, "invoice")
+    assert calls == ["worker thread"]
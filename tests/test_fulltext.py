@@ -0,0 +1,128 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.crud.faq import faq as faq_crud
+from app.crud.ticket import ticket as ticket_crud
+from app.db import fulltext
+from app.db.fulltext import SQLiteFTS5Backend
+from app.db.models.faq import FAQ
+from app.db.models.ticket import Ticket
+
+
+def add_faqs(db, *rows):
+    faqs = [FAQ(question=question, answer=answer, keywords=keywords, category="general")
+            for question, answer, keywords in rows]
+    db.add_all(faqs)
+    db.commit()
+    return faqs
+
+
+def questions(hits):
+    return [hit.obj.question for hit in hits]
+
+
+def test_triggers_keep_the_index_in_sync(db_session):
+    reset, invoice = add_faqs(
+        db_session,
+        ("How do I reset my password?", "Use the reset link.", None),
+        ("Where is my invoice?", "Under billing.", "receipt"),
+    )
+    assert questions(faq_crud.search_hits(db_session, query="receipt")) == ["Where is my invoice?"]
+
+    reset.question = "How do I change my email?"
+    db_session.commit()
+    assert faq_crud.search(db_session, query="password") == []
+    assert faq_crud.search(db_session, query="email") == [reset]
+
+    db_session.delete(invoice)
+    db_session.commit()
+    assert faq_crud.search(db_session, query="receipt") == []
+
+    # Counter updates do not touch the indexed columns
+    reset.view_count += 1
+    db_session.commit()
+    assert faq_crud.search(db_session, query="email") == [reset]
+
+
+def test_results_are_ranked_with_snippets(db_session):
+    add_faqs(
+        db_session,
+        ("How do I cancel an order?", "Open the order page and choose cancel.", None),
+        ("Shipping times", "Orders ship within two days; refunds take a week.", None),
+        ("Refund policy", "Refunds are issued to the original payment method.", "refund"),
+    )
+
+    hits = faq_crud.search_hits(db_session, query="refunds")
+    assert questions(hits) == ["Refund policy", "Shipping times"]
+    assert hits[0].score > hits[1].score
+    assert "<mark>" in hits[1].snippet and "</mark>" in hits[1].snippet
+    # Porter stemming matches inflections; a trailing * asks for a prefix
+    assert questions(faq_crud.search_hits(db_session, query="cancelled")) == ["How do I cancel an order?"]
+    assert questions(faq_crud.search_hits(db_session, query="ship*")) == ["Shipping times"]
+
+
+def test_user_input_never_reaches_query_syntax(db_session):
+    add_faqs(db_session, ("Can I pay with NEAR tokens?", "Card only.", None))
+
+    for query in ('"', "NEAR(", "pay OR", "-card", "question:pay", "", "***"):
+        faq_crud.search_hits(db_session, query=query)
+    assert questions(faq_crud.search_hits(db_session, query='pay "NEAR"')) == ["Can I pay with NEAR tokens?"]
+
+
+def test_inactive_faqs_and_other_users_tickets_are_excluded(db_session, user):
+    hidden, = add_faqs(db_session, ("Old password policy", "Retired.", None))
+    hidden.is_active = False
+    db_session.add_all([
+        Ticket(user_id=user.id, subject="Password reset", question="The reset link expired"),
+        Ticket(user_id="someone-else", subject="Password reset", question="No email arrived"),
+    ])
+    db_session.commit()
+
+    assert faq_crud.search(db_session, query="password") == []
+    hits = ticket_crud.search_hits(db_session, query="password", user_id=user.id)
+    assert [hit.obj.question for hit in hits] == ["The reset link expired"]
+    assert len(ticket_crud.search(db_session, query="reset")) == 2
+
+
+def test_install_backfills_existing_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        # A table created on its own, without the metadata hook, like a database from before FTS5
+        FAQ.__table__.create(connection)
+        connection.execute(FAQ.__table__.insert(), [{"id": "faq-1", "question": "Where is my parcel?",
+                                                      "answer": "In transit", "is_active": True,
+                                                      "view_count": 0, "helpfulness_score": 0.0}])
+
+    with engine.begin() as connection:
+        report = fulltext.install(connection)
+    assert (report["backend"], report["backfilled"]) == ("fts5", ["faq"])
+
+    with Session(engine) as db:
+        assert [f.id for f in faq_crud.search(db, query="parcel")] == ["faq-1"]
+    engine.dispose()
+
+
+def test_like_backend_matches_substrings(db_session, monkeypatch):
+    add_faqs(db_session, ("Where is my invoice?", "Under billing.", None))
+    monkeypatch.setattr(fulltext.settings, "FULLTEXT_BACKEND", "like")
+
+    hits = faq_crud.search_hits(db_session, query="voic")
+    assert questions(hits) == ["Where is my invoice?"]
+    assert hits[0].score is None and hits[0].snippet is None
+
+
+def test_fts5_expression_quotes_every_word():
+    assert SQLiteFTS5Backend._expression('Reset "my" pass* OR x') == '"reset" "my" "pass"* "or" "x"'
+    assert SQLiteFTS5Backend._expression("!!") == '""'
+
+
+def test_candidate_cap_ranks_only_the_newest_matches(db_session, monkeypatch):
+    add_faqs(
+        db_session,
+        ("Refund policy", "Refunds, refunds and more refunds.", "refund"),
+        ("Shipping times", "Orders ship within two days; refunds take a week.", None),
+    )
+    assert questions(faq_crud.search_hits(db_session, query="refund")) == ["Refund policy", "Shipping times"]
+
+    monkeypatch.setattr(fulltext.settings, "FULLTEXT_MAX_CANDIDATES", 1)
+    assert questions(faq_crud.search_hits(db_session, query="refund")) == ["Shipping times"]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from app.ai.index_factory import owned_copy, read_index
+
+
+@pytest.fixture()
+def index_path(tmp_path):
+    index = faiss.IndexIDMap2(faiss.IndexFlatIP(8))
+    vectors = np.eye(8, dtype="float32")[:4]
+    index.add_with_ids(vectors, np.arange(10, 14, dtype="int64"))
+    path = tmp_path / "faiss_index.bin"
+    faiss.write_index(index, str(path))
+    return path
+
+
+def search_ids(index):
+    _, ids = index.search(np.eye(8, dtype="float32")[:1], 1)
+    return ids[0].tolist()
+
+
+def test_mapped_index_searches_and_copies_for_writes(index_path):
+    index = read_index(index_path, mmap=True, index_type="flat")
+    assert index.ntotal == 4
+    assert search_ids(index) == [10]
+
+    copy = owned_copy(index)
+    copy.remove_ids(np.array([10], dtype="int64"))
+    assert copy.ntotal == 3 and index.ntotal == 4
+
+
+def test_mapping_without_in_place_flag_falls_back(index_path, monkeypatch):
+    # FAISS releases before IO_FLAG_MMAP_IFC (the pinned faiss-cpu 1.8.0) only have IO_FLAG_MMAP
+    monkeypatch.delattr(faiss, "IO_FLAG_MMAP_IFC", raising=False)
+    index = read_index(index_path, mmap=True, index_type="hnsw")
+    assert search_ids(index) == [10]
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from app.ai.metadata_store import faq_index_id
+from app.api.v1.endpoints import admin as admin_endpoint
+
+
+def faq(faq_id, question, answer="An answer", category="account", is_active=True):
+    return {"id": faq_id, "question": question, "answer": answer, "category": category,
+            "keywords": None, "is_active": is_active}
+
+
+def test_upsert_adds_a_searchable_faq(search_service):
+    assert search_service.upsert_faq(faq("faq-1", "How do I reset my password?"))
+    assert search_service.upsert_faq(faq("faq-2", "Where is my invoice?"))
+
+    results = search_service.search_faqs("reset my password", top_k=1)
+    assert [r["id"] for r in results] == ["faq-1"]
+    assert search_service.index.ntotal == 2
+    assert search_service._dirty
+
+
+def test_upsert_replaces_an_existing_faq(search_service):
+    search_service.upsert_faq(faq("faq-1", "How do I reset my password?"))
+    search_service.upsert_faq(faq("faq-1", "How do I change my email address?", answer="Settings"))
+
+    assert search_service.index.ntotal == 1
+    assert len(search_service.metadata) == 1
+    results = search_service.search_faqs("change email address", top_k=5)
+    assert [(r["id"], r["answer"]) for r in results] == [("faq-1", "Settings")]
+    assert search_service.search_faqs("reset password", top_k=5, min_score=0.5) == []
+
+
+def test_remove_and_deactivate_drop_the_faq(search_service):
+    search_service.upsert_faq(faq("faq-1", "How do I reset my password?"))
+    search_service.upsert_faq(faq("faq-2", "Where is my invoice?"))
+
+    assert search_service.remove_faq("faq-1")
+    assert not search_service.remove_faq("faq-1")
+    search_service.upsert_faq(faq("faq-2", "Where is my invoice?", is_active=False))
+
+    assert search_service.index.ntotal == 0
+    assert faq_index_id("faq-2") not in search_service.metadata
+    assert search_service.search_faqs("reset password invoice") == []
+
+
+def test_writes_invalidate_cached_answers(search_service):
+    search_service.upsert_faq(faq("faq-1", "How do I reset my password?", answer="Old answer"))
+    assert search_service.get_best_answer("How do I reset my password?")["answer"] == "Old answer"
+
+    search_service.upsert_faq(faq("faq-1", "How do I reset my password?", answer="New answer"))
+    assert search_service.get_best_answer("How do I reset my password?")["answer"] == "New answer"
+
+
+def test_snapshot_writes_the_live_state(search_service):
+    search_service.upsert_faq(faq("faq-1", "How do I reset my password?"))
+
+    assert search_service.snapshot()
+    assert not search_service.snapshot()
+    records = json.loads(search_service.paths.metadata_path.read_text())
+    assert [r["id"] for r in records] == ["faq-1"]
+    assert search_service.paths.index_path.exists()
+
+
+def test_index_not_keyed_by_database_ids_refuses_writes(search_service):
+    search_service.upsert_faq(faq("faq_1", "How do I reset my password?"))
+    search_service.keyed_by_database_ids = False
+
+    assert not search_service.upsert_faq(faq("3f1c0a4e-uuid", "How do I reset my password?", answer="New"))
+    assert not search_service.remove_faq("3f1c0a4e-uuid")
+    assert search_service.index.ntotal == 1
+    assert search_service.search_faqs("reset password")[0]["answer"] == "An answer"
+
+
+@pytest.fixture()
+def admin_client(client, user, db_session, search_service, monkeypatch):
+    user.is_admin = True
+    db_session.commit()
+    monkeypatch.setattr(admin_endpoint, "get_search_service", lambda: search_service)
+    return client
+
+
+def test_admin_faq_writes_update_the_index_in_place(admin_client, search_service):
+    created = admin_client.post("/api/v1/admin/faqs", json={
+        "question": "How do I reset my password?", "answer": "Use the reset link", "category": "account"
+    }).json()
+    admin_client.post("/api/v1/admin/faqs", json={"question": "Where is my invoice?", "answer": "Under billing"})
+    assert search_service.index.ntotal == 2
+
+    admin_client.put(f"/api/v1/admin/faqs/{created['id']}", json={"question": "How do I change my email?"})
+    assert search_service.index.ntotal == 2
+    assert [r["id"] for r in search_service.search_faqs("change email")] == [created["id"]]
+    assert search_service.search_faqs("reset password", min_score=0.5) == []
+
+    admin_client.delete(f"/api/v1/admin/faqs/{created['id']}")
+    assert search_service.index.ntotal == 1
+    assert search_service.search_faqs("change email", min_score=0.5) == []
+
+
+def test_admin_faq_writes_leave_an_exported_index_alone(admin_client, search_service):
+    search_service.upsert_faq(faq("faq_1", "How do I reset my password?"))
+    search_service.keyed_by_database_ids = False
+
+    created = admin_client.post("/api/v1/admin/faqs", json={
+        "question": "How do I reset my password?", "answer": "Use the reset link"
+    })
+    assert created.status_code == 201
+    assert search_service.index.ntotal == 1
+    assert [r["id"] for r in search_service.search_faqs("reset password")] == ["faq_1"]
+
+    admin_client.put(f"/api/v1/admin/faqs/{created.json()['id']}", json={"answer": "Another answer"})
+    admin_client.delete(f"/api/v1/admin/faqs/{created.json()['id']}")
+    assert search_service.index.ntotal == 1
@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.ai.encoder import BucketedEncoder, LengthBucketer, resolve_max_seq_length
+
+WORDS = ["[PAD]", "[UNK]", "how", "do", "i", "reset", "my", "password", "error", "log", "line"]
+
+
+@pytest.fixture()
+def tokenizer_path(tmp_path):
+    tokenizers = pytest.importorskip("tokenizers")
+    from tokenizers import models, pre_tokenizers
+
+    tokenizer = tokenizers.Tokenizer(models.WordLevel({w: i for i, w in enumerate(WORDS)}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    path = tmp_path / "tokenizer.json"
+    tokenizer.save(str(path))
+    return path
+
+
+class LengthEncoder(BucketedEncoder):
+    """Embeds each input as [its token count, its batch width]"""
+
+    dimension = 2
+
+    def __init__(self, bucketer):
+        self.bucketer = bucketer
+
+    def _encode_batch(self, feeds):
+        mask = feeds["attention_mask"]
+        return np.stack([mask.sum(axis=1), np.full(len(mask), mask.shape[1])], axis=1).astype("float32")
+
+
+TEXTS = ["error log line " * 4, "reset", "how do i reset my password", "password"]
+
+
+def test_batches_group_inputs_by_length(tokenizer_path):
+    bucketer = LengthBucketer(tokenizer_path, max_seq_length=64)
+    batches = list(bucketer.batches(TEXTS, batch_size=2))
+
+    assert [list(positions) for positions, _ in batches] == [[1, 3], [2, 0]]
+    short = batches[0][1]
+    assert short["input_ids"].shape == (2, 1)
+    assert short["input_ids"].dtype == np.int64
+    long = batches[1][1]
+    assert long["input_ids"].shape == (2, 12)
+    assert long["attention_mask"][0].tolist() == [1] * 6 + [0] * 6
+    assert long["input_ids"][0, 6:].tolist() == [WORDS.index("[PAD]")] * 6
+
+
+def test_inputs_are_truncated_and_padding_is_counted(tokenizer_path):
+    bucketer = LengthBucketer(tokenizer_path, max_seq_length=8)
+    (_, feeds), = bucketer.batches(["error log line " * 4], batch_size=4)
+    assert feeds["input_ids"].shape == (1, 8)
+
+    list(bucketer.batches(TEXTS, batch_size=2))
+    stats = bucketer.stats.snapshot()
+    assert stats["sequences"] == 5
+    assert stats["tokens"] == 8 + 8 + 1 + 6 + 1
+    assert stats["padding_waste_ratio"] < stats["unbucketed_padding_waste_ratio"]
+
+
+def test_bucketing_can_be_disabled(tokenizer_path):
+    bucketer = LengthBucketer(tokenizer_path, max_seq_length=64, bucketing=False)
+    assert [list(p) for p, _ in bucketer.batches(TEXTS, batch_size=2)] == [[0, 1], [2, 3]]
+
+
+def test_encoder_returns_embeddings_in_input_order(tokenizer_path):
+    encoder = LengthEncoder(LengthBucketer(tokenizer_path, max_seq_length=64))
+    embeddings = encoder.encode(TEXTS, batch_size=2)
+
+    assert embeddings[:, 0].tolist() == [12, 1, 6, 1]
+    # Short inputs were padded only to their own batch
+    assert embeddings[:, 1].tolist() == [12, 1, 12, 1]
+    assert encoder.encode("reset").shape == (1, 2)
+    assert encoder.encode([]).shape == (0, 2)
+    assert encoder.padding_stats()["max_seq_length"] == 64
+
+
+def test_max_seq_length_respects_model_limits(tmp_path):
+    assert resolve_max_seq_length(tmp_path, configured=0) == 256
+    (tmp_path / "sentence_bert_config.json").write_text(json.dumps({"max_seq_length": 128}))
+    (tmp_path / "config.json").write_text(json.dumps({"max_position_embeddings": 512}))
+
+    assert resolve_max_seq_length(tmp_path, configured=0) == 128
+    assert resolve_max_seq_length(tmp_path, configured=64) == 64
+    assert resolve_max_seq_length(tmp_path, configured=1024) == 512
@@ -0,0 +1,53 @@
+from app.ai.lexical_index import BM25Index, tokenize
+
+
+def faq(question, answer="", keywords=""):
+    return {"question": question, "answer": answer, "keywords": keywords}
+
+
+def build_index():
+    index = BM25Index()
+    index.add(1, faq("How do I reset my password?", "Use the forgot password link.", "password, login"))
+    index.add(2, faq("How do I cancel my subscription?", "Go to billing settings.", "cancel, billing"))
+    index.add(3, faq("What are your business hours?", "Monday to Friday.", "hours"))
+    return index
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("How do I reset my Password?") == ["reset", "password"]
+
+
+def test_search_ranks_matching_documents_first():
+    hits = build_index().search("reset password")
+
+    assert [doc_id for doc_id, _, _ in hits] == [1]
+    _, score, normalized = hits[0]
+    assert score > 0
+    assert 0 < normalized <= 1.0
+
+
+def test_partial_matches_score_lower():
+    index = build_index()
+    full = index.search("cancel subscription")[0][2]
+    partial = index.search("cancel subscription refund")[0][2]
+    assert partial < full
+
+
+def test_doc_filter_restricts_results():
+    index = build_index()
+    assert sorted(doc_id for doc_id, _, _ in index.search("password billing")) == [1, 2]
+    assert [doc_id for doc_id, _, _ in index.search("password billing", doc_filter={2})] == [2]
+    assert index.search("password", doc_filter={2, 3}) == []
+
+
+def test_add_replaces_and_remove_forgets_documents():
+    index = build_index()
+    index.add(1, faq("How do I change my email address?"))
+    assert index.search("password") == []
+    assert [doc_id for doc_id, _, _ in index.search("email")] == [1]
+
+    assert index.remove(1)
+    assert not index.remove(1)
+    assert 1 not in index
+    assert len(index) == 2
+    assert index.search("email") == []
@@ -0,0 +1,67 @@
+from app.ai.metadata_store import MetadataStore, faq_index_id
+
+
+def record(n, **overrides):
+    values = {
+        "id": f"faq-{n}", "question": f"Question {n}?", "answer": f"Answer {n}",
+        "category": "billing" if n % 2 else None, "keywords": None if n % 3 else "k"
+    }
+    values.update(overrides)
+    return values
+
+
+def test_columns_round_trip_records_including_nulls():
+    records = [record(n) for n in range(20)]
+    store = MetadataStore(records)
+
+    assert len(store) == 20
+    for expected in records:
+        assert store.get(faq_index_id(expected["id"])) == expected
+    assert store.get(faq_index_id("missing")) is None
+
+
+def test_get_returns_fresh_dicts():
+    store = MetadataStore([record(1)])
+    index_id = faq_index_id("faq-1")
+    store.get(index_id)["question"] = "changed"
+    assert store.get(index_id)["question"] == "Question 1?"
+
+
+def test_overlay_upserts_and_removals():
+    store = MetadataStore([record(n) for n in range(5)])
+    store.compact_threshold = 100
+
+    store.upsert(record(1, question="Updated?"))
+    store.upsert(record(7))
+    removed = store.remove(faq_index_id("faq-2"))
+
+    assert removed == record(2)
+    assert store.get(faq_index_id("faq-1"))["question"] == "Updated?"
+    assert faq_index_id("faq-7") in store
+    assert faq_index_id("faq-2") not in store
+    assert len(store) == 5
+    assert sorted(r["id"] for r in store.records()) == ["faq-0", "faq-1", "faq-3", "faq-4", "faq-7"]
+
+
+def test_compact_folds_overlay_into_columns():
+    store = MetadataStore([record(n) for n in range(5)])
+    store.compact_threshold = 100
+    store.upsert(record(1, answer=None))
+    store.remove(faq_index_id("faq-3"))
+    before = sorted(store.records(), key=lambda r: r["id"])
+
+    store.compact()
+
+    assert not store._overlay and not store._deleted
+    assert sorted(store.records(), key=lambda r: r["id"]) == before
+    assert store.get(faq_index_id("faq-1"))["answer"] is None
+
+
+def test_overlay_compacts_past_threshold():
+    store = MetadataStore([record(n) for n in range(3)])
+    store.compact_threshold = 2
+    for n in range(3, 6):
+        store.upsert(record(n))
+
+    assert not store._overlay
+    assert len(store) == 6
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import InvalidCursorError, ValidationError
+from app.crud.pagination import decode_cursor, encode_cursor, keyset_page
+from app.db.base import Base
+from app.db.engine import build_engine
+from app.db.models.faq import FAQ
+from app.db.models.ticket import Ticket
+from app.db.models.user import User
+import app.db.models  # noqa: F401
+
+TICKET_KEY = (Ticket.created_at, Ticket.id)
+FAQ_KEY = (FAQ.helpfulness_score, FAQ.view_count, FAQ.id)
+
+
+def test_cursor_round_trips_typed_values():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    token = encode_cursor([created_at, "ticket-1"])
+
+    assert "=" not in token
+    assert decode_cursor(token, TICKET_KEY) == [created_at, "ticket-1"]
+    # JSON turns 2.0 into 2; the float column gets its float back
+    assert decode_cursor(encode_cursor([2, 7, "faq-1"]), FAQ_KEY) == [2.0, 7, "faq-1"]
+
+
+@pytest.mark.parametrize("token", [
+    "garbage",
+    "",
+    encode_cursor(["2024-05-01T12:30:15"]),
+    encode_cursor([1, "ticket-1"]),
+    encode_cursor({"created_at": "2024-05-01T12:30:15", "id": "ticket-1"}),
+    encode_cursor(["not a date", "ticket-1"]),
+])
+def test_bad_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, TICKET_KEY)
+
+
+def test_foreign_cursor_is_rejected_as_validation_error():
+    ticket_cursor = encode_cursor([datetime(2024, 5, 1), "ticket-1"])
+    with pytest.raises(ValidationError):
+        decode_cursor(ticket_cursor, FAQ_KEY)
+
+
+def test_keyset_pages_visit_every_row_once_despite_ties(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as db:
+        user = User(id=str(uuid.uuid4()), email="pages@example.com", hashed_password="-")
+        db.add(user)
+        # Pairs of tickets share a created_at, so only the id tie-break orders them
+        db.add_all(
+            Ticket(id=str(uuid.uuid4()), user_id=user.id, subject="s", question="q",
+                   created_at=start + timedelta(minutes=n // 2))
+            for n in range(11)
+        )
+        db.commit()
+
+        expected = [t.id for t in db.query(Ticket).order_by(Ticket.created_at.desc(), Ticket.id.desc())]
+        seen, cursor = [], None
+        while True:
+            rows, cursor = keyset_page(db.query(Ticket), TICKET_KEY, cursor, limit=3)
+            seen.extend(row.id for row in rows)
+            if cursor is None:
+                break
+    engine.dispose()
+
+    assert seen == expected
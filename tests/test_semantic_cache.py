@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from app.ai import semantic_cache as semantic_cache_module
+from app.ai.semantic_cache import GeneratedAnswerCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype="float32")
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_near_duplicates_reuse_the_answer():
+    cache = GeneratedAnswerCache(threshold=0.9)
+    cache.put(unit(1, 0, 0), "Generated", generation_seconds=1.5)
+
+    assert cache.get(unit(1, 0.1, 0)) == ("Generated", pytest.approx(0.995, abs=1e-3))
+    assert cache.get(unit(1, 1, 0)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["saved_seconds"] == 1.5
+
+
+def test_entries_are_scoped_to_their_category():
+    cache = GeneratedAnswerCache()
+    cache.put(unit(1, 0, 0), "Billing answer", category="Billing")
+
+    assert cache.get(unit(1, 0, 0)) is None
+    assert cache.get(unit(1, 0, 0), category="account") is None
+    assert cache.get(unit(1, 0, 0), category=" billing ")[0] == "Billing answer"
+
+
+def test_entries_expire_and_evict(clock):
+    cache = GeneratedAnswerCache(max_entries=2, ttl_seconds=60)
+    cache.put(unit(1, 0, 0), "a")
+    cache.put(unit(0, 1, 0), "b")
+    assert cache.get(unit(1, 0, 0))[0] == "a"
+    cache.put(unit(0, 0, 1), "c")
+
+    assert cache.get(unit(0, 1, 0)) is None
+    assert len(cache) == 2 and cache.stats()["evictions"] == 1
+
+    clock[0] += 61
+    assert cache.get(unit(1, 0, 0)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidate_categories_drops_answers_built_from_them():
+    cache = GeneratedAnswerCache()
+    cache.put(unit(1, 0, 0), "from billing FAQs", source_categories=["billing", None])
+    cache.put(unit(0, 1, 0), "scoped to account", category="account")
+    cache.put(unit(0, 0, 1), "unrelated", source_categories=["shipping"])
+
+    assert cache.invalidate_categories(["Billing", "account"]) == 2
+    assert cache.invalidate_categories([None, ""]) == 0
+    assert cache.get(unit(1, 0, 0)) is None
+    assert cache.get(unit(0, 0, 1))[0] == "unrelated"
+
+
+def test_disabled_cache_stores_nothing():
+    cache = GeneratedAnswerCache(max_entries=0)
+    cache.put(unit(1, 0, 0), "a")
+    assert not cache.enabled
+    assert cache.get(unit(1, 0, 0)) is None
+
+
+def test_faq_writes_invalidate_generated_answers(search_service):
+    search_service.store_generated_answer("When does my parcel arrive?", "Soon", source_categories=["shipping"])
+    search_service.store_generated_answer("Can I pay by card?", "Yes", category="billing")
+    assert search_service.get_generated_answer("when does my parcel arrive") == "Soon"
+
+    search_service.upsert_faq({"id": "faq-1", "question": "How do I track a parcel?", "answer": "Tracking page",
+                               "category": "shipping", "keywords": None, "is_active": True})
+    assert search_service.get_generated_answer("When does my parcel arrive?") is None
+    assert search_service.get_generated_answer("Can I pay by card?", category="billing") == "Yes"
+
+    search_service.upsert_faq({"id": "faq-1", "question": "How do I track a parcel?", "answer": "Tracking page",
+                               "category": "billing", "keywords": None, "is_active": True})
+    assert search_service.get_generated_answer("Can I pay by card?", category="billing") is None
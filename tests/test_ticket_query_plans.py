@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud.ticket import ticket as ticket_crud
+from app.db.base import Base
+from app.db.engine import build_engine
+from app.db.fulltext import FULLTEXT_TABLES
+from app.db.migrations import upgrade_database
+from app.db.models.ticket import TicketPriority, TicketStatus
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    upgrade_database(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, call) -> str:
+    """EXPLAIN QUERY PLAN of the SELECT issued by ``call(db)``"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as db:
+            call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    statement, parameters = statements[-1]
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_user_status_set_filter_searches_an_index(engine):
+    # Either (user_id, status, ...) per status, or (user_id, created_at, ...) in order; never the whole table
+    plan = query_plan(engine, lambda db: ticket_crud.get_filtered(
+        db, user_id="user-1", statuses=[TicketStatus.OPEN, TicketStatus.IN_PROGRESS], limit=20
+    ))
+    assert "SEARCH ticket USING INDEX ix_ticket_user_id_" in plan
+    assert "SCAN ticket" not in plan
+
+
+def test_single_status_filter_needs_no_sort(engine):
+    plan = query_plan(engine, lambda db: ticket_crud.get_filtered(
+        db, user_id="user-1", statuses=[TicketStatus.OPEN], created_after=datetime(2024, 1, 1), limit=20
+    ))
+    assert "ix_ticket_user_id_status_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_status_priority_filter_uses_composite_index(engine):
+    plan = query_plan(engine, lambda db: ticket_crud.get_filtered(
+        db, statuses=[TicketStatus.OPEN], priority=TicketPriority.URGENT, limit=20
+    ))
+    assert "ix_ticket_status_priority_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_filtered_keyset_page_uses_composite_index(engine):
+    plan = query_plan(engine, lambda db: ticket_crud.get_filtered_page(
+        db, user_id="user-1", statuses=[TicketStatus.RESOLVED], limit=20
+    ))
+    assert "ix_ticket_user_id_status_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_migrations_match_models(engine):
+    def include_name(name, type_, parent_names):
+        return type_ != "table" or not any(name.startswith(spec.index_name) for spec in FULLTEXT_TABLES.values())
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"include_name": include_name})
+        assert compare_metadata(context, Base.metadata) == []